@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List
 from ..core.db import get_db
 from ..schemas.finance import AccountCreate, AccountOut
-from ..schemas.finance import AccountUpdate
-from ..models.finance import Account, AccountType, Transaction, Category
+from ..schemas.finance import AccountUpdate, AccountLedgerOut, ReconcileIn
+from ..models.finance import Account, AccountType, Transaction, Category, GoalLink
 from datetime import date
 from ..models.finance import Transaction, Category
-from ..services.deps import get_current_user
+from ..services.deps import get_current_user, enforce_shabbat_readonly
+from ..services import account_ledger, maaser
 
 router = APIRouter()
 
@@ -66,6 +67,8 @@ def delete_account(account_id: int, db: Session = Depends(get_db), user=Depends(
     account = db.query(Account).filter(Account.id == account_id, Account.user_id == user.id).first()
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
+    # SQLite does not enforce the FK cascade; goals linked to the account stop counting it
+    db.query(GoalLink).filter(GoalLink.account_id == account_id).delete(synchronize_session=False)
     db.delete(account)
     db.commit()
     return {"ok": True}
@@ -78,6 +81,7 @@ def update_account(account_id: int, upd: AccountUpdate, db: Session = Depends(ge
         raise HTTPException(status_code=404, detail="Account not found")
 
     # update fields
+    renamed = upd.name is not None and upd.name != account.name
     if upd.name is not None:
         account.name = upd.name
     if upd.type is not None:
@@ -106,6 +110,10 @@ def update_account(account_id: int, upd: AccountUpdate, db: Session = Depends(ge
             if new_ob != 0.0:
                 opening_tx = Transaction(user_id=user.id, account_id=account.id, date=date.today(), amount=new_ob, note='Opening balance')
                 db.add(opening_tx)
+    if renamed:
+        db.flush()
+        # Maaser account flows are recognised by the account's name
+        maaser.rebuild(db, user.id)
     db.commit()
     db.refresh(account)
     ao = AccountOut.from_orm(account)
@@ -117,3 +125,47 @@ def update_account(account_id: int, upd: AccountUpdate, db: Session = Depends(ge
     else:
         ao.balance = float(account.opening_balance or 0.0)
     return ao
+
+
+def _own_account(db: Session, user_id: int, account_id: int) -> Account:
+    account = db.query(Account).filter(Account.id == account_id, Account.user_id == user_id).first()
+    if not account:
+        raise HTTPException(status_code=404, detail="Account not found")
+    return account
+
+
+@router.get("/{account_id}/ledger", response_model=AccountLedgerOut)
+def get_ledger(
+    account_id: int,
+    limit: int = Query(100, ge=1, le=account_ledger.MAX_PAGE),
+    cursor: str | None = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Transactions with the running balance after each one, a page at a time.
+
+    Pass `next_cursor` from one response as `cursor` to get the next page;
+    `order=asc` walks forwards from the oldest transaction instead.
+    """
+    _own_account(db, user.id, account_id)
+    try:
+        return account_ledger.account_ledger(db, account_id, limit=limit, cursor=cursor, newest_first=order == "desc")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.post("/{account_id}/reconcile", dependencies=[Depends(enforce_shabbat_readonly)])
+def reconcile(account_id: int, body: ReconcileIn, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Mark every transaction dated from `start` (or the beginning) to `end` as cleared, or uncleared with
+    `cleared: false`. With `statement_balance`, the difference from the new cleared balance is returned."""
+    _own_account(db, user.id, account_id)
+    if body.start is not None and body.start > body.end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    updated = account_ledger.mark_cleared(db, account_id, body.end, start=body.start, cleared=body.cleared)
+    db.commit()
+    cleared = account_ledger.cleared_balance(db, account_id)
+    out = {"updated": updated, "cleared_balance": cleared}
+    if body.statement_balance is not None:
+        out["difference"] = round(body.statement_balance - cleared, 2)
+    return out
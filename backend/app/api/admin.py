@@ -0,0 +1,45 @@
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..core import metrics
+from ..core.db import SessionLocal, get_db
+from ..services import networth_batch
+from ..services.deps import require_admin
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get('/metrics', response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Per-route latency quantiles, query-count histograms and DB time in Prometheus text format."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@router.get('/networth/ranges')
+def networth_ranges(workers: int = Query(4, ge=1, le=256), db: Session = Depends(get_db)):
+    """User-id ranges of about equal size, one per worker, for `/networth`'s start_id/end_id."""
+    return [{"start_id": lo, "end_id": hi} for lo, hi in networth_batch.ranges(db, workers)]
+
+
+@router.get('/networth')
+def networth_snapshot(
+    start_id: int = Query(0, ge=0),
+    end_id: Optional[int] = Query(None, ge=1),
+    chunk: int = Query(networth_batch.DEFAULT_CHUNK, ge=1, le=networth_batch.MAX_CHUNK),
+):
+    """Balances and net worth of every user with start_id <= id < end_id, one JSON object per line.
+
+    Computed `chunk` users per grouped pass, so memory stays flat and the first
+    lines arrive before the last users are read."""
+    if end_id is not None and end_id <= start_id:
+        raise HTTPException(status_code=400, detail="end_id must be greater than start_id")
+
+    def body():
+        # the request's session is closed before a streamed body runs
+        with SessionLocal() as db:
+            for snap in networth_batch.snapshots(db, start_id, end_id, chunk):
+                yield json.dumps(snap, separators=(",", ":")) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
@@ -6,37 +6,23 @@ from ..schemas.auth import UserCreate, UserLogin, UserOut, Token
 from ..utils.security import verify_password, get_password_hash, create_access_token
 from ..models.security import UserTwoFA
 from sqlalchemy.exc import OperationalError
-import pyotp
 import hashlib
 from datetime import timedelta
-import dns.resolver
 from urllib.parse import urlparse
 import re
-from ..utils.crypto import decrypt_str
+from starlette.concurrency import run_in_threadpool
+from ..core.config import settings
+from ..services.bootstrap import seed_default_categories
 
 router = APIRouter()
 
-@router.post("/register", response_model=UserOut)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    # Basic email domain existence check (MX -> A/AAAA fallback)
-    domain = user_in.email.split('@')[-1].lower().strip()
-    try:
-        # Try MX records first
-        answers = dns.resolver.resolve(domain, 'MX')
-        if not answers:
-            raise Exception('no mx')
-    except Exception:
-        # Fallback to A/AAAA
-        try:
-            dns.resolver.resolve(domain, 'A')
-        except Exception:
-            try:
-                dns.resolver.resolve(domain, 'AAAA')
-            except Exception:
-                raise HTTPException(status_code=400, detail="Email domain does not resolve")
+def _ensure_available(db: Session, user_in: UserCreate) -> None:
     existing = db.query(User).filter((User.email == user_in.email) | (User.username == user_in.username)).first()
     if existing:
         raise HTTPException(status_code=400, detail="Email or username already registered")
+
+
+def _create_user(db: Session, user_in: UserCreate) -> User:
     user = User(
         username=user_in.username,
         email=user_in.email,
@@ -53,10 +39,26 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
         country=user_in.country or "",
     )
     db.add(user)
+    db.flush()
+    seed_default_categories(db, [user.id])
     db.commit()
     db.refresh(user)
     return user
 
+
+@router.post("/register", response_model=UserOut)
+async def register(user_in: UserCreate, db: Session = Depends(get_db)):
+    # Cheap checks first; DB work stays off the event loop
+    await run_in_threadpool(_ensure_available, db, user_in)
+    # Basic email domain existence check (MX -> A/AAAA fallback), cached per domain
+    if settings.EMAIL_DNS_CHECK:
+        # dnspython is loaded on the first registration, not at boot
+        from ..services.email_domain import domain_accepts_mail
+        domain = user_in.email.split('@')[-1]
+        if not await domain_accepts_mail(domain):
+            raise HTTPException(status_code=400, detail="Email domain does not resolve")
+    return await run_in_threadpool(_create_user, db, user_in)
+
 @router.post("/login", response_model=Token)
 def login(user_in: UserLogin, db: Session = Depends(get_db)):
     if user_in.username:
@@ -78,6 +80,8 @@ def login(user_in: UserLogin, db: Session = Depends(get_db)):
         ok = False
         if otp:
             otp_clean = otp.strip().replace(' ', '')
+            import pyotp
+            from ..utils.crypto import decrypt_str
             secret_plain = decrypt_str(twofa.secret)
             ok = pyotp.TOTP(secret_plain).verify(otp_clean, valid_window=2)
         elif recovery and twofa.recovery_codes:
@@ -1,36 +1,125 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
+from typing import Dict, Iterable, List, Optional
 from ..core.db import get_db
 from ..schemas.finance import BudgetCreate, BudgetOut
 from ..models.finance import Budget, BudgetItem, Category
 from ..services.deps import get_current_user, enforce_shabbat_readonly
+from ..utils.sql import is_month
 
 router = APIRouter()
 
+
+def _month_add(ym: str, n: int) -> str:
+    y, m = map(int, ym.split('-'))
+    m += n
+    y += (m - 1) // 12
+    m = ((m - 1) % 12) + 1
+    return f"{y:04d}-{m:02d}"
+
+
+def _check_categories(db: Session, user_id: int, category_ids: Iterable[int]) -> None:
+    """One query for every category referenced by the request; 404 on the first foreign/missing id."""
+    wanted = set(category_ids)
+    if not wanted:
+        return
+    owned = {
+        cid for (cid,) in db.query(Category.id).filter(Category.user_id == user_id, Category.id.in_(wanted)).all()
+    }
+    missing = sorted(wanted - owned)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Category {missing[0]} not found")
+
+
+def _item_row(item) -> dict:
+    return {
+        "category_id": item.category_id,
+        "limit": item.limit,
+        "item_type": (item.item_type or "fixed"),
+        "tolerance_pct": (item.tolerance_pct if item.tolerance_pct is not None else 0.15),
+        "window_months": (item.window_months if item.window_months is not None else 3),
+    }
+
+
+def _insert_budgets(db: Session, user_id: int, plan: Dict[str, List[dict]]) -> List[int]:
+    """Insert {month: [item rows]} as one executemany for budgets and one for items. Returns the new ids."""
+    if not plan:
+        return []
+    db.execute(insert(Budget), [{"user_id": user_id, "month": m} for m in plan])
+    ids = dict(db.query(Budget.month, Budget.id).filter(Budget.user_id == user_id, Budget.month.in_(list(plan))).all())
+    rows = [dict(row, budget_id=ids[m]) for m, items in plan.items() for row in items]
+    if rows:
+        db.execute(insert(BudgetItem), rows)
+    return [ids[m] for m in plan]
+
+
+def _load(db: Session, budget_ids: List[int]) -> List[Budget]:
+    if not budget_ids:
+        return []
+    return (
+        db.query(Budget).options(selectinload(Budget.items))
+        .filter(Budget.id.in_(budget_ids))
+        .order_by(Budget.month, Budget.id)
+        .all()
+    )
+
+
 @router.get("/", response_model=List[BudgetOut])
-def list_budgets(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    budgets = db.query(Budget).filter(Budget.user_id == user.id).all()
-    return budgets
+def list_budgets(
+    from_month: Optional[str] = Query(None, alias="from"),
+    to_month: Optional[str] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Budgets ordered by month, optionally limited to an inclusive YYYY-MM range. Items load in one extra query."""
+    q = db.query(Budget).options(selectinload(Budget.items)).filter(Budget.user_id == user.id)
+    for value in (from_month, to_month):
+        if value is not None and not is_month(value):
+            raise HTTPException(status_code=400, detail="from/to must be YYYY-MM")
+    if from_month:
+        q = q.filter(Budget.month >= from_month)
+    if to_month:
+        q = q.filter(Budget.month <= to_month)
+    return q.order_by(Budget.month).all()
 
 @router.post("/", response_model=BudgetOut, dependencies=[Depends(enforce_shabbat_readonly)])
 def create_budget(budget_in: BudgetCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    b = Budget(user_id=user.id, month=budget_in.month)
-    db.add(b)
-    db.flush()
-    for item in budget_in.items:
-        # ensure category belongs to user
-        cat = db.query(Category).filter(Category.id == item.category_id, Category.user_id == user.id).first()
-        if not cat:
-            raise HTTPException(status_code=404, detail=f"Category {item.category_id} not found")
-        db.add(BudgetItem(
-            budget_id=b.id,
-            category_id=item.category_id,
-            limit=item.limit,
-            item_type=(item.item_type or "fixed"),
-            tolerance_pct=(item.tolerance_pct if item.tolerance_pct is not None else 0.15),
-            window_months=(item.window_months if item.window_months is not None else 3),
-        ))
+    return create_budgets([budget_in], db, user)[0]
+
+@router.post("/bulk", response_model=List[BudgetOut], dependencies=[Depends(enforce_shabbat_readonly)])
+def create_budgets(budgets_in: List[BudgetCreate], db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Create several budgets (e.g. a whole year) in one transaction."""
+    plan: Dict[str, List[dict]] = {}
+    for b in budgets_in:
+        if not is_month(b.month):
+            raise HTTPException(status_code=400, detail="month must be YYYY-MM")
+        if b.month in plan:
+            raise HTTPException(status_code=400, detail=f"Duplicate month {b.month}")
+        plan[b.month] = [_item_row(item) for item in b.items]
+    # ensure categories belong to user
+    _check_categories(db, user.id, (row["category_id"] for rows in plan.values() for row in rows))
+    if db.query(Budget.id).filter(Budget.user_id == user.id, Budget.month.in_(list(plan))).first():
+        raise HTTPException(status_code=409, detail="A budget already exists for one of these months")
+    ids = _insert_budgets(db, user.id, plan)
+    db.commit()
+    return _load(db, ids)
+
+@router.post("/{budget_id}/copy", response_model=List[BudgetOut], dependencies=[Depends(enforce_shabbat_readonly)])
+def copy_budget(budget_id: int, months: int = Query(1, ge=1, le=36), db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Clone a budget into each of the next `months` months. Months that already have a budget are left alone."""
+    src = (
+        db.query(Budget).options(selectinload(Budget.items))
+        .filter(Budget.id == budget_id, Budget.user_id == user.id)
+        .first()
+    )
+    if not src:
+        raise HTTPException(status_code=404, detail="Budget not found")
+    targets = [_month_add(src.month, i) for i in range(1, months + 1)]
+    taken = {
+        m for (m,) in db.query(Budget.month).filter(Budget.user_id == user.id, Budget.month.in_(targets)).all()
+    }
+    items = [_item_row(bi) for bi in src.items]
+    ids = _insert_budgets(db, user.id, {m: items for m in targets if m not in taken})
     db.commit()
-    db.refresh(b)
-    return b
+    return _load(db, ids)
@@ -4,15 +4,18 @@ from typing import List
 from sqlalchemy import func
 from ..core.db import get_db
 from ..schemas.finance import CategoryCreate, CategoryOut, CategoryUpdate
-from ..models.finance import Category, CategoryType, Transaction, Budget, BudgetItem
+from ..models.finance import Category, CategoryType, Transaction, Budget, BudgetItem, GoalLink
 from ..services.deps import get_current_user
 from ..services.bootstrap import ensure_default_categories
+from ..services import maaser
 
 router = APIRouter()
 
 @router.get("/", response_model=List[CategoryOut])
 def list_categories(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    ensure_default_categories(db, user.id)
+    # Registration seeds the defaults; this only catches users created before that
+    if not user.categories_seeded:
+        ensure_default_categories(db, user.id)
     return db.query(Category).filter(Category.user_id == user.id).all()
 
 @router.post("/", response_model=CategoryOut)
@@ -32,12 +35,17 @@ def update_category(category_id: int, cat_in: CategoryUpdate, db: Session = Depe
     # For built-in categories, restrict type changes
     if cat.is_builtin and cat_in.type is not None and cat_in.type != cat.type.value:
         raise HTTPException(status_code=400, detail="Cannot change type of built-in category")
+    reclassified = (cat_in.name is not None and cat_in.name != cat.name) or (cat_in.type is not None and cat_in.type != cat.type.value)
     if cat_in.name is not None:
         cat.name = cat_in.name
     if cat_in.icon is not None:
         cat.icon = cat_in.icon
     if cat_in.type is not None:
         cat.type = CategoryType(cat_in.type)
+    if reclassified:
+        db.flush()
+        # income / Tzedakah classification follows the category's type and name
+        maaser.rebuild(db, user.id)
     db.commit()
     db.refresh(cat)
     return cat
@@ -63,6 +71,8 @@ def delete_category(category_id: int, db: Session = Depends(get_db), user=Depend
     )
     if (tx_count or 0) > 0 or (bi_count or 0) > 0:
         raise HTTPException(status_code=400, detail="Category is in use and cannot be deleted")
+    # SQLite does not enforce the FK cascade; goals linked to the category stop counting it
+    db.query(GoalLink).filter(GoalLink.category_id == category_id).delete(synchronize_session=False)
     db.delete(cat)
     db.commit()
     return {"ok": True}
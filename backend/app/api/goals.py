@@ -1,16 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from datetime import date
 from typing import List
 from ..core.db import get_db
-from ..schemas.finance import GoalCreate, GoalOut
-from ..models.finance import Goal, GoalType
+from ..schemas.finance import GoalCreate, GoalOut, GoalUpdate
+from ..models.finance import Account, Category, Goal, GoalLink, GoalType
 from ..services.deps import get_current_user, enforce_shabbat_readonly
+from ..services import goals as goal_service
 
 router = APIRouter()
 
+
+def _links(db: Session, user_id: int, account_ids: List[int], category_ids: List[int]) -> List[GoalLink]:
+    account_ids, category_ids = sorted(set(account_ids)), sorted(set(category_ids))
+    if account_ids and db.query(func.count(Account.id)).filter(Account.user_id == user_id, Account.id.in_(account_ids)).scalar() != len(account_ids):
+        raise HTTPException(status_code=404, detail="Account not found")
+    if category_ids and db.query(func.count(Category.id)).filter(Category.user_id == user_id, Category.id.in_(category_ids)).scalar() != len(category_ids):
+        raise HTTPException(status_code=404, detail="Category not found")
+    return [GoalLink(account_id=a) for a in account_ids] + [GoalLink(category_id=c) for c in category_ids]
+
+
+def _existing(db: Session, user_id: int, model, ids: List[int]) -> List[int]:
+    if not ids:
+        return []
+    return [i for (i,) in db.query(model.id).filter(model.user_id == user_id, model.id.in_(ids)).all()]
+
+
+def _own(db: Session, user_id: int, goal_id: int) -> Goal:
+    g = db.query(Goal).filter(Goal.id == goal_id, Goal.user_id == user_id).first()
+    if not g:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    return g
+
+
+def _out(db: Session, user_id: int, g: Goal) -> dict:
+    today = date.today()
+    return goal_service.to_out(g, goal_service.linked_sums(db, user_id, [g], today), today)
+
+
 @router.get("/", response_model=List[GoalOut])
 def list_goals(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    return db.query(Goal).filter(Goal.user_id == user.id).all()
+    """Goals with progress; linked goals add up their accounts/categories in one grouped query (cached)."""
+    goals = db.query(Goal).options(joinedload(Goal.links)).filter(Goal.user_id == user.id).order_by(Goal.id).all()
+    today = date.today()
+    sums = goal_service.linked_sums(db, user.id, goals, today)
+    return [goal_service.to_out(g, sums, today) for g in goals]
 
 @router.post("/", response_model=GoalOut, dependencies=[Depends(enforce_shabbat_readonly)])
 def create_goal(goal_in: GoalCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
@@ -23,8 +58,45 @@ def create_goal(goal_in: GoalCreate, db: Session = Depends(get_db), user=Depends
         target_amount=goal_in.target_amount,
         current_amount=goal_in.current_amount,
         due_date=goal_in.due_date,
+        start_date=goal_in.start_date,
     )
+    g.links = _links(db, user.id, goal_in.account_ids, goal_in.category_ids)
     db.add(g)
     db.commit()
     db.refresh(g)
-    return g
+    return _out(db, user.id, g)
+
+
+@router.patch("/{goal_id}", response_model=GoalOut, dependencies=[Depends(enforce_shabbat_readonly)])
+def update_goal(goal_id: int, upd: GoalUpdate, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Change any field; `account_ids` / `category_ids` replace the goal's links when given."""
+    g = _own(db, user.id, goal_id)
+    if upd.type is not None:
+        if upd.type not in [t.value for t in GoalType]:
+            raise HTTPException(status_code=400, detail="Invalid goal type")
+        g.type = GoalType(upd.type)
+    for field in ("name", "target_amount", "current_amount", "due_date"):
+        value = getattr(upd, field)
+        if value is not None:
+            setattr(g, field, value)
+    if "start_date" in upd.model_fields_set:
+        g.start_date = upd.start_date  # null clears it
+    if upd.account_ids is not None or upd.category_ids is not None:
+        # links left behind by a deleted account or category are dropped, not re-validated
+        keep_accounts = _existing(db, user.id, Account, [l.account_id for l in g.links if l.account_id is not None])
+        keep_categories = _existing(db, user.id, Category, [l.category_id for l in g.links if l.category_id is not None])
+        g.links = _links(
+            db, user.id,
+            keep_accounts if upd.account_ids is None else upd.account_ids,
+            keep_categories if upd.category_ids is None else upd.category_ids,
+        )
+    db.commit()
+    db.refresh(g)
+    return _out(db, user.id, g)
+
+
+@router.delete("/{goal_id}", dependencies=[Depends(enforce_shabbat_readonly)])
+def delete_goal(goal_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    db.delete(_own(db, user.id, goal_id))
+    db.commit()
+    return {"ok": True}
@@ -21,7 +21,6 @@ def holdings(db: Session = Depends(get_db), user=Depends(get_current_user)):
         out.append({'investment_id': inv.id, 'symbol': inv.symbol, 'name': inv.name, 'quantity': quantity, 'cost_basis': cost_basis, 'market_value': None})
     return out
 
-router = APIRouter()
 
 @router.post('/', response_model=InvestmentOut)
 def create_investment(inv_in: InvestmentCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
@@ -0,0 +1,90 @@
+import json
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+from ..core.db import get_db
+from ..models.jobs import Job
+from ..services import jobs
+from ..services.deps import get_current_user
+
+router = APIRouter()
+
+
+class JobIn(BaseModel):
+    kind: str
+    params: Dict[str, Any] = {}
+
+
+def enqueue_or_422(db: Session, user_id: int, kind: str, params: Dict[str, Any], internal: bool = False) -> Dict[str, Any]:
+    """Enqueue for an endpoint's `async=true` mode; answers with the job id to poll."""
+    try:
+        job = jobs.enqueue(db, user_id, kind, params, internal=internal)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors(include_url=False, include_context=False)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"job_id": job.id, "status": job.status, "url": f"/api/jobs/{job.id}"}
+
+
+def _own(db: Session, user_id: int, job_id: str) -> Job:
+    job = db.query(Job).filter(Job.id == job_id, Job.user_id == user_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get('/kinds')
+def list_kinds():
+    return jobs.kinds()
+
+
+@router.post('/', status_code=202)
+def create_job(payload: JobIn, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Enqueue any registered job kind with its parameters; poll `/api/jobs/{id}` for progress."""
+    return enqueue_or_422(db, user.id, payload.kind, payload.params)
+
+
+@router.get('/')
+def list_jobs(
+    status: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    q = db.query(Job).filter(Job.user_id == user.id)
+    if status:
+        q = q.filter(Job.status == status)
+    return [jobs.to_dict(j) for j in q.order_by(Job.created_at.desc()).limit(limit).all()]
+
+
+@router.get('/{job_id}')
+def get_job(job_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    return jobs.to_dict(_own(db, user.id, job_id))
+
+
+@router.get('/{job_id}/result')
+def job_result(job_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """The handler's result once the job has succeeded; 409 while it is pending or if it failed.
+
+    File results (PDFs, archives) are sent as the file itself."""
+    job = _own(db, user.id, job_id)
+    if job.status != jobs.SUCCEEDED:
+        raise HTTPException(status_code=409, detail=job.error if job.status == jobs.FAILED else f"Job is {job.status}")
+    result = json.loads(job.result or "null")
+    if isinstance(result, dict) and "file" in result:
+        if not os.path.exists(result["file"]):
+            raise HTTPException(status_code=410, detail="Job output has expired")
+        return FileResponse(result["file"], media_type=result["media_type"], filename=result["filename"])
+    return result
+
+
+@router.delete('/{job_id}')
+def cancel_job(job_id: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    job = _own(db, user.id, job_id)
+    if not jobs.cancel(db, job):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return {"ok": True}
@@ -1,18 +1,31 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+import os
 from datetime import date
 from typing import Dict, Any
-from ..core.db import get_db
+from ..core.db import SessionLocal, get_db
 from ..models.finance import Transaction, Account, Category, Budget, BudgetItem, CategoryType
 from ..models.finance import Investment, InvestmentTransaction
 from ..services.deps import get_current_user
-from ..services.export import export_month_csv, export_month_pdf
+from ..services import jobs
+from .jobs import enqueue_or_422
+from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from tempfile import SpooledTemporaryFile
+from ..services.export import export_month_csv, render_month_pdf
+from ..services.annual_report import annual_zip
+from ..services import ledger_export
+from ..services.budget_variance import MAX_MONTHS, budget_variance, month_index
+from ..services.forecast import MAX_DAYS as MAX_FORECAST_DAYS, forecast
+from ..services.maaser import MAX_MONTHS as MAX_MAASER_MONTHS, maaser_account_net, maaser_ledger
+from ..utils.sql import is_month
 from typing import Optional, List
 from sqlalchemy import func
 
 router = APIRouter()
 
+
 @router.get("/monthly")
 def monthly_summary(year: int, month: int, db: Session = Depends(get_db), user=Depends(get_current_user)) -> Dict[str, Any]:
     start = date(year, month, 1)
@@ -97,11 +110,8 @@ def monthly_summary(year: int, month: int, db: Session = Depends(get_db), user=D
             "status": status,
         })
 
-    # Maaser total: sum of transactions credited to the Maaser account in this month
-    maaser_acc = db.query(Account).filter(Account.user_id == user.id, Account.name == 'Maaser').first()
-    maaser_total = 0.0
-    if maaser_acc:
-        maaser_total = float(db.query(func.sum(Transaction.amount)).filter(Transaction.user_id == user.id, Transaction.account_id == maaser_acc.id, Transaction.date >= start, Transaction.date < end).scalar() or 0.0)
+    # Maaser total: net flow on the Maaser account this month, from the Maaser ledger
+    maaser_total = maaser_account_net(db, user.id, f"{year:04d}-{month:02d}")
 
     return {
         "income": income,
@@ -122,6 +132,49 @@ def monthly_summary(year: int, month: int, db: Session = Depends(get_db), user=D
         "flex_insights": flex_insights,
     }
 
+@router.get('/budget_variance')
+def budget_variance_report(
+    from_month: str = Query(..., alias="from"),
+    to_month: str = Query(..., alias="to"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Budget vs. actual for every budgeted category over an inclusive YYYY-MM range."""
+    if not (is_month(from_month) and is_month(to_month)):
+        raise HTTPException(status_code=400, detail="from/to must be YYYY-MM")
+    span = month_index(to_month) - month_index(from_month) + 1
+    if span < 1 or span > MAX_MONTHS:
+        raise HTTPException(status_code=400, detail=f"from must not be after to, and the range is limited to {MAX_MONTHS} months")
+    return budget_variance(db, user.id, from_month, to_month)
+
+@router.get('/maaser')
+def maaser_report(
+    from_month: str = Query(..., alias="from"),
+    to_month: str = Query(..., alias="to"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Maaser obligation, Tzedakah paid and running balance per month over an inclusive YYYY-MM range."""
+    if not (is_month(from_month) and is_month(to_month)):
+        raise HTTPException(status_code=400, detail="from/to must be YYYY-MM")
+    span = month_index(to_month) - month_index(from_month) + 1
+    if span < 1 or span > MAX_MAASER_MONTHS:
+        raise HTTPException(status_code=400, detail=f"from must not be after to, and the range is limited to {MAX_MAASER_MONTHS} months")
+    return maaser_ledger(db, user.id, user.maaser_pct, from_month, to_month)
+
+@router.get('/forecast')
+def forecast_report(
+    days: int = Query(90, ge=1, le=MAX_FORECAST_DAYS),
+    pay_from: Optional[int] = None,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Projected daily balances per account for the next `days` days, with overdraft flags."""
+    try:
+        return forecast(db, user.id, days=days, pay_from=pay_from)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 @router.get('/cashflow')
 def cashflow(start: str, end: str, db: Session = Depends(get_db), user=Depends(get_current_user)):
     from datetime import date
@@ -137,20 +190,166 @@ def cashflow(start: str, end: str, db: Session = Depends(get_db), user=Depends(g
             outflow += tx.amount
     return {"start": start, "end": end, "inflow": inflow, "outflow": outflow, "net": inflow - outflow}
 
+class ExportJob(BaseModel):
+    year: int
+    month: int = Field(ge=1, le=12)
+
+
+class NetworthJob(BaseModel):
+    months: Optional[int] = 12
+
+
+@jobs.handler('export_csv', ExportJob)
+def _export_csv_job(db: Session, user, params: ExportJob, progress):
+    content, filename = export_month_csv(db, user.id, params.year, params.month)
+    return {"filename": filename, "content": content}
+
+
+@jobs.handler('export_pdf', ExportJob)
+def _export_pdf_job(db: Session, user, params: ExportJob, progress):
+    path = jobs.spool_path(".pdf")
+    try:
+        with open(path, "wb") as out:
+            filename = render_month_pdf(db, user.id, params.year, params.month, out)
+    except Exception:
+        os.remove(path)
+        raise
+    return jobs.FileResult(path, filename, "application/pdf")
+
+
+class AnnualJob(BaseModel):
+    year: int = Field(ge=1900, le=2999)
+
+
+@jobs.handler('annual_report', AnnualJob)
+def _annual_job(db: Session, user, params: AnnualJob, progress):
+    path = jobs.spool_path(".zip")
+    try:
+        with open(path, "wb") as out:
+            for chunk in annual_zip(db, user.id, params.year, user.maaser_pct):
+                out.write(chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    return jobs.FileResult(path, f"annual_{params.year}.zip", "application/zip")
+
+
+class LedgerJob(BaseModel):
+    format: str = Field("parquet", pattern="^(parquet|arrow)$")
+
+
+@jobs.handler('export_ledger', LedgerJob)
+def _ledger_job(db: Session, user, params: LedgerJob, progress):
+    ledger_export.require_pyarrow()
+    path = jobs.spool_path(".zip")
+    try:
+        with open(path, "wb") as out:
+            for chunk in ledger_export.ledger_zip(db, user.id, params.format):
+                out.write(chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    return jobs.FileResult(path, f"ledger_{params.format}.zip", "application/zip")
+
+
+@jobs.handler('networth', NetworthJob)
+def _networth_job(db: Session, user, params: NetworthJob, progress):
+    return networth(months=params.months, run_async=False, db=db, user=user)
+
+
 @router.get("/export/csv")
-def export_csv(year: int, month: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def export_csv(year: int, month: int, run_async: bool = Query(False, alias="async"),
+               db: Session = Depends(get_db), user=Depends(get_current_user)):
+    if run_async:
+        return enqueue_or_422(db, user.id, 'export_csv', {"year": year, "month": month})
     content, filename = export_month_csv(db, user.id, year, month)
     return {"filename": filename, "content": content}
 
 @router.get("/export/pdf")
-def export_pdf(year: int, month: int, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    content_b64, filename = export_month_pdf(db, user.id, year, month)
-    return {"filename": filename, "content_b64": content_b64}
+def export_pdf(year: int, month: int = Query(..., ge=1, le=12), run_async: bool = Query(False, alias="async"),
+               db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Monthly PDF report (summary, category breakdown, charts, full transaction table) as application/pdf.
+
+    The document is rendered into a spooled temporary file (memory up to 1 MB,
+    disk beyond) and streamed from there."""
+    if run_async:
+        return enqueue_or_422(db, user.id, 'export_pdf', {"year": year, "month": month})
+    out = SpooledTemporaryFile(max_size=1 << 20)
+    try:
+        filename = render_month_pdf(db, user.id, year, month, out)
+    except RuntimeError as e:
+        out.close()
+        raise HTTPException(status_code=503, detail=str(e))
+    size = out.tell()
+    out.seek(0)
+    return StreamingResponse(_iter_file(out), media_type="application/pdf", headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Content-Length": str(size),
+    })
+
+
+@router.get("/export/ledger")
+def export_ledger(format: str = Query("parquet", pattern="^(parquet|arrow)$"),
+                  run_async: bool = Query(False, alias="async"),
+                  db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """The full ledger (transactions, accounts, categories, investment transactions) as typed
+    columnar files, one per table, in a streamed zip. Needs the optional pyarrow package (503 without it)."""
+    try:
+        ledger_export.require_pyarrow()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if run_async:
+        return enqueue_or_422(db, user.id, 'export_ledger', {"format": format})
+
+    def body(user_id: int):
+        with SessionLocal() as session:
+            yield from ledger_export.ledger_zip(session, user_id, format)
+
+    return StreamingResponse(body(user.id), media_type="application/zip", headers={
+        "Content-Disposition": f'attachment; filename="ledger_{format}.zip"',
+    })
+
+
+@router.get("/annual")
+def annual_report(year: int = Query(..., ge=1900, le=2999), run_async: bool = Query(False, alias="async"),
+                  db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Year-end bundle as a zip: per-month transaction CSVs, Maaser/Tzedakah figures,
+    realised investment activity and a summary (JSON and PDF).
+
+    The year is read in one pass and the archive is streamed while it is
+    written. The stream uses its own session, since the request's session is
+    closed before the body is sent."""
+    if run_async:
+        return enqueue_or_422(db, user.id, 'annual_report', {"year": year})
+
+    def body(user_id: int, pct: Optional[float]):
+        with SessionLocal() as session:
+            yield from annual_zip(session, user_id, year, pct)
+
+    return StreamingResponse(body(user.id, user.maaser_pct), media_type="application/zip", headers={
+        "Content-Disposition": f'attachment; filename="annual_{year}.zip"',
+    })
+
+
+def _iter_file(f, chunk_size: int = 64 * 1024):
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
 
 
 @router.get('/networth')
-def networth(months: Optional[int] = 12, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    """Return current assets, liabilities, net worth and a monthly history for the past `months` months (default 12)."""
+def networth(months: Optional[int] = 12, run_async: bool = Query(False, alias="async"),
+             db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Return current assets, liabilities, net worth and a monthly history for the past `months` months (default 12).
+
+    With `async=true` the computation runs as a background job."""
+    if run_async:
+        return enqueue_or_422(db, user.id, 'networth', {"months": months})
     if months is None or months <= 0:
         months = 12
     today = date.today()
@@ -1,11 +1,19 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
 from sqlalchemy.orm import Session
 from typing import List
 from ..core.db import get_db
-from ..schemas.finance import TransactionCreate, TransactionOut
+from ..schemas.finance import TransactionCreate, TransactionOut, RecurringSeriesOut
 from ..models.finance import Transaction, Account, Category, AccountType, CategoryType, CategoryRule
 from ..services.deps import get_current_user, enforce_shabbat_readonly
+from ..services.search import search_transactions
+from ..services import recurring as recurring_svc
+from ..services import importer
+from ..services import statement_parser
+from ..services import jobs
+from .jobs import enqueue_or_422
+import os
+import shutil
 from pydantic import BaseModel, field_validator
 from datetime import date
 from typing import Optional, Any
@@ -45,6 +53,7 @@ class TransactionUpdate(BaseModel):
     date: Optional[Any] = None
     amount: Optional[float] = None
     note: Optional[str] = None
+    cleared: Optional[bool] = None
 
 
 class ImportRow(BaseModel):
@@ -69,6 +78,20 @@ class ImportRow(BaseModel):
 class ImportPayload(BaseModel):
     rows: list[ImportRow]
 
+
+class ImportJob(ImportPayload):
+    duplicates: str = "skip"
+
+
+class ImportFileJob(BaseModel):
+    spool: str  # name of the spooled upload inside JOB_SPOOL_DIR, never a client path
+    filename: Optional[str] = None
+    account_id: int
+    format: Optional[str] = None
+    date_format: Optional[str] = None
+    duplicates: str = "skip"
+    chunk_size: int = importer.IMPORT_CHUNK
+
 @router.get("/", response_model=List[TransactionOut])
 def list_transactions(db: Session = Depends(get_db), user=Depends(get_current_user)):
     return db.query(Transaction).filter(Transaction.user_id == user.id).order_by(Transaction.date.desc()).all()
@@ -82,6 +105,40 @@ def recent_transactions(limit: int = 20, account_id: int | None = None, db: Sess
     q = q.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit)
     return q.all()
 
+@router.get('/search', response_model=List[TransactionOut])
+def search(
+    q: str = Query(..., min_length=1),
+    account_id: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    sort: str = Query("relevance", pattern="^(relevance|recent)$"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Search notes by words or word prefixes ("shuf ramat" matches "Shufersal Ramat Gan").
+
+    Best match first by default; `sort=recent` lists the newest matches first.
+    """
+    return search_transactions(db, user.id, q, account_id=account_id, start=start, end=end, limit=limit, offset=offset, sort=sort)
+
+@router.get('/recurring', response_model=List[RecurringSeriesOut])
+def recurring(include_inactive: bool = False, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Detected recurring series with their expected next date and amount.
+
+    Transactions added since the last scan are folded in memory without
+    storing anything; `POST /recurring/scan` (or the nightly batch) persists
+    them. Series first seen since the last scan have a null id.
+    """
+    return recurring_svc.list_series(db, user.id, include_inactive=include_inactive)
+
+@router.post('/recurring/scan', dependencies=[Depends(enforce_shabbat_readonly)])
+def recurring_scan(full: bool = False, db: Session = Depends(get_db), user=Depends(get_current_user)):
+    """Run detection now; `full=true` rebuilds every series (needed after editing or deleting old transactions)."""
+    scanned = recurring_svc.scan(db, user.id, full=full)
+    return {"scanned": scanned, "series": len(recurring_svc.list_series(db, user.id, include_inactive=True))}
+
 @router.post("/", response_model=TransactionOut, dependencies=[Depends(enforce_shabbat_readonly)])
 def create_transaction(tx_in: TransactionCreate, db: Session = Depends(get_db), user=Depends(get_current_user)):
     account = db.query(Account).filter(Account.id == tx_in.account_id, Account.user_id == user.id).first()
@@ -238,6 +295,8 @@ def update_transaction(tx_id: int, upd: TransactionUpdate, db: Session = Depends
                 raise HTTPException(status_code=400, detail='Invalid date format')
     if upd.note is not None:
         tx.note = upd.note
+    if upd.cleared is not None:
+        tx.cleared = upd.cleared
 
     # handle category/amount together to ensure sign correctness
     if upd.category_id is not None:
@@ -294,60 +353,106 @@ def transfer(t: TransferIn, db: Session = Depends(get_db), user=Depends(get_curr
     return tx_from
 
 
-@router.post('/import')
-def import_transactions(payload: ImportPayload, db: Session = Depends(get_db), user=Depends(get_current_user)):
-    """Bulk import transactions via simple JSON rows. Amounts should be positive; signs are applied by category type when provided,
-    or left as-is (positive) when no category is given (rules may assign)."""
-    imported = 0
+def _import_rows(db: Session, user_id: int, rows: list[ImportRow], duplicates: str) -> dict:
+    ctx = importer.load_context(db, user_id)
     errors: list[dict] = []
-    for idx, row in enumerate(payload.rows):
+    prepared = []
+    for idx, row in enumerate(rows):
         try:
-            acc = db.query(Account).filter(Account.id == row.account_id, Account.user_id == user.id).first()
-            if not acc:
-                raise HTTPException(status_code=400, detail=f"Row {idx}: Account not found")
-            assigned_category_id = None
-            cat = None
-            if row.category_id:
-                cat = db.query(Category).filter(Category.id == row.category_id, Category.user_id == user.id).first()
-                if not cat:
-                    raise HTTPException(status_code=400, detail=f"Row {idx}: Category not found")
-                assigned_category_id = row.category_id
-            else:
-                # try rules
-                note_text = row.note or ""
-                rules = db.query(CategoryRule).filter(CategoryRule.user_id == user.id).all()
-                for r in rules:
-                    txt = note_text if r.case_sensitive else note_text.lower()
-                    pat = r.pattern if r.case_sensitive else (r.pattern or '').lower()
-                    if pat and pat in txt:
-                        amt = float(row.amount)
-                        if (r.min_amount is not None and amt < r.min_amount):
-                            continue
-                        if (r.max_amount is not None and amt > r.max_amount):
-                            continue
-                        assigned_category_id = r.category_id
-                        cat = db.query(Category).filter(Category.id == assigned_category_id, Category.user_id == user.id).first()
-                        break
-            # compute signed amount
-            magnitude = abs(float(row.amount))
-            if cat:
-                signed = -magnitude if cat.type == CategoryType.EXPENSE else magnitude
-            else:
-                # leave positive magnitude for uncategorized
-                signed = magnitude
-            tx = Transaction(
-                user_id=user.id,
-                account_id=row.account_id,
-                category_id=assigned_category_id,
-                date=row.date if isinstance(row.date, date) else date.fromisoformat(str(row.date)),
-                amount=signed,
-                note=row.note or "",
-            )
-            db.add(tx)
-            imported += 1
-        except HTTPException as he:
-            errors.append({"index": idx, "detail": he.detail})
-        except Exception as e:
-            errors.append({"index": idx, "detail": str(e)})
+            prepared.append((idx, importer.prepare_row(ctx, row.account_id, row.date, row.amount, row.note, row.category_id)))
+        except ValueError as e:
+            errors.append({"index": idx, "detail": f"Row {idx}: {e}"})
+    imported, dupes = importer.insert_batch(db, ctx, prepared, duplicates=duplicates)
     db.commit()
-    return {"imported": imported, "errors": errors}
+    return {"imported": imported, "duplicates": dupes, "errors": errors}
+
+
+@jobs.handler('import_transactions', ImportJob)
+def _import_job(db: Session, user, params: ImportJob, progress) -> dict:
+    return _import_rows(db, user.id, params.rows, params.duplicates)
+
+
+@router.post('/import')
+def import_transactions(
+    payload: ImportPayload,
+    duplicates: str = Query("skip", pattern="^(skip|flag)$"),
+    run_async: bool = Query(False, alias="async"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Bulk import transactions via simple JSON rows. Amounts should be positive; signs are applied by category type when provided,
+    or left as-is (positive) when no category is given (rules may assign).
+
+    Rows matching an existing transaction (same account, date, amount and note) are
+    skipped and listed under `duplicates`; with `duplicates=flag` they are imported
+    anyway and still listed. With `async=true` the import runs as a background
+    job and the response carries its id.
+    """
+    if run_async:
+        return enqueue_or_422(db, user.id, 'import_transactions',
+                              {"rows": [r.model_dump() for r in payload.rows], "duplicates": duplicates})
+    return _import_rows(db, user.id, payload.rows, duplicates)
+
+
+def _import_file(db: Session, ctx, raw, filename: Optional[str], account_id: int, format: Optional[str],
+                 date_format: Optional[str], duplicates: str, chunk_size: int, on_progress=None) -> dict:
+    head = raw.read(512)
+    raw.seek(0)
+    fmt = format or statement_parser.detect_format(filename, head)
+    records = statement_parser.iter_rows(raw, "ofx" if fmt == "qfx" else fmt)
+    return importer.import_stream(db, ctx, account_id, records, date_format=date_format,
+                                  duplicates=duplicates, chunk_size=chunk_size, on_progress=on_progress)
+
+
+@jobs.handler('import_file', ImportFileJob, internal=True)
+def _import_file_job(db: Session, user, params: ImportFileJob, progress) -> dict:
+    ctx = importer.load_context(db, user.id)
+    if params.account_id not in ctx.account_ids:
+        raise ValueError("Account not found")
+    with open(jobs.spooled(params.spool), 'rb') as raw:
+        size = max(1, os.fstat(raw.fileno()).st_size)
+        return _import_file(db, ctx, raw, params.filename, params.account_id, params.format, params.date_format,
+                            params.duplicates, params.chunk_size,
+                            on_progress=lambda counts: progress(min(1.0, raw.tell() / size), **counts))
+
+
+@router.post('/import/file')
+def import_statement_file(
+    file: UploadFile = File(...),
+    account_id: int = Form(...),
+    format: Optional[str] = Form(None, pattern="^(csv|ofx|qfx)$"),
+    date_format: Optional[str] = Form(None),
+    duplicates: str = Form("skip", pattern="^(skip|flag)$"),
+    chunk_size: int = Form(importer.IMPORT_CHUNK, ge=1, le=10000),
+    run_async: bool = Query(False, alias="async"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """Import a CSV or OFX/QFX bank export into one account.
+
+    The upload is parsed incrementally and committed `chunk_size` rows at a
+    time, so large multi-year files import with bounded memory. The format is
+    taken from `format`, else the file extension, else sniffed. CSV files need a
+    header with a date column and either an amount or debit/credit columns;
+    an optional `category` column is matched by name. Statement amounts keep
+    their sign unless a category decides it. Only the first 100 duplicates
+    and errors are listed; the `*_count` fields have the totals.
+
+    With `async=true` the upload is spooled to disk and imported by a
+    background job whose progress reports the share of the file read.
+    """
+    ctx = importer.load_context(db, user.id)
+    if account_id not in ctx.account_ids:
+        raise HTTPException(status_code=404, detail="Account not found")
+    if run_async:
+        path = jobs.spool_path(os.path.splitext(file.filename or '')[1])
+        with open(path, 'wb') as out:
+            shutil.copyfileobj(file.file, out)
+        return enqueue_or_422(db, user.id, 'import_file', {
+            "spool": os.path.basename(path), "filename": file.filename, "account_id": account_id, "format": format,
+            "date_format": date_format, "duplicates": duplicates, "chunk_size": chunk_size,
+        }, internal=True)
+    try:
+        return _import_file(db, ctx, file.file, file.filename, account_id, format, date_format, duplicates, chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
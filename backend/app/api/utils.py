@@ -2,16 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from ..core.db import get_db
 from ..services.deps import get_current_user
-from ..services.jewish import maaser_from_income, get_holidays
+from ..services.jewish import maaser_from_income, get_holidays, get_holidays_range
 from ..models.user import User
 from pydantic import BaseModel
 from ..utils.security import verify_password, get_password_hash
 from ..models.security import UserTwoFA
 import secrets
-import pyotp
 import hashlib
-import requests
-import time
 
 class ProfileUpdate(BaseModel):
     full_name: str | None = None
@@ -28,8 +25,6 @@ class ProfileUpdate(BaseModel):
     maaser_opt_in: bool | None = None
 
 router = APIRouter()
-_addr_cache: dict[str, tuple[float, list[dict]]] = {}
-_ADDR_TTL = 45.0
 
 @router.get("/me")
 def me(user=Depends(get_current_user)):
@@ -58,90 +53,43 @@ def maaser(amount: float):
     return {"amount": amount, "maaser": maaser_from_income(amount)}
 
 @router.get("/holidays")
-def holidays(year: int):
-    return get_holidays(year)
+def holidays(year: int, israel: bool = False):
+    return get_holidays(year, israel)
+
+@router.get("/holidays/range")
+def holidays_range(start_year: int, end_year: int, israel: bool = False):
+    if end_year < start_year or end_year - start_year > 50:
+        raise HTTPException(status_code=400, detail="Year range must be ascending and span at most 50 years")
+    return get_holidays_range(start_year, end_year, israel)
 
 
 @router.get('/address_lookup')
-def address_lookup(q: str = Query(..., min_length=3)):
+async def address_lookup(q: str = Query(..., min_length=3)):
     """
     Public endpoint: given a free-form address string, returns best-guess normalized components.
     Uses OpenStreetMap Nominatim for geocoding without using device geolocation.
     """
     try:
-        resp = requests.get(
-            'https://nominatim.openstreetmap.org/search',
-            params={ 'q': q, 'format': 'json', 'addressdetails': 1, 'limit': 1 },
-            headers={ 'User-Agent': 'MalkaMoney/0.1 (address-lookup)' },
-            timeout=5,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        if not data:
-            return { 'found': False }
-        addr = data[0].get('address', {})
-        house_number = addr.get('house_number')
-        road = addr.get('road') or addr.get('pedestrian') or addr.get('footway') or ''
-        line1 = ' '.join([x for x in [house_number, road] if x]) or (addr.get('neighbourhood') or addr.get('suburb') or '')
-        city = addr.get('city') or addr.get('town') or addr.get('village') or addr.get('hamlet') or ''
-        state = addr.get('state') or addr.get('region') or ''
-        postal_code = addr.get('postcode') or ''
-        country = addr.get('country') or ''
-        return {
-            'found': True,
-            'address_line1': line1,
-            'city': city,
-            'state': state,
-            'postal_code': postal_code,
-            'country': country,
-        }
-    except Exception as e:
+        from ..services import geocode
+        items = await geocode.search(q, limit=1)
+    except Exception:
         # Do not leak upstream errors; return not found
         return { 'found': False }
+    if not items:
+        return { 'found': False }
+    found = dict(items[0])
+    found.pop('label', None)
+    return { 'found': True, **found }
 
 
 @router.get('/address_suggest')
-def address_suggest(q: str = Query(..., min_length=3), limit: int = 5):
+async def address_suggest(q: str = Query(..., min_length=3), limit: int = 5):
     """
     Returns up to `limit` suggestions for the given free-form query, with a label and normalized fields.
     """
     try:
-        # cache lookup
-        key = f"{q.strip()}::{max(1, min(limit, 10))}"
-        now = time.time()
-        if key in _addr_cache:
-            ts, items = _addr_cache[key]
-            if now - ts < _ADDR_TTL:
-                return { 'items': items }
-        resp = requests.get(
-            'https://nominatim.openstreetmap.org/search',
-            params={ 'q': q, 'format': 'json', 'addressdetails': 1, 'limit': max(1, min(limit, 10)) },
-            headers={ 'User-Agent': 'MalkaMoney/0.1 (address-suggest)' },
-            timeout=5,
-        )
-        resp.raise_for_status()
-        rows = resp.json() or []
-        out = []
-        for row in rows:
-            addr = row.get('address', {})
-            house_number = addr.get('house_number')
-            road = addr.get('road') or addr.get('pedestrian') or addr.get('footway') or ''
-            line1 = ' '.join([x for x in [house_number, road] if x]) or (addr.get('neighbourhood') or addr.get('suburb') or '')
-            city = addr.get('city') or addr.get('town') or addr.get('village') or addr.get('hamlet') or ''
-            state = addr.get('state') or addr.get('region') or ''
-            postal_code = addr.get('postcode') or ''
-            country = addr.get('country') or ''
-            label = row.get('display_name') or ' '.join(filter(None, [line1, city, state, postal_code, country]))
-            out.append({
-                'label': label,
-                'address_line1': line1,
-                'city': city,
-                'state': state,
-                'postal_code': postal_code,
-                'country': country,
-            })
-        _addr_cache[key] = (now, out)
-        return { 'items': out }
+        from ..services import geocode
+        return { 'items': await geocode.search(q, limit=limit) }
     except Exception:
         return { 'items': [] }
 
@@ -197,6 +145,19 @@ class TwoFAStatus(BaseModel):
     qr_b64: str | None = None
 
 
+def _qr_png_b64(uri: str) -> str | None:
+    # qrcode + Pillow are only needed while enrolling 2FA; load them on first use
+    try:
+        import qrcode
+        import io, base64
+        img = qrcode.make(uri)
+        buf = io.BytesIO()
+        img.save(buf, format='PNG')
+        return base64.b64encode(buf.getvalue()).decode()
+    except Exception:
+        return None
+
+
 @router.get('/2fa', response_model=TwoFAStatus)
 def twofa_status(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
     rec = db.query(UserTwoFA).filter(UserTwoFA.user_id == user.id).first()
@@ -206,17 +167,10 @@ def twofa_status(db: Session = Depends(get_db), user: User = Depends(get_current
     provisioning_uri = None
     qr_b64 = None
     if rec.secret and not rec.enabled:
+        import pyotp
         totp = pyotp.TOTP(rec.secret)
         provisioning_uri = totp.provisioning_uri(name=user.email, issuer_name="Malka Money")
-        try:
-            import qrcode
-            import io, base64
-            img = qrcode.make(provisioning_uri)
-            buf = io.BytesIO()
-            img.save(buf, format='PNG')
-            qr_b64 = base64.b64encode(buf.getvalue()).decode()
-        except Exception:
-            qr_b64 = None
+        qr_b64 = _qr_png_b64(provisioning_uri)
     return {
         "enabled": bool(rec.enabled),
         "secret": rec.secret if not rec.enabled else None,
@@ -233,6 +187,7 @@ class TwoFAEnable(BaseModel):
 
 @router.post('/2fa')
 def twofa_toggle(payload: TwoFAEnable, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+    import pyotp
     rec = db.query(UserTwoFA).filter(UserTwoFA.user_id == user.id).first()
     if not rec:
         rec = UserTwoFA(user_id=user.id)
@@ -248,16 +203,7 @@ def twofa_toggle(payload: TwoFAEnable, db: Session = Depends(get_db), user: User
             # include provisioning uri and qr
             totp = pyotp.TOTP(rec.secret)
             provisioning_uri = totp.provisioning_uri(name=user.email, issuer_name="Malka Money")
-            qr_b64 = None
-            try:
-                import qrcode
-                import io, base64
-                img = qrcode.make(provisioning_uri)
-                buf = io.BytesIO()
-                img.save(buf, format='PNG')
-                qr_b64 = base64.b64encode(buf.getvalue()).decode()
-            except Exception:
-                pass
+            qr_b64 = _qr_png_b64(provisioning_uri)
             return {"ok": True, "enabled": False, "secret": rec.secret, "recovery_plain": codes_plain, "provisioning_uri": provisioning_uri, "qr_b64": qr_b64}
         # Step 2: if code is provided, verify and enable
         if payload.code:
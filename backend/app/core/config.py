@@ -1,5 +1,7 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from ..utils.net import parse_nameservers
 
 class Settings(BaseSettings):
     # Secrets and tokens
@@ -13,6 +15,8 @@ class Settings(BaseSettings):
     HTTPS_REDIRECT: bool = False  # enable in prod behind TLS
     ALLOWED_HOSTS: str = "localhost,127.0.0.1"
     BACKEND_CORS_ORIGINS: str = "http://localhost:5173"
+    # Bearer token for /api/admin/* (metrics scrapers, batch jobs). Empty = open in dev, disabled in prod.
+    ADMIN_TOKEN: str = ""
 
     # Password hashing
     PASSWORD_HASH_ITERATIONS: int = 260_000
@@ -25,6 +29,36 @@ class Settings(BaseSettings):
     DEFAULT_LON: float = 35.235
     DEFAULT_TZ: str = "Asia/Jerusalem"
 
+    # Address lookup (OpenStreetMap Nominatim or a compatible server)
+    ADDRESS_LOOKUP_URL: str = "https://nominatim.openstreetmap.org"
+    ADDRESS_LOOKUP_TIMEOUT: float = 5.0
+    ADDRESS_CACHE_SIZE: int = 2048
+    ADDRESS_CACHE_TTL: float = 3600.0
+
+    # Email domain verification at registration (MX -> A/AAAA)
+    EMAIL_DNS_CHECK: bool = True
+    EMAIL_DNS_NAMESERVERS: str = ""  # comma-separated host[:port] or [ipv6]:port, one shared port; empty = system resolver
+    EMAIL_DNS_TIMEOUT: float = 3.0
+    EMAIL_DNS_MAX_CONCURRENCY: int = 8
+    EMAIL_DNS_CACHE_SIZE: int = 4096
+    EMAIL_DNS_POSITIVE_TTL: float = 86400.0
+    EMAIL_DNS_NEGATIVE_TTL: float = 900.0
+
+    # Background jobs (in-process thread pool; the jobs table is the queue)
+    JOB_WORKERS: int = 2
+    JOB_SPOOL_DIR: str = ""  # uploads waiting for a job; empty = system temp dir
+    JOB_RETENTION_HOURS: float = 24.0
+
+    # Goal progress computed from linked accounts/categories, cached per user data version
+    GOAL_CACHE_SIZE: int = 1024
+    GOAL_CACHE_TTL: float = 3600.0
+
+    @field_validator("EMAIL_DNS_NAMESERVERS")
+    @classmethod
+    def _check_nameservers(cls, v: str) -> str:
+        parse_nameservers(v)  # a bad value fails at boot, not on the first registration
+        return v
+
     class Config:
         env_file = "backend/.env"
 
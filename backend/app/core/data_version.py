@@ -0,0 +1,40 @@
+"""Per-user data version: `users.data_version` goes up on every transaction write.
+
+Caches of values derived from a user's transactions (goal progress, for one)
+key on it, so they are never served stale and need no invalidation calls
+from the many write paths (endpoints, imports, jobs). SQLite triggers do the
+counting, so Core bulk inserts are covered too; a category's type change
+counts as well since it flips the sign of its amounts in derived figures. On
+other databases nothing is created and `current` returns None, which callers
+treat as "do not cache".
+"""
+from typing import Optional
+
+from sqlalchemy import DDL, event, text
+
+_BUMP = "UPDATE users SET data_version = COALESCE(data_version, 0) + 1 WHERE id = {row}.user_id;"
+
+CREATE_STATEMENTS = [
+    f"CREATE TRIGGER IF NOT EXISTS users_data_version_ai AFTER INSERT ON transactions BEGIN {_BUMP.format(row='new')} END",
+    f"CREATE TRIGGER IF NOT EXISTS users_data_version_ad AFTER DELETE ON transactions BEGIN {_BUMP.format(row='old')} END",
+    f"CREATE TRIGGER IF NOT EXISTS users_data_version_au AFTER UPDATE ON transactions BEGIN {_BUMP.format(row='new')} END",
+]
+
+CATEGORY_STATEMENTS = [
+    f"CREATE TRIGGER IF NOT EXISTS users_data_version_cat_au AFTER UPDATE OF type ON categories BEGIN {_BUMP.format(row='new')} END",
+]
+
+
+def install(transactions, categories) -> None:
+    """Create the triggers whenever the tables are created by metadata.create_all."""
+    for stmt in CREATE_STATEMENTS:
+        event.listen(transactions, "after_create", DDL(stmt).execute_if(dialect="sqlite"))
+    for stmt in CATEGORY_STATEMENTS:
+        event.listen(categories, "after_create", DDL(stmt).execute_if(dialect="sqlite"))
+
+
+def current(db, user_id: int) -> Optional[int]:
+    """The user's data version, or None where triggers do not maintain it."""
+    if db.get_bind().dialect.name != "sqlite":
+        return None
+    return db.execute(text("SELECT COALESCE(data_version, 0) FROM users WHERE id = :id"), {"id": user_id}).scalar()
@@ -10,9 +10,10 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 async def init_db():
-    # Placeholder for migrations or seed data
-    from ..services.bootstrap import ensure_bootstrap, migrate_sqlite
-    migrate_sqlite(engine)
+    # Apply pending schema migrations (a single version-row read when up to date), then seed data
+    from .migrations import run_migrations
+    from ..services.bootstrap import ensure_bootstrap
+    run_migrations(engine)
     ensure_bootstrap()
 
 # Dependency
@@ -0,0 +1,55 @@
+"""SQLite FTS5 index over transaction notes.
+
+`transactions_fts` is an external-content FTS5 table (it stores only the index;
+note text stays in `transactions`) kept in sync by triggers, so every write
+path, including bulk inserts and imports, is covered without endpoint code.
+On other databases nothing is created and search falls back to LIKE.
+"""
+import re
+from typing import List, Optional
+
+from sqlalchemy import DDL, event, text
+
+FTS_TABLE = "transactions_fts"
+
+CREATE_STATEMENTS = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "note, content='transactions', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, note) VALUES (new.id, new.note); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, note) VALUES ('delete', old.id, old.note); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF note ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, note) VALUES ('delete', old.id, old.note); "
+    f"INSERT INTO {FTS_TABLE}(rowid, note) VALUES (new.id, new.note); END",
+]
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def install(table) -> None:
+    """Create the index and triggers whenever `table` (transactions) is created by metadata.create_all."""
+    for stmt in CREATE_STATEMENTS:
+        event.listen(table, "after_create", DDL(stmt).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"))
+
+
+def available(db) -> bool:
+    bind = db.get_bind()
+    if bind.dialect.name != "sqlite":
+        return False
+    return db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first() is not None
+
+
+def tokens(q: str) -> List[str]:
+    return _TOKEN.findall(q or "")
+
+
+def match_expression(q: str) -> Optional[str]:
+    """Every word of `q` as a quoted prefix term, ANDed: 'coffee sta' -> '"coffee"* "sta"*'."""
+    words = tokens(q)
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
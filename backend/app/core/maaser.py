@@ -0,0 +1,54 @@
+"""Triggers keeping the per-month Maaser ledger (`maaser_months`) in step with transactions.
+
+Every insert, delete and relevant update on `transactions` adds (or takes
+back) the row's contribution to its user's month: income, Tzedakah paid and
+the net flow on the Maaser account. Like the note index in `fts`, this covers
+bulk inserts and imports without endpoint code. Classification depends on
+category and account names, so renaming those calls
+`services.maaser.rebuild` instead. On other databases nothing is created and
+the ledger is computed from transactions when read.
+"""
+from sqlalchemy import DDL, event
+
+LEDGER_TABLE = "maaser_months"
+MAASER_ACCOUNT = "Maaser"
+TZEDAKAH_CATEGORY = "Tzedakah"
+
+
+def _contribution(row: str, sign: str) -> str:
+    """INSERT ... ON CONFLICT adding `sign` x the contribution of `row` (NEW or OLD) to its month."""
+    not_transfer = f"COALESCE({row}.is_transfer, 0) = 0"
+    return (
+        f"INSERT INTO {LEDGER_TABLE} (user_id, month, income, paid, maaser_net) "
+        f"SELECT user_id, month, {sign} * income, {sign} * paid, {sign} * maaser_net FROM ("
+        f"SELECT {row}.user_id AS user_id, strftime('%Y-%m', {row}.date) AS month, "
+        f"CASE WHEN {not_transfer} AND (c.type = 'INCOME' OR (c.id IS NULL AND {row}.amount > 0)) "
+        f"OR (a.name = '{MAASER_ACCOUNT}' AND {row}.amount > 0 AND NOT {not_transfer}) "
+        f"THEN {row}.amount ELSE 0 END AS income, "
+        f"CASE WHEN {row}.amount < 0 AND (c.name = '{TZEDAKAH_CATEGORY}' "
+        f"OR (a.name = '{MAASER_ACCOUNT}' AND {not_transfer})) THEN -{row}.amount ELSE 0 END AS paid, "
+        f"CASE WHEN a.name = '{MAASER_ACCOUNT}' THEN {row}.amount ELSE 0 END AS maaser_net "
+        f"FROM (SELECT 1) LEFT JOIN categories c ON c.id = {row}.category_id "
+        f"LEFT JOIN accounts a ON a.id = {row}.account_id"
+        f") WHERE income <> 0 OR paid <> 0 OR maaser_net <> 0 "
+        f"ON CONFLICT (user_id, month) DO UPDATE SET income = {LEDGER_TABLE}.income + excluded.income, "
+        f"paid = {LEDGER_TABLE}.paid + excluded.paid, maaser_net = {LEDGER_TABLE}.maaser_net + excluded.maaser_net;"
+    )
+
+
+CREATE_STATEMENTS = [
+    f"CREATE TRIGGER IF NOT EXISTS {LEDGER_TABLE}_ai AFTER INSERT ON transactions BEGIN "
+    f"{_contribution('new', '1')} END",
+    f"CREATE TRIGGER IF NOT EXISTS {LEDGER_TABLE}_ad AFTER DELETE ON transactions BEGIN "
+    f"{_contribution('old', '-1')} END",
+    f"CREATE TRIGGER IF NOT EXISTS {LEDGER_TABLE}_au "
+    "AFTER UPDATE OF user_id, account_id, category_id, date, amount, is_transfer ON transactions BEGIN "
+    f"{_contribution('old', '-1')} {_contribution('new', '1')} END",
+]
+
+
+def install(table) -> None:
+    """Create the triggers whenever `table` (transactions) is created by metadata.create_all."""
+    for stmt in CREATE_STATEMENTS:
+        # DDL applies %-formatting to its text; strftime's pattern needs escaping
+        event.listen(table, "after_create", DDL(stmt.replace("%", "%%")).execute_if(dialect="sqlite"))
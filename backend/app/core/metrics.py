@@ -0,0 +1,168 @@
+"""Per-request SQL statement counting and per-route latency statistics.
+
+SQLAlchemy cursor events attribute each statement to the request running in the
+current context (contextvars follow sync endpoints into the threadpool), and
+`render_prometheus()` exposes the aggregates in Prometheus text format.
+"""
+import time
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+QUANTILES = (0.5, 0.95, 0.99)
+SAMPLE_SIZE = 1024  # recent durations kept per route for quantiles
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_time: float = 0.0
+
+
+@dataclass
+class RouteStats:
+    count: int = 0
+    duration_sum: float = 0.0
+    db_time_sum: float = 0.0
+    queries_sum: int = 0
+    latency_buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    query_buckets: List[int] = field(default_factory=lambda: [0] * len(QUERY_BUCKETS))
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=SAMPLE_SIZE))
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_routes: Dict[Tuple[str, str, int], RouteStats] = {}
+_lock = Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # one statement runs at a time per connection; a statement that raises never
+    # reaches the after hook, and the next one simply overwrites its start time
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_start", None)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        if started is not None:
+            stats.db_time += time.perf_counter() - started
+
+
+def install(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def start_request() -> Tuple[RequestStats, object]:
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def record(method: str, route: str, status: int, duration: float, stats: RequestStats) -> None:
+    status_class = status // 100
+    with _lock:
+        rs = _routes.get((method, route, status_class))
+        if rs is None:
+            rs = _routes[(method, route, status_class)] = RouteStats()
+        rs.count += 1
+        rs.duration_sum += duration
+        rs.db_time_sum += stats.db_time
+        rs.queries_sum += stats.queries
+        i = bisect_left(LATENCY_BUCKETS, duration)
+        if i < len(LATENCY_BUCKETS):
+            rs.latency_buckets[i] += 1
+        j = bisect_left(QUERY_BUCKETS, stats.queries)
+        if j < len(QUERY_BUCKETS):
+            rs.query_buckets[j] += 1
+        rs.samples.append(duration)
+
+
+def reset() -> None:
+    with _lock:
+        _routes.clear()
+
+
+def _quantile(sorted_samples: List[float], q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    idx = min(len(sorted_samples) - 1, max(0, int(round(q * (len(sorted_samples) - 1)))))
+    return sorted_samples[idx]
+
+
+def _esc(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus() -> str:
+    with _lock:
+        snapshot = [
+            (key, rs.count, rs.duration_sum, rs.db_time_sum, rs.queries_sum,
+             list(rs.latency_buckets), list(rs.query_buckets), sorted(rs.samples))
+            for key, rs in sorted(_routes.items())
+        ]
+    lines = [
+        "# HELP http_request_duration_seconds Wall time per request (quantiles over recent requests).",
+        "# TYPE http_request_duration_seconds summary",
+    ]
+    for (method, route, sc), count, dur_sum, _db, _q, _lb, _qb, samples in snapshot:
+        labels = f'method="{method}",route="{_esc(route)}",status="{sc}xx"'
+        for q in QUANTILES:
+            lines.append(f'http_request_duration_seconds{{{labels},quantile="{q}"}} {_quantile(samples, q):.6f}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {dur_sum:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {count}")
+
+    lines += [
+        "# HELP http_request_latency_seconds Wall time per request.",
+        "# TYPE http_request_latency_seconds histogram",
+    ]
+    for (method, route, sc), count, dur_sum, _db, _q, lat_buckets, _qb, _s in snapshot:
+        labels = f'method="{method}",route="{_esc(route)}",status="{sc}xx"'
+        cumulative = 0
+        for le, n in zip(LATENCY_BUCKETS, lat_buckets):
+            cumulative += n
+            lines.append(f'http_request_latency_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'http_request_latency_seconds_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"http_request_latency_seconds_sum{{{labels}}} {dur_sum:.6f}")
+        lines.append(f"http_request_latency_seconds_count{{{labels}}} {count}")
+
+    lines += [
+        "# HELP http_request_db_queries SQL statements executed per request.",
+        "# TYPE http_request_db_queries histogram",
+    ]
+    for (method, route, sc), count, _d, _db, q_sum, _lb, q_buckets, _s in snapshot:
+        labels = f'method="{method}",route="{_esc(route)}",status="{sc}xx"'
+        cumulative = 0
+        for le, n in zip(QUERY_BUCKETS, q_buckets):
+            cumulative += n
+            lines.append(f'http_request_db_queries_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'http_request_db_queries_bucket{{{labels},le="+Inf"}} {count}')
+        lines.append(f"http_request_db_queries_sum{{{labels}}} {q_sum}")
+        lines.append(f"http_request_db_queries_count{{{labels}}} {count}")
+
+    lines += [
+        "# HELP http_request_db_seconds_total Time spent executing SQL, summed per route.",
+        "# TYPE http_request_db_seconds_total counter",
+    ]
+    for (method, route, sc), _c, _d, db_sum, _q, _lb, _qb, _s in snapshot:
+        labels = f'method="{method}",route="{_esc(route)}",status="{sc}xx"'
+        lines.append(f"http_request_db_seconds_total{{{labels}}} {db_sum:.6f}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,53 @@
+"""Versioned schema migrations (Alembic) applied at startup.
+
+Boot only reads the single `alembic_version` row and compares it with the
+newest revision file; Alembic itself is imported and run only when something
+is pending. Revision ids are zero-padded sequence numbers (0001, 0002, ...)
+that prefix their file names, so the head is the largest prefix.
+"""
+import os
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+VERSIONS_DIR = os.path.join(MIGRATIONS_DIR, "versions")
+
+
+def head_revision() -> str:
+    revs = [name.split("_", 1)[0] for name in os.listdir(VERSIONS_DIR) if name[:4].isdigit() and name.endswith(".py")]
+    return max(revs)
+
+
+def current_revision(engine: Engine) -> Optional[str]:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def alembic_config(connection=None):
+    from alembic.config import Config
+
+    cfg = Config()
+    cfg.set_main_option("script_location", MIGRATIONS_DIR)
+    cfg.attributes["connection"] = connection
+    return cfg
+
+
+def upgrade(engine: Engine, revision: str = "head") -> None:
+    from alembic import command
+
+    with engine.begin() as conn:
+        command.upgrade(alembic_config(conn), revision)
+
+
+def run_migrations(engine: Engine) -> bool:
+    """Apply pending migrations. Returns True if anything ran."""
+    if current_revision(engine) == head_revision():
+        return False
+    upgrade(engine)
+    return True
@@ -1,3 +1,5 @@
+import sys
+import time
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
@@ -6,13 +8,16 @@ from slowapi.middleware import SlowAPIMiddleware
 from .core.rate_limit import limiter, rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from .core.config import settings
-from .api import auth, accounts, transactions, budgets, reports, goals, utils, categories, investments, connections, rules, debt
-from .core.db import Base, engine, init_db
-# ensure models are imported before create_all
+from .api import auth, accounts, transactions, budgets, reports, goals, utils, categories, investments, connections, rules, debt, admin, jobs
+from .core.db import engine, init_db
+from .core import metrics
+from .services import jobs as job_service
+# ensure every model is registered before the first query configures mappers
 from .models import user as _user_models  # noqa: F401
 from .models import finance as _finance_models  # noqa: F401
 from .models import security as _security_models  # noqa: F401
 from .models import connections as _connections_models  # noqa: F401
+from .models import jobs as _jobs_models  # noqa: F401
 
 app = FastAPI(title="Malka Money API", version="0.1.0")
 
@@ -54,13 +59,40 @@ async def add_security_headers(request: Request, call_next):
         response.headers.setdefault("Strict-Transport-Security", "max-age=63072000; includeSubDomains; preload")
     return response
 
+# Query counting / latency per route template; outermost so it times the whole stack
+metrics.install(engine)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    stats, token = metrics.start_request()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        response.headers["X-DB-Queries"] = str(stats.queries)
+        return response
+    finally:
+        route = request.scope.get("route")
+        template = getattr(route, "path", None) or "<unmatched>"
+        metrics.record(request.method, template, status_code, time.perf_counter() - started, stats)
+        metrics.end_request(token)
+
 @app.on_event("startup")
 async def on_startup():
     # Refuse to boot with default secret in production
     if settings.ENV.lower() == "prod" and settings.SECRET_KEY == "change-me":
         raise RuntimeError("SECURITY: SECRET_KEY must be set to a strong value in production")
-    Base.metadata.create_all(bind=engine)
     await init_db()
+    job_service.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # the geocoder (and httpx) is imported on first address lookup; nothing to close otherwise
+    job_service.shutdown()
+    geocode = sys.modules.get(f"{__package__}.services.geocode")
+    if geocode is not None:
+        await geocode.close_client()
 
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"]) 
 app.include_router(accounts.router, prefix="/api/accounts", tags=["accounts"]) 
@@ -74,6 +106,8 @@ app.include_router(investments.router, prefix="/api/investments", tags=["investm
 app.include_router(connections.router, prefix="/api/connections", tags=["connections"]) 
 app.include_router(rules.router, prefix="/api/rules", tags=["rules"]) 
 app.include_router(debt.router, prefix="/api/debt", tags=["debt"]) 
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"]) 
 
 @app.get("/")
 async def root():
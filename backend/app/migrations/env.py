@@ -0,0 +1,41 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("connection") is None:
+    fileConfig(config.config_file_name)
+
+# Revisions describe their own tables; no autogenerate target.
+target_metadata = None
+
+
+def _run(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # called in-process by app.core.migrations
+        _run(connection)
+        return
+    try:
+        from app.core.config import settings
+    except ImportError:
+        from backend.app.core.config import settings
+    engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    with engine.connect() as conn:
+        _run(conn)
+
+
+if context.is_offline_mode():
+    raise RuntimeError("Offline (SQL script) migrations are not supported")
+run_migrations_online()
@@ -0,0 +1,186 @@
+"""baseline schema
+
+Creates every table on a fresh database. On databases that predate versioned
+migrations (built by create_all plus the old migrate_sqlite ALTERs) it only adds
+the columns and indexes that are missing, so both converge on the same schema.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+meta = sa.MetaData()
+
+sa.Table(
+    'users', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('username', sa.String, unique=True, index=True, nullable=True),
+    sa.Column('email', sa.String, unique=True, index=True, nullable=False),
+    sa.Column('hashed_password', sa.String, nullable=False),
+    sa.Column('full_name', sa.String),
+    sa.Column('dob', sa.String),
+    sa.Column('phone', sa.String),
+    sa.Column('base_currency', sa.String),
+    sa.Column('address_line1', sa.String),
+    sa.Column('address_line2', sa.String),
+    sa.Column('city', sa.String),
+    sa.Column('state', sa.String),
+    sa.Column('postal_code', sa.String),
+    sa.Column('country', sa.String),
+    sa.Column('shabbat_mode', sa.Boolean),
+    sa.Column('tz', sa.String),
+    sa.Column('lat', sa.Float),
+    sa.Column('lon', sa.Float),
+    sa.Column('maaser_pct', sa.Float),
+)
+
+sa.Table(
+    'accounts', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('name', sa.String, nullable=False),
+    sa.Column('type', sa.Enum('CASH', 'SAVINGS', 'CREDIT_CARD', 'LOAN', 'INVESTMENT', name='accounttype'), nullable=False),
+    sa.Column('opening_balance', sa.Float),
+    sa.Column('is_liability', sa.Boolean),
+    sa.Column('apr_annual', sa.Float),
+    sa.Column('min_payment', sa.Float),
+    sa.Column('due_day', sa.Integer),
+)
+
+sa.Table(
+    'categories', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('name', sa.String, nullable=False),
+    sa.Column('type', sa.Enum('INCOME', 'EXPENSE', name='categorytype'), nullable=False),
+    sa.Column('is_builtin', sa.Boolean),
+    sa.Column('icon', sa.String),
+)
+
+sa.Table(
+    'transactions', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('account_id', sa.Integer, sa.ForeignKey('accounts.id'), nullable=False),
+    sa.Column('category_id', sa.Integer, sa.ForeignKey('categories.id'), nullable=True),
+    sa.Column('date', sa.Date, nullable=False),
+    sa.Column('amount', sa.Float, nullable=False),
+    sa.Column('note', sa.String),
+    sa.Column('is_transfer', sa.Boolean, server_default=sa.text('0')),
+    sa.Column('counterparty_account_id', sa.Integer, sa.ForeignKey('accounts.id'), nullable=True),
+)
+
+sa.Table(
+    'budgets', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('month', sa.String, nullable=False),
+)
+
+sa.Table(
+    'budget_items', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('budget_id', sa.Integer, sa.ForeignKey('budgets.id'), nullable=False),
+    sa.Column('category_id', sa.Integer, sa.ForeignKey('categories.id'), nullable=False),
+    sa.Column('limit', sa.Float, nullable=False),
+    sa.Column('item_type', sa.String),
+    sa.Column('tolerance_pct', sa.Float),
+    sa.Column('window_months', sa.Integer),
+)
+
+sa.Table(
+    'goals', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('name', sa.String, nullable=False),
+    sa.Column('type', sa.Enum('TZEDAKAH', 'WEDDING', 'BAR_MITZVAH', 'PESACH', 'CUSTOM', name='goaltype'), nullable=False),
+    sa.Column('target_amount', sa.Float, nullable=False),
+    sa.Column('current_amount', sa.Float),
+    sa.Column('due_date', sa.String),
+)
+
+sa.Table(
+    'investments', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('symbol', sa.String, nullable=False),
+    sa.Column('name', sa.String, nullable=True),
+)
+
+sa.Table(
+    'investment_transactions', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('investment_id', sa.Integer, sa.ForeignKey('investments.id'), nullable=False),
+    sa.Column('account_id', sa.Integer, sa.ForeignKey('accounts.id'), nullable=False),
+    sa.Column('date', sa.Date, nullable=False),
+    sa.Column('type', sa.String, nullable=False),
+    sa.Column('quantity', sa.Float, nullable=False),
+    sa.Column('unit_price', sa.Float, nullable=False),
+    sa.Column('total_cost', sa.Float, nullable=False),
+)
+
+sa.Table(
+    'category_rules', meta,
+    sa.Column('id', sa.Integer, primary_key=True, index=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+    sa.Column('pattern', sa.String, nullable=False),
+    sa.Column('category_id', sa.Integer, sa.ForeignKey('categories.id'), nullable=False),
+    sa.Column('min_amount', sa.Float),
+    sa.Column('max_amount', sa.Float),
+    sa.Column('case_sensitive', sa.Boolean),
+)
+
+sa.Table(
+    'user_twofa', meta,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), unique=True, index=True, nullable=False),
+    sa.Column('secret', sa.String),
+    sa.Column('enabled', sa.Boolean),
+    sa.Column('recovery_codes', sa.String),
+    sa.UniqueConstraint('user_id', name='uq_user_twofa_user'),
+)
+
+sa.Table(
+    'connected_accounts', meta,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), index=True, nullable=False),
+    sa.Column('provider', sa.String, nullable=False),
+    sa.Column('status', sa.String),
+    sa.Column('display_name', sa.String),
+    sa.Column('external_id', sa.String),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('updated_at', sa.DateTime),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    existing_tables = set(insp.get_table_names())
+    for table in meta.sorted_tables:
+        if table.name not in existing_tables:
+            table.create(bind)
+            continue
+        # legacy database: add whatever columns/indexes are missing
+        have = {c['name'] for c in insp.get_columns(table.name)}
+        for col in table.columns:
+            if col.name not in have:
+                default = col.server_default.arg if col.server_default is not None else None
+                op.add_column(table.name, sa.Column(col.name, col.type, nullable=True, server_default=default))
+        have_idx = {i['name'] for i in insp.get_indexes(table.name)}
+        for idx in table.indexes:
+            if idx.name not in have_idx:
+                idx.create(bind)
+
+
+def downgrade():
+    for table in reversed(meta.sorted_tables):
+        op.drop_table(table.name)
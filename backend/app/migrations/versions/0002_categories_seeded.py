@@ -0,0 +1,32 @@
+"""seed default categories once per user
+
+Adds users.categories_seeded so list_categories no longer re-checks the
+defaults on every call, and indexes categories.user_id. Users who already have
+categories were seeded by the old on-demand path.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+    if 'categories_seeded' not in {c['name'] for c in insp.get_columns('users')}:
+        op.add_column('users', sa.Column('categories_seeded', sa.Boolean, nullable=True, server_default=sa.text('0')))
+    if 'ix_categories_user_id' not in {i['name'] for i in insp.get_indexes('categories')}:
+        op.create_index('ix_categories_user_id', 'categories', ['user_id'])
+    op.execute("UPDATE users SET categories_seeded = 1 WHERE id IN (SELECT DISTINCT user_id FROM categories)")
+
+
+def downgrade():
+    op.drop_index('ix_categories_user_id', table_name='categories')
+    with op.batch_alter_table('users') as batch:
+        batch.drop_column('categories_seeded')
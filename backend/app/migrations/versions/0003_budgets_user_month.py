@@ -0,0 +1,46 @@
+"""one budget per user and month
+
+Merges duplicate (user_id, month) budgets into the oldest one, keeping one
+item per category (the oldest budget's), then adds a unique index that also
+serves month-range listings.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+_KEEPERS = "SELECT MIN(id) FROM budgets GROUP BY user_id, month"
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+    if 'uq_budgets_user_month' in {i['name'] for i in insp.get_indexes('budgets')}:
+        return
+    # an item is dropped when an older budget of the same user and month (or an
+    # older item of the same budget) already has its category
+    op.execute(
+        "DELETE FROM budget_items WHERE category_id IS NOT NULL AND EXISTS ("
+        "SELECT 1 FROM budgets b JOIN budgets ob ON ob.user_id = b.user_id AND ob.month = b.month "
+        "JOIN budget_items o ON o.budget_id = ob.id "
+        "WHERE b.id = budget_items.budget_id AND o.category_id = budget_items.category_id "
+        "AND (ob.id < b.id OR (ob.id = b.id AND o.id < budget_items.id)))"
+    )
+    op.execute(
+        "UPDATE budget_items SET budget_id = ("
+        "SELECT MIN(k.id) FROM budgets b JOIN budgets k ON k.user_id = b.user_id AND k.month = b.month "
+        "WHERE b.id = budget_items.budget_id) "
+        f"WHERE budget_id IN (SELECT id FROM budgets) AND budget_id NOT IN ({_KEEPERS})"
+    )
+    op.execute(f"DELETE FROM budgets WHERE id NOT IN ({_KEEPERS})")
+    op.create_index('uq_budgets_user_month', 'budgets', ['user_id', 'month'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_budgets_user_month', table_name='budgets')
@@ -0,0 +1,47 @@
+"""full-text index on transaction notes (SQLite FTS5)
+
+External-content FTS5 table over transactions.note, kept current by insert,
+delete and note-update triggers, and populated from existing rows. No-op on
+other databases.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+        "note, content='transactions', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN "
+        "INSERT INTO transactions_fts(rowid, note) VALUES (new.id, new.note); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, note) VALUES ('delete', old.id, old.note); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF note ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, note) VALUES ('delete', old.id, old.note); "
+        "INSERT INTO transactions_fts(rowid, note) VALUES (new.id, new.note); END"
+    )
+    op.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in ('transactions_fts_ai', 'transactions_fts_ad', 'transactions_fts_au'):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS transactions_fts")
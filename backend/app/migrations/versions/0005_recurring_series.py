@@ -0,0 +1,49 @@
+"""recurring transaction series
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+    if 'recurring_scanned_id' not in {c['name'] for c in insp.get_columns('users')}:
+        op.add_column('users', sa.Column('recurring_scanned_id', sa.Integer, nullable=True, server_default=sa.text('0')))
+    if 'recurring_series' in insp.get_table_names():
+        return
+    op.create_table(
+        'recurring_series',
+        sa.Column('id', sa.Integer, primary_key=True, index=True),
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('account_id', sa.Integer, sa.ForeignKey('accounts.id'), nullable=False),
+        sa.Column('category_id', sa.Integer, sa.ForeignKey('categories.id'), nullable=True),
+        sa.Column('key', sa.String, nullable=False),
+        sa.Column('direction', sa.Integer, nullable=False),
+        sa.Column('amount_band', sa.Integer, nullable=False),
+        sa.Column('note', sa.String),
+        sa.Column('occurrences', sa.Integer),
+        sa.Column('first_date', sa.Date),
+        sa.Column('last_date', sa.Date),
+        sa.Column('recent_dates', sa.String),
+        sa.Column('recent_amounts', sa.String),
+        sa.Column('cadence', sa.String),
+        sa.Column('interval_days', sa.Float),
+        sa.Column('next_date', sa.Date),
+        sa.Column('next_amount', sa.Float),
+    )
+    op.create_index('uq_recurring_series_group', 'recurring_series',
+                    ['user_id', 'account_id', 'key', 'direction', 'amount_band'], unique=True)
+
+
+def downgrade():
+    op.drop_table('recurring_series')
+    with op.batch_alter_table('users') as batch:
+        batch.drop_column('recurring_scanned_id')
@@ -0,0 +1,62 @@
+"""transaction fingerprints for import de-duplication
+
+Adds transactions.fingerprint with a (user_id, fingerprint) index and fills
+it for existing rows in batches.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+import hashlib
+import re
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+BATCH = 5000
+
+
+def _fingerprint(account_id, tx_date, amount, note):
+    # frozen copy of app.utils.fingerprint at the time of this revision
+    text = re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (note or "").lower())).strip()
+    if not isinstance(tx_date, date):
+        tx_date = date.fromisoformat(str(tx_date)[:10])
+    raw = f"{account_id}|{tx_date.isoformat()}|{float(amount):.2f}|{text}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if 'fingerprint' not in {c['name'] for c in insp.get_columns('transactions')}:
+        op.add_column('transactions', sa.Column('fingerprint', sa.String, nullable=True))
+    if 'ix_transactions_user_fingerprint' not in {i['name'] for i in insp.get_indexes('transactions')}:
+        op.create_index('ix_transactions_user_fingerprint', 'transactions', ['user_id', 'fingerprint'])
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, account_id, date, amount, note FROM transactions "
+                "WHERE fingerprint IS NULL AND id > :last ORDER BY id LIMIT :n"
+            ),
+            {"last": last_id, "n": BATCH},
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE transactions SET fingerprint = :fp WHERE id = :id"),
+            [{"id": r.id, "fp": _fingerprint(r.account_id, r.date, r.amount, r.note)} for r in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    op.drop_index('ix_transactions_user_fingerprint', table_name='transactions')
+    # plain ALTER TABLE DROP COLUMN (SQLite >= 3.35): a batch table copy would drop the FTS triggers
+    op.drop_column('transactions', 'fingerprint')
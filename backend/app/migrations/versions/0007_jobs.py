@@ -0,0 +1,39 @@
+"""background jobs table
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'jobs' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.String(32), primary_key=True),
+        sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('kind', sa.String, nullable=False),
+        sa.Column('status', sa.String, nullable=False),
+        sa.Column('params', sa.Text),
+        sa.Column('progress', sa.Float),
+        sa.Column('progress_detail', sa.Text),
+        sa.Column('result', sa.Text),
+        sa.Column('error', sa.String),
+        sa.Column('created_at', sa.DateTime),
+        sa.Column('started_at', sa.DateTime),
+        sa.Column('finished_at', sa.DateTime),
+    )
+    op.create_index('ix_jobs_user_created', 'jobs', ['user_id', 'created_at'])
+    op.create_index('ix_jobs_status', 'jobs', ['status'])
+
+
+def downgrade():
+    op.drop_table('jobs')
@@ -0,0 +1,91 @@
+"""per-month Maaser ledger maintained by triggers
+
+Adds maaser_months (income, Tzedakah paid and Maaser account net flow per user
+and month), the SQLite insert/delete/update triggers on transactions that keep
+it current, and fills it from existing transactions. The triggers are SQLite
+only; elsewhere the ledger is computed from transactions when read.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+TRIGGERS = ('maaser_months_ai', 'maaser_months_ad', 'maaser_months_au')
+
+
+def _contribution(row, sign):
+    not_transfer = f"COALESCE({row}.is_transfer, 0) = 0"
+    return (
+        "INSERT INTO maaser_months (user_id, month, income, paid, maaser_net) "
+        f"SELECT user_id, month, {sign} * income, {sign} * paid, {sign} * maaser_net FROM ("
+        f"SELECT {row}.user_id AS user_id, strftime('%Y-%m', {row}.date) AS month, "
+        f"CASE WHEN {not_transfer} AND (c.type = 'INCOME' OR (c.id IS NULL AND {row}.amount > 0)) "
+        f"OR (a.name = 'Maaser' AND {row}.amount > 0 AND NOT {not_transfer}) "
+        f"THEN {row}.amount ELSE 0 END AS income, "
+        f"CASE WHEN {row}.amount < 0 AND (c.name = 'Tzedakah' "
+        f"OR (a.name = 'Maaser' AND {not_transfer})) THEN -{row}.amount ELSE 0 END AS paid, "
+        f"CASE WHEN a.name = 'Maaser' THEN {row}.amount ELSE 0 END AS maaser_net "
+        f"FROM (SELECT 1) LEFT JOIN categories c ON c.id = {row}.category_id "
+        f"LEFT JOIN accounts a ON a.id = {row}.account_id"
+        ") WHERE income <> 0 OR paid <> 0 OR maaser_net <> 0 "
+        "ON CONFLICT (user_id, month) DO UPDATE SET income = maaser_months.income + excluded.income, "
+        "paid = maaser_months.paid + excluded.paid, maaser_net = maaser_months.maaser_net + excluded.maaser_net;"
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    if 'maaser_months' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'maaser_months',
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('user_id', sa.Integer, sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('month', sa.String(7), nullable=False),
+            sa.Column('income', sa.Float, nullable=False),
+            sa.Column('paid', sa.Float, nullable=False),
+            sa.Column('maaser_net', sa.Float, nullable=False),
+        )
+        op.create_index('uq_maaser_months_user_month', 'maaser_months', ['user_id', 'month'], unique=True)
+    if bind.dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS maaser_months_ai AFTER INSERT ON transactions BEGIN "
+        f"{_contribution('new', '1')} END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS maaser_months_ad AFTER DELETE ON transactions BEGIN "
+        f"{_contribution('old', '-1')} END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS maaser_months_au "
+        "AFTER UPDATE OF user_id, account_id, category_id, date, amount, is_transfer ON transactions BEGIN "
+        f"{_contribution('old', '-1')} {_contribution('new', '1')} END"
+    )
+    op.execute("DELETE FROM maaser_months")
+    op.execute(
+        "INSERT INTO maaser_months (user_id, month, income, paid, maaser_net) "
+        "SELECT t.user_id, strftime('%Y-%m', t.date), "
+        "SUM(CASE WHEN COALESCE(t.is_transfer, 0) = 0 AND (c.type = 'INCOME' OR (c.id IS NULL AND t.amount > 0)) "
+        "OR (a.name = 'Maaser' AND t.amount > 0 AND COALESCE(t.is_transfer, 0) <> 0) "
+        "THEN t.amount ELSE 0 END), "
+        "SUM(CASE WHEN t.amount < 0 AND (c.name = 'Tzedakah' OR (a.name = 'Maaser' AND COALESCE(t.is_transfer, 0) = 0)) "
+        "THEN -t.amount ELSE 0 END), "
+        "SUM(CASE WHEN a.name = 'Maaser' THEN t.amount ELSE 0 END) "
+        "FROM transactions t LEFT JOIN categories c ON c.id = t.category_id "
+        "LEFT JOIN accounts a ON a.id = t.account_id "
+        "GROUP BY t.user_id, strftime('%Y-%m', t.date)"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for trigger in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.drop_table('maaser_months')
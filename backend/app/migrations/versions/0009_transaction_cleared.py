@@ -0,0 +1,30 @@
+"""reconciliation flag and account ledger index on transactions
+
+Adds transactions.cleared (false for existing rows) and an
+(account_id, date, id) index for keyset-paginated account ledgers.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    insp = sa.inspect(op.get_bind())
+    if 'cleared' not in {c['name'] for c in insp.get_columns('transactions')}:
+        op.add_column('transactions', sa.Column('cleared', sa.Boolean, nullable=True, server_default=sa.text('0')))
+    if 'ix_transactions_account_date' not in {i['name'] for i in insp.get_indexes('transactions')}:
+        op.create_index('ix_transactions_account_date', 'transactions', ['account_id', 'date', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_transactions_account_date', table_name='transactions')
+    # plain ALTER TABLE DROP COLUMN (SQLite >= 3.35): a batch table copy would drop the FTS and Maaser triggers
+    op.drop_column('transactions', 'cleared')
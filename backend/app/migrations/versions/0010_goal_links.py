@@ -0,0 +1,57 @@
+"""goal links and per-user data version
+
+Adds goal_links (accounts or categories feeding a goal's progress),
+goals.start_date, users.data_version and, on SQLite, the triggers that bump
+the data version on every transaction write and category type change.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+BUMP = "UPDATE users SET data_version = COALESCE(data_version, 0) + 1 WHERE id = {row}.user_id;"
+TRIGGERS = {
+    'users_data_version_ai': f"AFTER INSERT ON transactions BEGIN {BUMP.format(row='new')} END",
+    'users_data_version_ad': f"AFTER DELETE ON transactions BEGIN {BUMP.format(row='old')} END",
+    'users_data_version_au': f"AFTER UPDATE ON transactions BEGIN {BUMP.format(row='new')} END",
+    'users_data_version_cat_au': f"AFTER UPDATE OF type ON categories BEGIN {BUMP.format(row='new')} END",
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if 'data_version' not in {c['name'] for c in insp.get_columns('users')}:
+        op.add_column('users', sa.Column('data_version', sa.Integer, nullable=True, server_default=sa.text('0')))
+    if 'start_date' not in {c['name'] for c in insp.get_columns('goals')}:
+        op.add_column('goals', sa.Column('start_date', sa.Date, nullable=True))
+    if 'goal_links' not in insp.get_table_names():
+        op.create_table(
+            'goal_links',
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('goal_id', sa.Integer, sa.ForeignKey('goals.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('account_id', sa.Integer, sa.ForeignKey('accounts.id', ondelete='CASCADE'), nullable=True),
+            sa.Column('category_id', sa.Integer, sa.ForeignKey('categories.id', ondelete='CASCADE'), nullable=True),
+        )
+        op.create_index('ix_goal_links_goal_id', 'goal_links', ['goal_id'])
+    if bind.dialect.name != 'sqlite':
+        return
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('goal_links')
+    # plain ALTER TABLE DROP COLUMN (SQLite >= 3.35): a batch table copy would drop triggers
+    op.drop_column('goals', 'start_date')
+    op.drop_column('users', 'data_version')
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Enum, Boolean, Index, event
 from sqlalchemy.orm import relationship
 from ..core.db import Base
+from ..core import data_version, fts, maaser
+from ..utils.fingerprint import fingerprint
 import enum
 
 class AccountType(str, enum.Enum):
@@ -34,7 +36,7 @@ class Account(Base):
 class Category(Base):
     __tablename__ = "categories"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     type = Column(Enum(CategoryType), nullable=False)
     is_builtin = Column(Boolean, default=False)
@@ -55,6 +57,10 @@ class Transaction(Base):
     # Transfer support
     is_transfer = Column(Boolean, default=False)
     counterparty_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)
+    # hash of (account, date, amount, normalized note) for duplicate detection on import
+    fingerprint = Column(String, nullable=True)
+    # matched against a bank statement during reconciliation
+    cleared = Column(Boolean, default=False)
 
     owner = relationship("User", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
@@ -64,8 +70,29 @@ class Transaction(Base):
     # specify which FK links Transaction -> Account for the main account relationship
     account = relationship("Account", back_populates="transactions", foreign_keys=[account_id])
 
+Index("ix_transactions_user_fingerprint", Transaction.user_id, Transaction.fingerprint)
+# account ledger: keyset pages and running balances in (date, id) order
+Index("ix_transactions_account_date", Transaction.account_id, Transaction.date, Transaction.id)
+
+# note search index (SQLite FTS5) created and dropped alongside the table
+fts.install(Transaction.__table__)
+# per-month Maaser ledger maintained by triggers (see core/maaser.py)
+maaser.install(Transaction.__table__)
+# users.data_version bumped on every transaction write, for derived-data caches
+data_version.install(Transaction.__table__, Category.__table__)
+
+
+@event.listens_for(Transaction, "before_insert")
+@event.listens_for(Transaction, "before_update")
+def _set_fingerprint(mapper, connection, target):
+    # Core bulk inserts (imports) compute it themselves
+    if target.account_id is not None and target.date is not None and target.amount is not None:
+        target.fingerprint = fingerprint(target.account_id, target.date, target.amount, target.note)
+
 class Budget(Base):
     __tablename__ = "budgets"
+    # one budget per user and month; also serves month-range lookups
+    __table_args__ = (Index("uq_budgets_user_month", "user_id", "month", unique=True),)
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     month = Column(String, nullable=False)  # YYYY-MM
@@ -101,10 +128,26 @@ class Goal(Base):
     name = Column(String, nullable=False)
     type = Column(Enum(GoalType), default=GoalType.CUSTOM, nullable=False)
     target_amount = Column(Float, nullable=False)
-    current_amount = Column(Float, default=0.0)
+    current_amount = Column(Float, default=0.0)  # entered by hand; goals with links compute it
     due_date = Column(String, default="")
+    start_date = Column(Date, nullable=True)  # linked transactions count from this date
 
     owner = relationship("User", back_populates="goals")
+    links = relationship("GoalLink", cascade="all, delete-orphan", order_by="GoalLink.id")
+
+
+class GoalLink(Base):
+    """An account or a category whose transactions count towards a goal.
+
+    Account links add the account's net flow (deposits minus withdrawals);
+    category links add money spent in an expense category or received in an
+    income category.
+    """
+    __tablename__ = "goal_links"
+    id = Column(Integer, primary_key=True)
+    goal_id = Column(Integer, ForeignKey("goals.id", ondelete="CASCADE"), nullable=False, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=True)
 
 
 class Investment(Base):
@@ -143,3 +186,54 @@ class CategoryRule(Base):
     min_amount = Column(Float, nullable=True)
     max_amount = Column(Float, nullable=True)
     case_sensitive = Column(Boolean, default=False)
+
+
+class RecurringSeries(Base):
+    """A group of transactions sharing account, normalized note, sign and amount band.
+
+    Every group seen is kept with its running stats so detection can resume from
+    the last scanned transaction; `cadence` is set once the dates look periodic.
+    """
+    __tablename__ = 'recurring_series'
+    __table_args__ = (
+        Index('uq_recurring_series_group', 'user_id', 'account_id', 'key', 'direction', 'amount_band', unique=True),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    account_id = Column(Integer, ForeignKey('accounts.id'), nullable=False)
+    category_id = Column(Integer, ForeignKey('categories.id'), nullable=True)
+    key = Column(String, nullable=False)  # normalized note
+    direction = Column(Integer, nullable=False)  # 1 inflow, -1 outflow
+    amount_band = Column(Integer, nullable=False)  # log-scale bucket of |amount|
+    note = Column(String, default="")  # latest original note, for display
+    occurrences = Column(Integer, default=0)
+    first_date = Column(Date, nullable=True)
+    last_date = Column(Date, nullable=True)
+    recent_dates = Column(String, default="")  # comma-separated ISO dates, newest last
+    recent_amounts = Column(String, default="")  # comma-separated, aligned with recent_dates
+    cadence = Column(String, nullable=True)  # weekly | biweekly | monthly | annual
+    interval_days = Column(Float, nullable=True)
+    next_date = Column(Date, nullable=True)
+    next_amount = Column(Float, nullable=True)
+
+
+class MaaserMonth(Base):
+    """One user's Maaser figures for one month, kept current by triggers on transactions.
+
+    `income` is non-transfer income plus transfers into the Maaser account (money
+    set aside at source), `paid` is Tzedakah given (category outflows plus
+    non-transfer outflows of the Maaser account) and `maaser_net` the net flow
+    on the Maaser account. The obligation is income x the user's current
+    maaser_pct and is worked out when read.
+    """
+    __tablename__ = 'maaser_months'
+    __table_args__ = (
+        Index('uq_maaser_months_user_month', 'user_id', 'month', unique=True),
+    )
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    month = Column(String(7), nullable=False)  # YYYY-MM
+    income = Column(Float, nullable=False, default=0.0)
+    paid = Column(Float, nullable=False, default=0.0)
+    maaser_net = Column(Float, nullable=False, default=0.0)
+
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Index
+from datetime import datetime
+from ..core.db import Base
+
+
+class Job(Base):
+    __tablename__ = 'jobs'
+    id = Column(String(32), primary_key=True)  # uuid4 hex, so ids can't be guessed across users
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    kind = Column(String, nullable=False)  # registered handler name, e.g. 'import_file'
+    status = Column(String, nullable=False, default='queued')  # queued, running, succeeded, failed, cancelled
+    params = Column(Text, default='{}')  # JSON
+    progress = Column(Float, nullable=True)  # 0..1 when the handler knows its size
+    progress_detail = Column(Text, nullable=True)  # JSON counters reported by the handler
+    result = Column(Text, nullable=True)  # JSON
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('ix_jobs_user_created', 'user_id', 'created_at'),
+        Index('ix_jobs_status', 'status'),
+    )
@@ -24,6 +24,12 @@ class User(Base):
     lon = Column(Float, default=35.235)
     # Maaser percentage (0.10 = 10%) user configurable
     maaser_pct = Column(Float, default=0.10)
+    # Default categories are created once (at registration or on first listing)
+    categories_seeded = Column(Boolean, default=False)
+    # Highest transaction id already fed to recurring-series detection
+    recurring_scanned_id = Column(Integer, default=0)
+    # Bumped by triggers on every transaction write (see core/data_version.py)
+    data_version = Column(Integer, default=0)
 
     accounts = relationship("Account", back_populates="owner", cascade="all, delete-orphan")
     categories = relationship("Category", back_populates="owner", cascade="all, delete-orphan")
@@ -77,11 +77,50 @@ class TransactionCreate(TransactionBase):
 
 class TransactionOut(TransactionBase):
     id: int
+    cleared: bool = False
+
+    @field_validator('cleared', mode='before')
+    def _null_is_uncleared(cls, v):
+        return bool(v)
 
     class Config:
         from_attributes = True
 
 
+class LedgerEntryOut(TransactionOut):
+    balance: float  # account balance after this row, in (date, id) order
+
+
+class AccountLedgerOut(BaseModel):
+    account_id: int
+    items: List[LedgerEntryOut]
+    next_cursor: Optional[str] = None
+    balance: float
+    cleared_balance: float
+
+
+class ReconcileIn(BaseModel):
+    end: date
+    start: Optional[date] = None
+    cleared: bool = True
+    statement_balance: Optional[float] = None
+
+
+class RecurringSeriesOut(BaseModel):
+    id: Optional[int] = None  # null until a scan stores a newly seen series
+    account_id: int
+    category_id: Optional[int] = None
+    note: str = ""
+    cadence: str
+    interval_days: Optional[float] = None
+    occurrences: int
+    first_date: date
+    last_date: date
+    next_date: date
+    next_amount: float
+    active: bool
+
+
 class InvestmentCreate(BaseModel):
     symbol: str
     name: Optional[str] = None
@@ -152,10 +191,29 @@ class GoalBase(BaseModel):
     due_date: str = ""
 
 class GoalCreate(GoalBase):
-    pass
+    start_date: Optional[date] = None
+    account_ids: List[int] = []
+    category_ids: List[int] = []
+
+class GoalUpdate(BaseModel):
+    name: Optional[str] = None
+    type: Optional[str] = None
+    target_amount: Optional[float] = None
+    current_amount: Optional[float] = None
+    due_date: Optional[str] = None
+    start_date: Optional[date] = None
+    account_ids: Optional[List[int]] = None  # replaces the links when given
+    category_ids: Optional[List[int]] = None
 
 class GoalOut(GoalBase):
     id: int
+    start_date: Optional[date] = None
+    account_ids: List[int] = []
+    category_ids: List[int] = []
+    auto: bool = False  # current_amount computed from the links
+    monthly_rate: Optional[float] = None  # average over the last complete months
+    projected_date: Optional[date] = None
+    on_track: Optional[bool] = None
 
     class Config:
         from_attributes = True
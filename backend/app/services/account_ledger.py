@@ -0,0 +1,118 @@
+"""One account's transactions with a running balance, for reconciliation.
+
+Pages are keyset-paginated on (date, id): the cursor is the last row's key,
+so a page costs the same however deep into the history it is. The running
+balance comes from `SUM(amount) OVER (ORDER BY date, id)` over the page's
+rows, offset by the sum of everything older, which one aggregate over the
+(account_id, date, id) index provides together with the account total and
+the cleared balance. Two statements per page.
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, or_, update
+from sqlalchemy.orm import Session
+
+from ..models.finance import Transaction
+
+MAX_PAGE = 500
+
+Key = Tuple[date, int]
+
+
+def encode_cursor(key: Key) -> str:
+    return f"{key[0].isoformat()}:{key[1]}"
+
+
+def decode_cursor(cursor: str) -> Key:
+    """'YYYY-MM-DD:id' -> (date, id); raises ValueError."""
+    day, _sep, tx_id = cursor.partition(":")
+    return date.fromisoformat(day), int(tx_id)
+
+
+def _before(key: Key):
+    return or_(Transaction.date < key[0], and_(Transaction.date == key[0], Transaction.id < key[1]))
+
+
+def _after(key: Key):
+    return or_(Transaction.date > key[0], and_(Transaction.date == key[0], Transaction.id > key[1]))
+
+
+def account_ledger(db: Session, account_id: int, limit: int = 100, cursor: Optional[str] = None,
+                   newest_first: bool = True) -> Dict[str, Any]:
+    """A page of the account's transactions with `balance` after each row.
+
+    `newest_first` pages backwards from the latest transaction (the default
+    register view); otherwise pages run forwards from the oldest.
+    """
+    limit = max(1, min(limit, MAX_PAGE))
+    key = decode_cursor(cursor) if cursor else None
+    order = (Transaction.date.desc(), Transaction.id.desc()) if newest_first else (Transaction.date, Transaction.id)
+    q = db.query(Transaction.id).filter(Transaction.account_id == account_id)
+    if key is not None:
+        q = q.filter(_before(key) if newest_first else _after(key))
+    page_ids = q.order_by(*order).limit(limit + 1).subquery()
+    running = func.sum(Transaction.amount).over(order_by=(Transaction.date, Transaction.id))
+    rows = (
+        db.query(Transaction, running)
+        .join(page_ids, page_ids.c.id == Transaction.id)
+        .order_by(*order)
+        .all()
+    )
+    has_more = len(rows) > limit
+    oldest = None if not rows else (rows[-1][0] if newest_first else rows[0][0])
+    rows = rows[:limit]
+
+    opening_expr = case((_before((oldest.date, oldest.id)), Transaction.amount), else_=0.0) if oldest else 0.0
+    opening, total, cleared = (
+        db.query(
+            func.sum(opening_expr),
+            func.sum(Transaction.amount),
+            func.sum(case((Transaction.cleared == True, Transaction.amount), else_=0.0)),  # noqa: E712
+        )
+        .filter(Transaction.account_id == account_id)
+        .one()
+    )
+    opening = float(opening or 0.0)
+    items: List[Dict[str, Any]] = []
+    for tx, partial in rows:
+        items.append({
+            "id": tx.id,
+            "account_id": tx.account_id,
+            "category_id": tx.category_id,
+            "date": tx.date,
+            "amount": tx.amount,
+            "note": tx.note,
+            "is_transfer": bool(tx.is_transfer),
+            "counterparty_account_id": tx.counterparty_account_id,
+            "cleared": bool(tx.cleared),
+            "balance": round(opening + float(partial), 2),
+        })
+    last = rows[-1][0] if rows else None
+    return {
+        "account_id": account_id,
+        "items": items,
+        "next_cursor": encode_cursor((last.date, last.id)) if has_more else None,
+        "balance": round(float(total or 0.0), 2),
+        "cleared_balance": round(float(cleared or 0.0), 2),
+    }
+
+
+def mark_cleared(db: Session, account_id: int, end: date, start: Optional[date] = None, cleared: bool = True) -> int:
+    """Set `cleared` on the account's rows dated [start, end] in one UPDATE; returns the rows changed."""
+    conditions = [Transaction.account_id == account_id, Transaction.date <= end,
+                  func.coalesce(Transaction.cleared, False) != cleared]
+    if start is not None:
+        conditions.append(Transaction.date >= start)
+    return db.execute(
+        update(Transaction).where(*conditions).values(cleared=cleared).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def cleared_balance(db: Session, account_id: int) -> float:
+    total = (
+        db.query(func.sum(Transaction.amount))
+        .filter(Transaction.account_id == account_id, Transaction.cleared == True)  # noqa: E712
+        .scalar()
+    )
+    return round(float(total or 0.0), 2)
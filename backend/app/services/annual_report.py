@@ -0,0 +1,240 @@
+"""Year-end report bundle built from a single pass over the year's transactions.
+
+`annual_zip` yields the bytes of a zip archive as it is written: one CSV per
+month, Maaser / Tzedakah figures, realised investment activity and a summary
+(JSON, plus a PDF when reportlab is installed). Transactions are streamed in
+date order with `yield_per`; each month's CSV is closed as soon as the next
+month starts, and the totals for the summary are accumulated on the way.
+The Maaser figures come from `services.maaser.maaser_ledger`, so the bundle
+and `/api/reports/maaser` agree.
+"""
+import csv
+import io
+import json
+import zipfile
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.finance import Account, Category, CategoryType, Investment, InvestmentTransaction, Transaction
+from ..utils.stream import ByteSink
+from .maaser import maaser_ledger
+
+ROW_BATCH = 1000
+MONTH_HEADER = ["date", "amount", "category", "note", "account", "transfer"]
+
+
+def _month_totals() -> Dict[str, float]:
+    return {"income": 0.0, "expenses": 0.0, "count": 0}
+
+
+def realized_investments(db: Session, user_id: int, year: int) -> List[Dict[str, Any]]:
+    """Buys and sells dated in `year`, with average-cost basis and realised gain on sells.
+
+    Earlier years' trades are replayed (one query) so the basis is right
+    for positions opened before the year.
+    """
+    rows = (
+        db.query(InvestmentTransaction, Investment.symbol)
+        .join(Investment, InvestmentTransaction.investment_id == Investment.id)
+        .filter(InvestmentTransaction.user_id == user_id, InvestmentTransaction.date <= date(year, 12, 31))
+        .order_by(InvestmentTransaction.date, InvestmentTransaction.id)
+        .all()
+    )
+    qty: Dict[int, float] = defaultdict(float)
+    cost: Dict[int, float] = defaultdict(float)
+    out: List[Dict[str, Any]] = []
+    for it, symbol in rows:
+        basis = None
+        gain = None
+        if it.type == "buy":
+            qty[it.investment_id] += it.quantity
+            cost[it.investment_id] += it.total_cost
+        elif it.type == "sell":
+            held = qty[it.investment_id]
+            avg = cost[it.investment_id] / held if held > 0 else 0.0
+            basis = round(avg * it.quantity, 2)
+            gain = round(it.total_cost - basis, 2)
+            qty[it.investment_id] = held - it.quantity
+            cost[it.investment_id] -= basis
+        if it.date.year == year:
+            out.append({
+                "date": it.date.isoformat(), "symbol": symbol, "type": it.type, "quantity": it.quantity,
+                "unit_price": it.unit_price, "total": it.total_cost, "cost_basis": basis, "realized_gain": gain,
+            })
+    return out
+
+
+def _csv_bytes(header: List[str], rows: List[List[Any]]) -> bytes:
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    w.writerow(header)
+    w.writerows(rows)
+    return buf.getvalue().encode("utf-8")
+
+
+def annual_zip(db: Session, user_id: int, year: int, maaser_pct: Optional[float] = None) -> Iterator[bytes]:
+    """Yield the year-end zip archive piece by piece (see module docstring)."""
+    pipe = ByteSink()
+    zf = zipfile.ZipFile(pipe, "w", compression=zipfile.ZIP_DEFLATED)
+    months = {m: _month_totals() for m in range(1, 13)}
+    categories: Dict[str, Dict[str, Any]] = {}
+    written = set()
+
+    def open_month(m: int):
+        written.add(m)
+        raw = zf.open(f"transactions/{year:04d}-{m:02d}.csv", "w")
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        writer = csv.writer(text, lineterminator="\n")
+        writer.writerow(MONTH_HEADER)
+        return text, writer
+
+    rows = (
+        db.query(Transaction.date, Transaction.amount, Transaction.note, Transaction.is_transfer,
+                 Category.name, Category.type, Account.name)
+        .join(Account, Transaction.account_id == Account.id)
+        .outerjoin(Category, Transaction.category_id == Category.id)
+        .filter(Transaction.user_id == user_id, Transaction.date >= date(year, 1, 1), Transaction.date <= date(year, 12, 31))
+        .order_by(Transaction.date, Transaction.id)
+        .yield_per(ROW_BATCH)
+    )
+    current = 0
+    text = writer = None
+    pending = 0
+    for tx_date, amount, note, is_transfer, cat_name, cat_type, account in rows:
+        if tx_date.month != current:
+            if text is not None:
+                text.close()
+                yield pipe.drain()
+            current = tx_date.month
+            text, writer = open_month(current)
+        writer.writerow([tx_date.isoformat(), amount, cat_name or "", note or "", account, "yes" if is_transfer else ""])
+        mt = months[current]
+        mt["count"] += 1
+        if not is_transfer:
+            if cat_type == CategoryType.INCOME or (cat_type is None and amount > 0):
+                mt["income"] += amount
+            else:
+                mt["expenses"] -= amount
+            key = cat_name or ("Uncategorised income" if amount > 0 else "Uncategorised spending")
+            c = categories.setdefault(key, {"category": key, "count": 0, "total": 0.0})
+            c["count"] += 1
+            c["total"] += amount
+        pending += 1
+        if pending >= ROW_BATCH:
+            pending = 0
+            text.flush()
+            yield pipe.drain()
+    if text is not None:
+        text.close()
+    for m in range(1, 13):
+        if m not in written:
+            t, _w = open_month(m)
+            t.close()
+    yield pipe.drain()
+
+    # Maaser / Tzedakah
+    ledger = maaser_ledger(db, user_id, maaser_pct, f"{year:04d}-01", f"{year:04d}-12")
+    totals = ledger["totals"]
+    maaser = {
+        "maaser_pct": ledger["maaser_pct"],
+        "gross_income": totals["income"],
+        "maaser_account": round(sum(r["maaser_account"] for r in ledger["months"]), 2),
+        "tzedakah_given": totals["paid"],
+        "obligation": totals["obligation"],
+        "outstanding": round(totals["obligation"] - totals["paid"], 2),
+        "closing_balance": ledger["closing_balance"],
+    }
+    zf.writestr("maaser_tzedakah.csv", _csv_bytes(
+        ["month", "gross_income", "maaser_account", "tzedakah_given", "obligation", "balance"],
+        [[r["month"], r["income"], r["maaser_account"], r["paid"], r["obligation"], r["balance"]]
+         for r in ledger["months"]]))
+
+    # Investments
+    trades = realized_investments(db, user_id, year)
+    zf.writestr("investments/realized.csv", _csv_bytes(
+        ["date", "symbol", "type", "quantity", "unit_price", "total", "cost_basis", "realized_gain"],
+        [[t[k] if t[k] is not None else "" for k in ("date", "symbol", "type", "quantity", "unit_price", "total", "cost_basis", "realized_gain")]
+         for t in trades]))
+    yield pipe.drain()
+
+    summary = {
+        "year": year,
+        "income": round(sum(mt["income"] for mt in months.values()), 2),
+        "expenses": round(sum(mt["expenses"] for mt in months.values()), 2),
+        "transactions": sum(mt["count"] for mt in months.values()),
+        "months": [
+            {"month": f"{year:04d}-{m:02d}", "income": round(mt["income"], 2), "expenses": round(mt["expenses"], 2),
+             "net": round(mt["income"] - mt["expenses"], 2), "count": mt["count"]}
+            for m, mt in months.items()
+        ],
+        "categories": sorted(({**c, "total": round(c["total"], 2)} for c in categories.values()), key=lambda c: -abs(c["total"])),
+        "maaser": maaser,
+        "investments": {
+            "buys": round(sum(t["total"] for t in trades if t["type"] == "buy"), 2),
+            "sells": round(sum(t["total"] for t in trades if t["type"] == "sell"), 2),
+            "realized_gain": round(sum(t["realized_gain"] or 0.0 for t in trades), 2),
+        },
+    }
+    summary["net"] = round(summary["income"] - summary["expenses"], 2)
+    zf.writestr("summary.json", json.dumps(summary, indent=2))
+    pdf = summary_pdf(summary)
+    if pdf is not None:
+        zf.writestr("summary.pdf", pdf)
+    zf.close()
+    yield pipe.drain()
+
+
+def summary_pdf(summary: Dict[str, Any]) -> Optional[bytes]:
+    """One- or two-page PDF of the annual summary; None when reportlab is not installed."""
+    try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        return None
+    buf = io.BytesIO()
+    width, height = letter
+    margin = 54
+    c = canvas.Canvas(buf, pagesize=letter, pageCompression=1)
+    c.setTitle(f"Annual Report {summary['year']}")
+    y = height - margin
+
+    def line(text: str, font: str = "Helvetica", size: float = 10, right: Optional[str] = None, step: float = 14) -> None:
+        nonlocal y
+        if y < margin:
+            c.showPage()
+            y = height - margin
+        c.setFont(font, size)
+        c.drawString(margin, y, text)
+        if right is not None:
+            c.drawRightString(width - margin, y, right)
+        y -= step
+
+    line(f"Annual Report {summary['year']}", "Helvetica-Bold", 18, step=28)
+    line(f"Income {summary['income']:,.2f}   Expenses {summary['expenses']:,.2f}   Net {summary['net']:,.2f}",
+         "Helvetica", 11, step=22)
+    line("Month", "Helvetica-Bold", right="Income / Expenses / Net / Count")
+    for m in summary["months"]:
+        line(m["month"], right=f"{m['income']:,.2f} / {m['expenses']:,.2f} / {m['net']:,.2f} / {m['count']}")
+    y -= 10
+    mz = summary["maaser"]
+    line("Maaser / Tzedakah", "Helvetica-Bold", 12, step=18)
+    for label, key in (("Gross income", "gross_income"), ("Maaser account", "maaser_account"), ("Given", "tzedakah_given"),
+                       (f"Obligation ({mz['maaser_pct'] * 100:.0f}%)", "obligation"), ("Outstanding", "outstanding"),
+                       ("Balance carried forward", "closing_balance")):
+        line(label, right=f"{mz[key]:,.2f}")
+    y -= 10
+    inv = summary["investments"]
+    line("Investments", "Helvetica-Bold", 12, step=18)
+    line("Bought", right=f"{inv['buys']:,.2f}")
+    line("Sold", right=f"{inv['sells']:,.2f}")
+    line("Realised gain", right=f"{inv['realized_gain']:,.2f}")
+    y -= 10
+    line("Top categories", "Helvetica-Bold", 12, step=18)
+    for cat in summary["categories"][:15]:
+        line(str(cat["category"])[:60], right=f"{cat['total']:,.2f} ({cat['count']})")
+    c.showPage()
+    c.save()
+    return buf.getvalue()
@@ -1,5 +1,6 @@
+from typing import List
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from sqlalchemy import text
 from ..core.db import SessionLocal
 from ..models.user import User
 from ..models.finance import Category, CategoryType
@@ -15,117 +16,54 @@ def ensure_bootstrap():
         db.close()
 
 
+DEFAULT_CATEGORIES = [
+    ("Income", CategoryType.INCOME, True, "coin"),
+    ("Tzedakah", CategoryType.EXPENSE, True, "charity"),
+    ("Transfer", CategoryType.EXPENSE, True, "transfer"),
+    ("Food", CategoryType.EXPENSE, False, "utensils"),
+    ("Housing", CategoryType.EXPENSE, False, "home"),
+    ("Transport", CategoryType.EXPENSE, False, "car"),
+]
+
+SEED_CHUNK = 500  # keeps IN (...) lists under SQLite's bound-parameter limit
+
+
+def seed_default_categories(db: Session, user_ids: List[int]) -> int:
+    """Create whichever default categories are missing for `user_ids` and mark them seeded.
+
+    Costs three statements per chunk of users regardless of how many users are
+    in it, so bulk user creation can seed everyone at once. Does not commit.
+    Returns the number of categories created.
+    """
+    names = [name for name, *_ in DEFAULT_CATEGORIES]
+    created = 0
+    for i in range(0, len(user_ids), SEED_CHUNK):
+        chunk = user_ids[i:i + SEED_CHUNK]
+        existing = set(
+            db.query(Category.user_id, Category.name)
+            .filter(Category.user_id.in_(chunk), Category.name.in_(names))
+            .all()
+        )
+        rows = [
+            {"user_id": uid, "name": name, "type": typ, "is_builtin": builtin, "icon": icon}
+            for uid in chunk
+            for name, typ, builtin, icon in DEFAULT_CATEGORIES
+            if (uid, name) not in existing
+        ]
+        if rows:
+            db.execute(insert(Category), rows)
+            created += len(rows)
+        db.query(User).filter(User.id.in_(chunk)).update({User.categories_seeded: True}, synchronize_session=False)
+    return created
+
+
 def ensure_default_categories(db: Session, user_id: int):
-    existing = {c.name for c in db.query(Category).filter(Category.user_id == user_id).all()}
-    defaults = [
-        ("Income", CategoryType.INCOME, True, "coin"),
-        ("Tzedakah", CategoryType.EXPENSE, True, "charity"),
-        ("Transfer", CategoryType.EXPENSE, True, "transfer"),
-        ("Food", CategoryType.EXPENSE, False, "utensils"),
-        ("Housing", CategoryType.EXPENSE, False, "home"),
-        ("Transport", CategoryType.EXPENSE, False, "car"),
-    ]
-    created = []
-    for name, typ, builtin, icon in defaults:
-        if name not in existing:
-            c = Category(user_id=user_id, name=name, type=typ, is_builtin=builtin, icon=icon)
-            db.add(c)
-            created.append(c)
-    if created:
-        db.commit()
+    seed_default_categories(db, [user_id])
+    db.commit()
 
 
 def migrate_sqlite(engine):
-    # Add new user columns if they don't exist (SQLite only)
-    cols = [
-        ("dob", "TEXT"),
-        ("phone", "TEXT"),
-        ("base_currency", "TEXT"),
-        ("address_line1", "TEXT"),
-        ("address_line2", "TEXT"),
-        ("city", "TEXT"),
-        ("state", "TEXT"),
-        ("postal_code", "TEXT"),
-        ("country", "TEXT"),
-        ("maaser_pct", "REAL"),
-        ("username", "TEXT"),
-    ]
-    with engine.connect() as conn:
-        for name, typ in cols:
-            try:
-                conn.execute(text(f"ALTER TABLE users ADD COLUMN {name} {typ}"))
-            except Exception:
-                # Column likely already exists
-                pass
-        # Add transaction columns introduced later
-        try:
-            conn.execute(text("ALTER TABLE transactions ADD COLUMN is_transfer BOOLEAN DEFAULT 0"))
-        except Exception:
-            pass
-        try:
-            conn.execute(text("ALTER TABLE transactions ADD COLUMN counterparty_account_id INTEGER NULL"))
-        except Exception:
-            pass
-        # Add username column and unique index
-        try:
-            conn.execute(text("ALTER TABLE users ADD COLUMN username TEXT"))
-        except Exception:
-            pass
-        try:
-            conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users(username)"))
-        except Exception:
-            pass
-        # Ensure user_twofa table has recovery_codes column
-        try:
-            conn.execute(text("ALTER TABLE user_twofa ADD COLUMN recovery_codes TEXT"))
-        except Exception:
-            # Column or table may already include it
-            pass
-        # Create investments tables if they don't exist
-        try:
-            conn.execute(text('''
-                CREATE TABLE IF NOT EXISTS investments (
-                    id INTEGER PRIMARY KEY,
-                    user_id INTEGER NOT NULL,
-                    symbol TEXT NOT NULL,
-                    name TEXT
-                )
-            '''))
-        except Exception:
-            pass
-        try:
-            conn.execute(text('''
-                CREATE TABLE IF NOT EXISTS investment_transactions (
-                    id INTEGER PRIMARY KEY,
-                    user_id INTEGER NOT NULL,
-                    investment_id INTEGER NOT NULL,
-                    account_id INTEGER NOT NULL,
-                    date TEXT NOT NULL,
-                    type TEXT NOT NULL,
-                    quantity REAL NOT NULL,
-                    unit_price REAL NOT NULL,
-                    total_cost REAL NOT NULL
-                )
-            '''))
-        except Exception:
-            pass
-        # Add flex budget columns if missing
-        for col, typ in (
-            ("item_type", "TEXT"),
-            ("tolerance_pct", "REAL"),
-            ("window_months", "INTEGER"),
-        ):
-            try:
-                conn.execute(text(f"ALTER TABLE budget_items ADD COLUMN {col} {typ}"))
-            except Exception:
-                pass
-        # Add debt-related account columns
-        for col, typ in (
-            ("apr_annual", "REAL"),
-            ("min_payment", "REAL"),
-            ("due_day", "INTEGER"),
-        ):
-            try:
-                conn.execute(text(f"ALTER TABLE accounts ADD COLUMN {col} {typ}"))
-            except Exception:
-                pass
+    """Bring the schema up to date. Kept for scripts and tests; the versioned
+    migrations in app/migrations replaced the old ALTER-and-ignore sequence."""
+    from ..core.migrations import run_migrations
+    run_migrations(engine)
@@ -0,0 +1,129 @@
+"""Budget vs. actual across a range of months.
+
+Two statements regardless of how many months are requested: the budget lines
+in range (with their categories), and actual amounts grouped by category and
+month, reaching back far enough to cover the longest flex window.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.finance import Budget, BudgetItem, Category, CategoryType, Transaction
+from ..utils.sql import month_key
+
+MAX_MONTHS = 120
+
+
+def month_index(ym: str) -> int:
+    y, m = map(int, ym.split("-"))
+    return y * 12 + (m - 1)
+
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def flex_status(current: float, avg: float, tolerance_pct: float) -> str:
+    """Same thresholds as the monthly summary: over avg*(1+tol) is exceeded, over half that margin is approaching."""
+    if avg <= 0:
+        return "ok"
+    if current > avg * (1.0 + tolerance_pct):
+        return "exceeded"
+    if current > avg * (1.0 + tolerance_pct * 0.5):
+        return "approaching"
+    return "ok"
+
+
+def budget_variance(db: Session, user_id: int, start_month: str, end_month: str) -> Dict[str, Any]:
+    """Per-category limits, actuals, variance (limit - actual), cumulative overspend and flex status.
+
+    Actuals are spending for expense categories (outflows are stored negative)
+    and receipts for income categories. Transfers are excluded.
+    """
+    first, last = month_index(start_month), month_index(end_month)
+    lines = (
+        db.query(Budget.month, BudgetItem, Category.name, Category.type)
+        .join(BudgetItem, BudgetItem.budget_id == Budget.id)
+        .join(Category, BudgetItem.category_id == Category.id)
+        .filter(Budget.user_id == user_id, Budget.month >= start_month, Budget.month <= end_month)
+        .order_by(Category.name, Budget.month)
+        .all()
+    )
+    longest_window = max((int(bi.window_months or 3) for _m, bi, _n, _t in lines if bi.item_type == "flex"), default=0)
+    history_start = first - longest_window
+    span_start = date(history_start // 12, history_start % 12 + 1, 1)
+    span_end = date((last + 1) // 12, (last + 1) % 12 + 1, 1)
+
+    actual: Dict[Tuple[int, int], float] = {}
+    category_ids = {bi.category_id for _m, bi, _n, _t in lines}
+    if category_ids:
+        ym = month_key(db, Transaction.date)
+        rows = (
+            db.query(Transaction.category_id, ym, func.sum(Transaction.amount))
+            .filter(
+                Transaction.user_id == user_id,
+                Transaction.is_transfer == False,
+                Transaction.category_id.in_(category_ids),
+                Transaction.date >= span_start,
+                Transaction.date < span_end,
+            )
+            .group_by(Transaction.category_id, ym)
+            .all()
+        )
+        actual = {(cid, month_index(m)): float(total or 0.0) for cid, m, total in rows}
+
+    by_category: Dict[int, Dict[str, Any]] = {}
+    months_by_category: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for month, bi, name, ctype in lines:
+        sign = 1.0 if ctype == CategoryType.INCOME else -1.0
+        idx = month_index(month)
+        spent = sign * actual.get((bi.category_id, idx), 0.0)
+        limit = float(bi.limit)
+        cat = by_category.setdefault(bi.category_id, {
+            "category_id": bi.category_id,
+            "category": name,
+            "type": ctype.value,
+            "budgeted": 0.0,
+            "actual": 0.0,
+            "variance": 0.0,
+            "overspend": 0.0,
+            "flex_status": None,
+        })
+        cat["budgeted"] += limit
+        cat["actual"] += spent
+        cat["overspend"] += max(0.0, spent - limit)
+        entry = {
+            "month": month,
+            "limit": limit,
+            "actual": spent,
+            "variance": limit - spent,
+            "cumulative_overspend": cat["overspend"],
+            "item_type": bi.item_type or "fixed",
+        }
+        if bi.item_type == "flex":
+            w = int(bi.window_months or 3)
+            tol = float(bi.tolerance_pct if bi.tolerance_pct is not None else 0.15)
+            avg = sum(sign * actual.get((bi.category_id, i), 0.0) for i in range(idx - w, idx)) / w
+            entry.update(avg=avg, tolerance_pct=tol, window_months=w, flex_status=flex_status(spent, avg, tol))
+            cat["flex_status"] = entry["flex_status"]
+        months_by_category[bi.category_id].append(entry)
+
+    categories = []
+    for cid, cat in by_category.items():
+        cat["variance"] = cat["budgeted"] - cat["actual"]
+        cat["months"] = months_by_category[cid]
+        categories.append(cat)
+
+    return {
+        "from": start_month,
+        "to": end_month,
+        "months": [month_label(i) for i in range(first, last + 1)],
+        "categories": categories,
+        "totals": {
+            key: sum(c[key] for c in categories)
+            for key in ("budgeted", "actual", "variance", "overspend")
+        },
+    }
@@ -1,5 +1,7 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from ..core.config import settings
 from sqlalchemy.orm import Session
 from ..core.db import get_db
 from ..utils.security import decode_token
@@ -22,3 +24,14 @@ async def enforce_shabbat_readonly(user: User = Depends(get_current_user)):
     if user.shabbat_mode and is_shabbat_now(user):
         raise HTTPException(status_code=403, detail="Shabbat mode: write actions disabled")
     return True
+
+async def require_admin(request: Request):
+    if not settings.ADMIN_TOKEN:
+        if settings.ENV.lower() == "prod":
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin API disabled")
+        return True
+    auth = request.headers.get("Authorization", "")
+    token = auth.split(" ", 1)[1] if auth.startswith("Bearer ") else ""
+    if not hmac.compare_digest(token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+    return True
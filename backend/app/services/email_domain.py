@@ -0,0 +1,99 @@
+import asyncio
+from typing import Dict, Optional
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+
+from ..core.config import settings
+from ..utils.cache import TTLCache
+from ..utils.net import parse_nameservers
+
+# domain -> bool; definitive answers only, transient failures are never cached
+_cache = TTLCache(maxsize=settings.EMAIL_DNS_CACHE_SIZE, ttl=settings.EMAIL_DNS_POSITIVE_TTL)
+_inflight: Dict[str, "asyncio.Task[Optional[bool]]"] = {}
+# Semaphores bind to the loop they are first used on, so keep one per loop
+_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+_resolver: Optional[dns.asyncresolver.Resolver] = None
+_resolver_key: Optional[tuple] = None
+
+
+def _get_resolver() -> dns.asyncresolver.Resolver:
+    global _resolver, _resolver_key
+    key = (settings.EMAIL_DNS_NAMESERVERS, settings.EMAIL_DNS_TIMEOUT)
+    if _resolver is None or _resolver_key != key:
+        servers, port = parse_nameservers(settings.EMAIL_DNS_NAMESERVERS)
+        if servers:
+            res = dns.asyncresolver.Resolver(configure=False)
+            res.nameservers = servers
+            if port is not None:
+                res.port = port
+        else:
+            res = dns.asyncresolver.Resolver()
+        res.lifetime = settings.EMAIL_DNS_TIMEOUT
+        _resolver = res
+        _resolver_key = key
+    return _resolver
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _semaphores.get(loop)
+    if sem is None:
+        for old in [l for l in _semaphores if l.is_closed()]:
+            del _semaphores[old]
+        sem = _semaphores[loop] = asyncio.Semaphore(max(1, settings.EMAIL_DNS_MAX_CONCURRENCY))
+    return sem
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+async def _has_records(domain: str, rdtype: str) -> bool:
+    try:
+        answers = await _get_resolver().resolve(domain, rdtype)
+    except dns.resolver.NoAnswer:
+        return False
+    return len(answers) > 0
+
+
+async def _lookup(domain: str) -> Optional[bool]:
+    """MX first, then A/AAAA fallback. Returns None when the answer is inconclusive."""
+    async with _get_semaphore():
+        try:
+            for rdtype in ('MX', 'A', 'AAAA'):
+                if await _has_records(domain, rdtype):
+                    ok = True
+                    break
+            else:
+                ok = False
+        except (dns.exception.Timeout, dns.resolver.NoNameservers):
+            return None
+        except dns.exception.DNSException:
+            # NXDOMAIN, malformed names, ...
+            ok = False
+    _cache.set(domain, ok, ttl=settings.EMAIL_DNS_POSITIVE_TTL if ok else settings.EMAIL_DNS_NEGATIVE_TTL)
+    return ok
+
+
+async def domain_accepts_mail(domain: str) -> bool:
+    """Whether `domain` has MX (or A/AAAA) records.
+
+    Cached per domain with separate positive/negative TTLs, concurrent checks for
+    the same domain share one lookup, and total in-flight lookups are capped.
+    Inconclusive lookups (timeouts, unreachable nameservers) count as failures
+    but are not cached.
+    """
+    domain = domain.lower().strip().rstrip('.')
+    if not domain:
+        return False
+    cached = _cache.get(domain)
+    if cached is not None:
+        return cached
+    task = _inflight.get(domain)
+    if task is None:
+        task = asyncio.ensure_future(_lookup(domain))
+        _inflight[domain] = task
+        task.add_done_callback(lambda _t: _inflight.pop(domain, None))
+    return bool(await asyncio.shield(task))
@@ -1,14 +1,22 @@
 from io import BytesIO
-from base64 import b64encode
 from datetime import date
+from typing import BinaryIO, Dict, Iterator, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from ..models.finance import Transaction, Category, CategoryType
+from sqlalchemy import case, func
+from ..models.finance import Account, Transaction, Category, CategoryType
 
+ROW_BATCH = 1000  # transactions fetched per round trip while drawing the table
+TOP_CATEGORIES = 10  # bars in the category chart
 
-def export_month_csv(db: Session, user_id: int, year: int, month: int):
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
     start = date(year, month, 1)
     end = date(year + (1 if month == 12 else 0), 1 if month == 12 else month + 1, 1)
+    return start, end
+
+
+def export_month_csv(db: Session, user_id: int, year: int, month: int):
+    start, end = month_bounds(year, month)
     rows = (
         db.query(Transaction)
         .filter(Transaction.user_id == user_id, Transaction.date >= start, Transaction.date < end)
@@ -23,37 +31,236 @@ def export_month_csv(db: Session, user_id: int, year: int, month: int):
     return content, filename
 
 
-def export_month_pdf(db: Session, user_id: int, year: int, month: int):
-    try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.pdfgen import canvas
-    except Exception:
-        # If reportlab is not installed, return placeholder
-        content = b64encode(b"Install reportlab to generate PDFs").decode()
-        return content, f"report_{year:04d}_{month:02d}.pdf"
+def category_breakdown(db: Session, user_id: int, start: date, end: date) -> List[Dict[str, object]]:
+    """Per-category totals for [start, end), transfers excluded, largest first.
 
-    start = date(year, month, 1)
-    end = date(year + (1 if month == 12 else 0), 1 if month == 12 else month + 1, 1)
-    income = 0.0
-    expenses = 0.0
+    Uncategorised money is split into "Uncategorised income" (positive) and
+    "Uncategorised spending" (negative) so each row has one direction.
+    """
+    positive = case((Transaction.amount > 0, 1), else_=0)
     rows = (
-        db.query(Transaction)
-        .filter(Transaction.user_id == user_id, Transaction.date >= start, Transaction.date < end)
+        db.query(Category.name, Category.type, positive, func.count(Transaction.id), func.sum(Transaction.amount))
+        .select_from(Transaction)
+        .outerjoin(Category, Transaction.category_id == Category.id)
+        .filter(Transaction.user_id == user_id, Transaction.is_transfer == False,
+                Transaction.date >= start, Transaction.date < end)
+        .group_by(Category.name, Category.type, positive)
         .all()
     )
-    for r in rows:
-        if r.category and r.category.type == CategoryType.INCOME:
-            income += r.amount
+    out: Dict[Tuple[str, str], Dict[str, object]] = {}
+    for name, ctype, is_positive, count, total in rows:
+        if ctype is None:
+            name, kind = ("Uncategorised income", "income") if is_positive else ("Uncategorised spending", "expense")
         else:
-            expenses += r.amount
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=letter)
-    c.drawString(72, 720, f"Monthly Report {year}-{month:02d}")
-    c.drawString(72, 700, f"Income: {income:.2f}")
-    c.drawString(72, 680, f"Expenses: {expenses:.2f}")
-    c.drawString(72, 660, f"Savings: {income - expenses:.2f}")
-    c.showPage()
+            kind = "income" if ctype == CategoryType.INCOME else "expense"
+        item = out.setdefault((name, kind), {"category": name, "type": kind, "count": 0, "total": 0.0})
+        item["count"] += count
+        item["total"] += float(total or 0.0)
+    return sorted(out.values(), key=lambda r: -abs(r["total"]))
+
+
+def daily_totals(db: Session, user_id: int, start: date, end: date) -> Dict[date, Tuple[float, float]]:
+    """date -> (money in, money out) for [start, end), transfers excluded; money out is positive."""
+    rows = (
+        db.query(
+            Transaction.date,
+            func.sum(case((Transaction.amount > 0, Transaction.amount), else_=0.0)),
+            func.sum(case((Transaction.amount < 0, -Transaction.amount), else_=0.0)),
+        )
+        .filter(Transaction.user_id == user_id, Transaction.is_transfer == False,
+                Transaction.date >= start, Transaction.date < end)
+        .group_by(Transaction.date)
+        .all()
+    )
+    return {(d if isinstance(d, date) else date.fromisoformat(str(d))): (float(i or 0), float(o or 0)) for d, i, o in rows}
+
+
+def iter_transactions(db: Session, user_id: int, start: date, end: date) -> Iterator[tuple]:
+    """(date, account, category, note, amount, is_transfer) in date order, streamed ROW_BATCH at a time."""
+    return (
+        db.query(Transaction.date, Account.name, Category.name, Transaction.note, Transaction.amount, Transaction.is_transfer)
+        .join(Account, Transaction.account_id == Account.id)
+        .outerjoin(Category, Transaction.category_id == Category.id)
+        .filter(Transaction.user_id == user_id, Transaction.date >= start, Transaction.date < end)
+        .order_by(Transaction.date, Transaction.id)
+        .yield_per(ROW_BATCH)
+    )
+
+
+def render_month_pdf(db: Session, user_id: int, year: int, month: int, out: BinaryIO) -> str:
+    """Write a multi-page monthly report to `out` and return its filename.
+
+    Page one has the totals, a category breakdown table and two charts (top
+    spending categories, money in/out per day); the transaction table follows
+    and continues over as many pages as needed with its header repeated. The
+    totals come from two grouped queries, and the table rows are streamed, so
+    memory does not grow with the number of transactions. Raises RuntimeError
+    when reportlab is not installed.
+    """
+    try:
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        from reportlab.pdfgen import canvas
+        from reportlab.graphics import renderPDF
+        from reportlab.graphics.shapes import Drawing
+        from reportlab.graphics.charts.barcharts import HorizontalBarChart, VerticalBarChart
+    except ImportError:
+        raise RuntimeError("Install reportlab to generate PDFs") from None
+
+    start, end = month_bounds(year, month)
+    breakdown = category_breakdown(db, user_id, start, end)
+    daily = daily_totals(db, user_id, start, end)
+    income = sum(r["total"] for r in breakdown if r["type"] == "income")
+    expenses = -sum(r["total"] for r in breakdown if r["type"] == "expense")
+
+    width, height = letter
+    margin = 54
+    c = canvas.Canvas(out, pagesize=letter, pageCompression=1)
+    c.setTitle(f"Monthly Report {year}-{month:02d}")
+    page = [1]
+
+    def footer() -> None:
+        c.setFont("Helvetica", 8)
+        c.setFillColor(colors.grey)
+        c.drawRightString(width - margin, margin / 2, f"{year}-{month:02d} · page {page[0]}")
+        c.setFillColor(colors.black)
+
+    def new_page() -> None:
+        footer()
+        c.showPage()
+        page[0] += 1
+
+    def fit(text: str, font: str, size: float, max_width: float) -> str:
+        if stringWidth(text, font, size) <= max_width:
+            return text
+        while text and stringWidth(text + "…", font, size) > max_width:
+            text = text[:-1]
+        return text + "…"
+
+    # --- summary ---
+    y = height - margin
+    c.setFont("Helvetica-Bold", 18)
+    c.drawString(margin, y, f"Monthly Report {year}-{month:02d}")
+    y -= 30
+    c.setFont("Helvetica", 11)
+    for label, value in (("Income", income), ("Expenses", expenses), ("Net savings", income - expenses)):
+        c.drawString(margin, y, label)
+        c.drawRightString(margin + 220, y, f"{value:,.2f}")
+        y -= 16
+    y -= 10
+
+    # --- category breakdown table ---
+    cols = (margin, margin + 230, margin + 300, margin + 380)
+    c.setFont("Helvetica-Bold", 10)
+    for x, title in zip(cols, ("Category", "Type", "Count", "Total")):
+        c.drawString(x, y, title)
+    c.drawRightString(width - margin, y, "Share")
+    y -= 4
+    c.line(margin, y, width - margin, y)
+    y -= 12
+    c.setFont("Helvetica", 9)
+    for r in breakdown:
+        if y < margin + 20:
+            new_page()
+            y = height - margin
+            c.setFont("Helvetica", 9)
+        base = income if r["type"] == "income" else expenses
+        share = abs(r["total"]) / base * 100 if base else 0.0
+        c.drawString(cols[0], y, fit(str(r["category"]), "Helvetica", 9, 220))
+        c.drawString(cols[1], y, str(r["type"]))
+        c.drawString(cols[2], y, str(r["count"]))
+        c.drawString(cols[3], y, f"{r['total']:,.2f}")
+        c.drawRightString(width - margin, y, f"{share:.1f}%")
+        y -= 13
+
+    # --- charts ---
+    spend = [r for r in breakdown if r["type"] == "expense"][:TOP_CATEGORIES]
+    chart_h = 200
+    if spend or daily:
+        if y - chart_h < margin:
+            new_page()
+            y = height - margin
+        y -= chart_h
+    if spend:
+        d = Drawing(250, chart_h)
+        bc = HorizontalBarChart()
+        bc.x, bc.y, bc.width, bc.height = 90, 20, 150, chart_h - 40
+        bc.data = [[-r["total"] for r in reversed(spend)]]
+        bc.categoryAxis.categoryNames = [fit(str(r["category"]), "Helvetica", 7, 80) for r in reversed(spend)]
+        bc.categoryAxis.labels.fontSize = 7
+        bc.valueAxis.labels.fontSize = 7
+        bc.valueAxis.valueMin = 0
+        bc.bars[0].fillColor = colors.HexColor("#c0392b")
+        d.add(bc)
+        renderPDF.draw(d, c, margin, y)
+        c.setFont("Helvetica-Bold", 9)
+        c.drawString(margin, y + chart_h, "Top spending categories")
+    if daily:
+        days = (end - start).days
+        d = Drawing(250, chart_h)
+        vc = VerticalBarChart()
+        vc.x, vc.y, vc.width, vc.height = 30, 20, 210, chart_h - 40
+        vc.data = [
+            [daily.get(date(year, month, k + 1), (0.0, 0.0))[0] for k in range(days)],
+            [daily.get(date(year, month, k + 1), (0.0, 0.0))[1] for k in range(days)],
+        ]
+        vc.categoryAxis.categoryNames = [str(k + 1) if k % 5 == 0 else "" for k in range(days)]
+        vc.categoryAxis.labels.fontSize = 6
+        vc.valueAxis.labels.fontSize = 7
+        vc.valueAxis.valueMin = 0
+        vc.bars[0].fillColor = colors.HexColor("#27ae60")
+        vc.bars[1].fillColor = colors.HexColor("#c0392b")
+        vc.barSpacing = 0
+        d.add(vc)
+        renderPDF.draw(d, c, width / 2, y)
+        c.setFont("Helvetica-Bold", 9)
+        c.drawString(width / 2, y + chart_h, "Money in / out per day")
+
+    # --- transaction table, paginated ---
+    tcols = (margin, margin + 62, margin + 160, margin + 260)
+    note_width = width - margin - 70 - tcols[3]
+
+    def table_header() -> float:
+        top = height - margin
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(margin, top, "Transactions")
+        top -= 18
+        c.setFont("Helvetica-Bold", 9)
+        for x, title in zip(tcols, ("Date", "Account", "Category", "Note")):
+            c.drawString(x, top, title)
+        c.drawRightString(width - margin, top, "Amount")
+        top -= 4
+        c.line(margin, top, width - margin, top)
+        c.setFont("Helvetica", 8)
+        return top - 11
+
+    new_page()
+    y = table_header()
+    stripe = False
+    for tx_date, account, category, note, amount, is_transfer in iter_transactions(db, user_id, start, end):
+        if y < margin:
+            new_page()
+            y = table_header()
+            stripe = False
+        if stripe:
+            c.setFillColor(colors.HexColor("#f2f2f2"))
+            c.rect(margin - 2, y - 3, width - 2 * margin + 4, 11, stroke=0, fill=1)
+            c.setFillColor(colors.black)
+        stripe = not stripe
+        c.drawString(tcols[0], y, tx_date.isoformat())
+        c.drawString(tcols[1], y, fit(account or "", "Helvetica", 8, 94))
+        c.drawString(tcols[2], y, fit("Transfer" if is_transfer else (category or ""), "Helvetica", 8, 94))
+        c.drawString(tcols[3], y, fit(note or "", "Helvetica", 8, note_width))
+        c.drawRightString(width - margin, y, f"{amount:,.2f}")
+        y -= 11
+    footer()
     c.save()
-    buf.seek(0)
-    content_b64 = b64encode(buf.read()).decode()
-    return content_b64, f"report_{year:04d}_{month:02d}.pdf"
+    return f"report_{year:04d}_{month:02d}.pdf"
+
+
+def export_month_pdf(db: Session, user_id: int, year: int, month: int) -> Tuple[bytes, str]:
+    """The monthly report as bytes, for callers that need it in memory (e.g. inside a zip)."""
+    buf = BytesIO()
+    filename = render_month_pdf(db, user_id, year, month, buf)
+    return buf.getvalue(), filename
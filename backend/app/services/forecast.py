@@ -0,0 +1,151 @@
+"""Daily balance projection per account.
+
+Every scheduled flow is dropped into a per-account array of daily deltas and
+balances come out of one prefix sum (`itertools.accumulate`) per account, so
+the cost is O(accounts x days) in C-level loops with no per-day Python work.
+"""
+import math
+from calendar import monthrange
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.finance import Account, AccountType, Transaction
+from . import recurring
+
+MAX_DAYS = 730
+
+
+def current_balances(db: Session, user_id: int, accounts: List[Account]) -> Dict[int, float]:
+    """Same rule as the account list (sum of transactions, else opening balance), in one grouped query."""
+    sums = {
+        account_id: (float(total or 0.0), count)
+        for account_id, total, count in (
+            db.query(Transaction.account_id, func.sum(Transaction.amount), func.count(Transaction.id))
+            .filter(Transaction.user_id == user_id)
+            .group_by(Transaction.account_id)
+            .all()
+        )
+    }
+    out = {}
+    for a in accounts:
+        total, count = sums.get(a.id, (0.0, 0))
+        out[a.id] = total if count else float(a.opening_balance or 0.0)
+    return out
+
+
+def _due_dates(start: date, end: date, due_day: int):
+    y, m = start.year, start.month
+    while True:
+        d = date(y, m, min(due_day, monthrange(y, m)[1]))
+        if d > end:
+            return
+        if d >= start:
+            yield d
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+
+
+def _default_funding_account(accounts: List[Account], balances: Dict[int, float]) -> Optional[Account]:
+    candidates = [
+        a for a in accounts
+        if not a.is_liability and a.name != "Maaser" and a.type in (AccountType.CASH, AccountType.SAVINGS)
+    ]
+    return max(candidates, key=lambda a: (a.type == AccountType.CASH, balances.get(a.id, 0.0)), default=None)
+
+
+def forecast(db: Session, user_id: int, days: int = 90, pay_from: Optional[int] = None,
+             today: Optional[date] = None) -> Dict[str, Any]:
+    """Project end-of-day balances for `days` days starting today.
+
+    Flows: active recurring series (from the detector) on each expected date,
+    and for liabilities with `min_payment`/`due_day`, the minimum payment on
+    every due date until the current debt is paid off, moved out of `pay_from`
+    (default: the user's largest cash account; raises ValueError if `pay_from`
+    is not one of the user's accounts). Interest is not modelled.
+    Non-liability accounts that dip below zero are flagged as overdrafts.
+    """
+    today = today or date.today()
+    end = today + timedelta(days=days - 1)
+    accounts = db.query(Account).filter(Account.user_id == user_id).order_by(Account.id).all()
+    balances = current_balances(db, user_id, accounts)
+    index = {a.id: i for i, a in enumerate(accounts)}
+    deltas = [[0.0] * days for _ in accounts]
+    events: List[Dict[str, Any]] = []
+
+    def add(account_id: int, d: date, amount: float, source: str, description: str):
+        deltas[index[account_id]][(d - today).days] += amount
+        events.append({"date": d, "account_id": account_id, "amount": round(amount, 2), "source": source, "description": description})
+
+    for s in recurring.current_series(db, user_id):
+        if s.account_id not in index or not recurring.is_active(s, today):
+            continue
+        d = s.next_date
+        while d <= end:
+            # expected but not yet posted: assume it lands today
+            add(s.account_id, max(d, today), s.next_amount, "recurring", s.note or s.key)
+            d = recurring.next_occurrence(d, s.cadence)
+
+    if pay_from is not None:
+        funding = next((a for a in accounts if a.id == pay_from), None)
+        if funding is None:
+            raise ValueError("Account not found")
+    else:
+        funding = _default_funding_account(accounts, balances)
+    for a in accounts:
+        if not (a.is_liability and a.min_payment and a.due_day):
+            continue
+        debt = abs(balances[a.id])
+        if debt < 0.01:
+            continue
+        toward_zero = 1.0 if balances[a.id] < 0 else -1.0
+        payments = math.ceil(debt / a.min_payment)
+        for n, d in enumerate(_due_dates(today, end, a.due_day)):
+            if n >= payments:
+                break
+            amount = min(a.min_payment, debt - n * a.min_payment)
+            add(a.id, d, toward_zero * amount, "debt_minimum", f"Minimum payment: {a.name}")
+            if funding is not None:
+                add(funding.id, d, -amount, "debt_minimum", f"Minimum payment: {a.name}")
+
+    out_accounts = []
+    total = [0.0] * days
+    overdrafts = []
+    for a, delta in zip(accounts, deltas):
+        series_balances = list(accumulate(delta, initial=balances[a.id]))[1:]
+        total = list(map(float.__add__, total, series_balances))
+        low = min(series_balances) if series_balances else balances[a.id]
+        low_idx = series_balances.index(low) if series_balances else 0
+        first_negative = None
+        if not a.is_liability and low < 0:
+            first_negative = next(i for i, b in enumerate(series_balances) if b < 0)
+            overdrafts.append({
+                "account_id": a.id,
+                "name": a.name,
+                "date": today + timedelta(days=first_negative),
+                "balance": round(series_balances[first_negative], 2),
+            })
+        out_accounts.append({
+            "account_id": a.id,
+            "name": a.name,
+            "is_liability": bool(a.is_liability),
+            "starting_balance": round(balances[a.id], 2),
+            "ending_balance": round(series_balances[-1], 2) if series_balances else round(balances[a.id], 2),
+            "min_balance": round(low, 2),
+            "min_balance_date": today + timedelta(days=low_idx),
+            "overdraft": first_negative is not None,
+            "balances": [round(b, 2) for b in series_balances],
+        })
+
+    events.sort(key=lambda e: (e["date"], e["account_id"]))
+    return {
+        "start": today,
+        "days": days,
+        "pay_from": funding.id if funding else None,
+        "accounts": out_accounts,
+        "total": [round(b, 2) for b in total],
+        "events": events,
+        "overdrafts": overdrafts,
+    }
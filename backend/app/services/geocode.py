@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+from ..core.config import settings
+from ..utils.cache import TTLCache
+
+# Shared by /address_lookup and /address_suggest. Keys are (normalized query, limit).
+_cache = TTLCache(maxsize=settings.ADDRESS_CACHE_SIZE, ttl=settings.ADDRESS_CACHE_TTL)
+# Requests currently being fetched upstream; identical concurrent queries await the same task.
+_inflight: Dict[tuple, "asyncio.Task[List[dict]]"] = {}
+
+_client: Optional[httpx.AsyncClient] = None
+# (event loop, base url) the pooled client was created for; a client cannot be reused across loops
+_client_key: Optional[tuple] = None
+
+
+# aclose() tasks of replaced clients, kept referenced until they finish
+_closing: Set["asyncio.Future[None]"] = set()
+
+
+def _retire(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop) -> None:
+    """Close a replaced client's connection pool on the loop that owns it."""
+    if client.is_closed or loop.is_closed():
+        return  # a closed loop has nothing left to run aclose() on
+    if loop is asyncio.get_running_loop():
+        task = loop.create_task(client.aclose())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+    elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        # stopped but not closed: run it to completion off this thread's running loop
+        worker = threading.Thread(target=loop.run_until_complete, args=(client.aclose(),), daemon=True)
+        worker.start()
+        worker.join()
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _client_key
+    key = (asyncio.get_running_loop(), settings.ADDRESS_LOOKUP_URL)
+    if _client is None or _client.is_closed or _client_key != key:
+        if _client is not None and _client_key is not None:
+            _retire(_client, _client_key[0])
+        _client = httpx.AsyncClient(
+            base_url=settings.ADDRESS_LOOKUP_URL,
+            timeout=settings.ADDRESS_LOOKUP_TIMEOUT,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            headers={'User-Agent': 'MalkaMoney/0.1 (address-lookup)'},
+        )
+        _client_key = key
+    return _client
+
+
+async def close_client() -> None:
+    global _client, _client_key
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_key = None
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+def normalize_address(row: Dict[str, Any]) -> Dict[str, str]:
+    """Map a Nominatim search result to our profile address fields."""
+    addr = row.get('address', {})
+    house_number = addr.get('house_number')
+    road = addr.get('road') or addr.get('pedestrian') or addr.get('footway') or ''
+    line1 = ' '.join([x for x in [house_number, road] if x]) or (addr.get('neighbourhood') or addr.get('suburb') or '')
+    city = addr.get('city') or addr.get('town') or addr.get('village') or addr.get('hamlet') or ''
+    state = addr.get('state') or addr.get('region') or ''
+    postal_code = addr.get('postcode') or ''
+    country = addr.get('country') or ''
+    label = row.get('display_name') or ' '.join(filter(None, [line1, city, state, postal_code, country]))
+    return {
+        'label': label,
+        'address_line1': line1,
+        'city': city,
+        'state': state,
+        'postal_code': postal_code,
+        'country': country,
+    }
+
+
+async def _fetch(key: tuple, q: str, limit: int) -> List[dict]:
+    resp = await _get_client().get(
+        '/search',
+        params={'q': q, 'format': 'json', 'addressdetails': 1, 'limit': limit},
+    )
+    resp.raise_for_status()
+    items = [normalize_address(row) for row in (resp.json() or [])]
+    _cache.set(key, items)
+    return items
+
+
+async def search(q: str, limit: int = 5) -> List[dict]:
+    """Geocode a free-form query, returning up to `limit` normalized addresses.
+
+    Results are served from the shared LRU cache when fresh; otherwise concurrent
+    identical queries are coalesced into a single upstream request. Upstream
+    errors propagate to the caller and are never cached.
+    """
+    limit = max(1, min(int(limit), 10))
+    key = (' '.join(q.split()).lower(), limit)
+    items = _cache.get(key)
+    if items is not None:
+        return items
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(key, q.strip(), limit))
+        _inflight[key] = task
+        task.add_done_callback(lambda _t: _inflight.pop(key, None))
+    # shield so a cancelled caller does not abort the fetch other callers are waiting on
+    return await asyncio.shield(task)
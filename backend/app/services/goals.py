@@ -0,0 +1,141 @@
+"""Goal progress from linked accounts and categories, with projected completion.
+
+All of a user's linked goals are filled from one grouped statement: the
+transactions of linked accounts, plus those of linked categories not already
+counted through an account, are summed per goal, with the last few months
+split out by month for the contribution rate. The sums are cached under the
+user's data version (`core.data_version`), which every transaction write
+bumps, and the goals' link layout, so edits anywhere are seen on the next
+read. Projections are cheap and worked out on every call.
+"""
+import math
+import re
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, exists, func, literal, or_, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from ..core import data_version
+from ..core.config import settings
+from ..models.finance import Category, CategoryType, Goal, GoalLink, Transaction
+from ..utils.cache import TTLCache
+from ..utils.sql import month_key
+from .budget_variance import month_index, month_label
+
+RATE_MONTHS = 3  # complete months averaged for the contribution rate
+DAYS_PER_MONTH = 365.25 / 12
+MAX_PROJECTION_MONTHS = 1200  # further out than this there is no projected date
+_DUE = re.compile(r"^\d{4}-\d{2}(-\d{2})?$")
+
+# (user_id, data version, rate window, link layout) -> {goal_id: (total, {month: amount})}
+_cache = TTLCache(maxsize=settings.GOAL_CACHE_SIZE, ttl=settings.GOAL_CACHE_TTL)
+
+Sums = Dict[int, Tuple[float, Dict[str, float]]]
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+def _layout(goals: Iterable[Goal]) -> Hashable:
+    return tuple(
+        (g.id, g.start_date, tuple((l.account_id, l.category_id) for l in g.links))
+        for g in goals if g.links
+    )
+
+
+def _sums(db: Session, user_id: int, goal_ids: List[int], rate_start: date) -> Sums:
+    counts_from = or_(Goal.start_date.is_(None), Transaction.date >= Goal.start_date)
+    other = aliased(GoalLink)  # a transaction already counted through one of the goal's accounts
+    by_account = (
+        select(GoalLink.goal_id, Transaction.id.label("tx_id"), Transaction.date, Transaction.amount.label("amount"))
+        .join(Goal, Goal.id == GoalLink.goal_id)
+        .join(Transaction, Transaction.account_id == GoalLink.account_id)
+        .where(GoalLink.goal_id.in_(goal_ids), counts_from)
+    )
+    by_category = (
+        select(GoalLink.goal_id, Transaction.id.label("tx_id"), Transaction.date,
+               case((Category.type == CategoryType.EXPENSE, -Transaction.amount), else_=Transaction.amount).label("amount"))
+        .join(Goal, Goal.id == GoalLink.goal_id)
+        .join(Category, Category.id == GoalLink.category_id)
+        .join(Transaction, Transaction.category_id == GoalLink.category_id)
+        .where(GoalLink.goal_id.in_(goal_ids), Transaction.user_id == user_id, counts_from,
+               ~exists().where(other.goal_id == GoalLink.goal_id, other.account_id == Transaction.account_id))
+    )
+    linked = union_all(by_account, by_category).subquery()
+    bucket = case((linked.c.date >= rate_start, month_key(db, linked.c.date)), else_=literal(""))
+    rows = db.execute(
+        select(linked.c.goal_id, bucket, func.sum(linked.c.amount)).group_by(linked.c.goal_id, bucket)
+    ).all()
+    out: Sums = {}
+    totals: Dict[int, float] = defaultdict(float)
+    months: Dict[int, Dict[str, float]] = defaultdict(dict)
+    for goal_id, month, amount in rows:
+        totals[goal_id] += float(amount or 0.0)
+        if month:
+            months[goal_id][month] = float(amount or 0.0)
+    for goal_id in goal_ids:
+        out[goal_id] = (totals.get(goal_id, 0.0), months.get(goal_id, {}))
+    return out
+
+
+def linked_sums(db: Session, user_id: int, goals: List[Goal], today: date) -> Sums:
+    """{goal_id: (total, {month: amount for recent months})} for the goals that have links."""
+    linked = [g for g in goals if g.links]
+    if not linked:
+        return {}
+    rate_start = date.fromisoformat(month_label(month_index(today.strftime("%Y-%m")) - RATE_MONTHS) + "-01")
+    version = data_version.current(db, user_id)
+    key = (user_id, version, rate_start, _layout(linked))
+    if version is not None:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+    sums = _sums(db, user_id, [g.id for g in linked], rate_start)
+    if version is not None:
+        _cache.set(key, sums)
+    return sums
+
+
+def _on_track(due: str, projected: Optional[date], complete: bool) -> Optional[bool]:
+    if complete:
+        return True
+    if not due or not _DUE.match(due):
+        return None
+    if projected is None:
+        return False
+    return projected.isoformat()[:len(due)] <= due
+
+
+def to_out(goal: Goal, sums: Sums, today: date) -> Dict[str, Any]:
+    """The goal as GoalOut data: progress (computed when linked), monthly rate and projection."""
+    auto = goal.id in sums
+    current = float(goal.current_amount or 0.0)
+    rate = None
+    projected = None
+    if auto:
+        total, months = sums[goal.id]
+        current = total
+        this_month = month_index(today.strftime("%Y-%m"))
+        rate = sum(months.get(month_label(this_month - k), 0.0) for k in range(1, RATE_MONTHS + 1)) / RATE_MONTHS
+    remaining = float(goal.target_amount) - current
+    complete = remaining <= 0
+    if not complete and rate and rate > 0 and remaining / rate <= MAX_PROJECTION_MONTHS:
+        projected = today + timedelta(days=math.ceil(remaining / rate * DAYS_PER_MONTH))
+    return {
+        "id": goal.id,
+        "name": goal.name,
+        "type": goal.type.value,
+        "target_amount": goal.target_amount,
+        "current_amount": round(current, 2),
+        "due_date": goal.due_date or "",
+        "start_date": goal.start_date,
+        "account_ids": [l.account_id for l in goal.links if l.account_id is not None],
+        "category_ids": [l.category_id for l in goal.links if l.category_id is not None],
+        "auto": auto,
+        "monthly_rate": None if rate is None else round(rate, 2),
+        "projected_date": projected,
+        "on_track": _on_track(goal.due_date or "", projected, complete),
+    }
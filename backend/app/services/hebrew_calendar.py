@@ -0,0 +1,260 @@
+"""Dependency-free Hebrew calendar arithmetic and holiday computation.
+
+Dates are converted through fixed day numbers (R.D., where 0001-01-01 is day 1),
+which is exactly what `date.toordinal()` returns, following the arithmetic
+calendar in Dershowitz & Reingold's *Calendrical Calculations*.
+
+Months are numbered from Nisan = 1; Tishrei = 7 starts the year, and in leap
+years Adar I = 12 and Adar II = 13.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+NISAN, IYYAR, SIVAN, TAMUZ, AV, ELUL = 1, 2, 3, 4, 5, 6
+TISHREI, HESHVAN, KISLEV, TEVET, SHVAT, ADAR, ADAR_II = 7, 8, 9, 10, 11, 12, 13
+
+HEBREW_EPOCH = -1373427  # R.D. of 1 Tishrei AM 1 (Julian 7 Oct 3761 BCE)
+
+_MONTH_NAMES = {
+    NISAN: "Nisan", IYYAR: "Iyyar", SIVAN: "Sivan", TAMUZ: "Tamuz", AV: "Av", ELUL: "Elul",
+    TISHREI: "Tishrei", HESHVAN: "Cheshvan", KISLEV: "Kislev", TEVET: "Tevet", SHVAT: "Sh'vat",
+    ADAR: "Adar", ADAR_II: "Adar II",
+}
+
+_ROMAN = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII"]
+
+# Shabbat = 5 in date.weekday() terms
+_FRI, _SAT, _SUN, _MON = 4, 5, 6, 0
+
+
+def is_leap_year(year: int) -> bool:
+    return (7 * year + 1) % 19 < 7
+
+
+def last_month_of_year(year: int) -> int:
+    return ADAR_II if is_leap_year(year) else ADAR
+
+
+@lru_cache(maxsize=4096)
+def _elapsed_days(year: int) -> int:
+    months_elapsed = (235 * year - 234) // 19
+    parts_elapsed = 12084 + 13753 * months_elapsed
+    day = 29 * months_elapsed + parts_elapsed // 25920
+    # molad zaken / lo ADU rosh
+    return day + 1 if (3 * (day + 1)) % 7 < 3 else day
+
+
+def _year_length_correction(year: int) -> int:
+    ny0, ny1, ny2 = _elapsed_days(year - 1), _elapsed_days(year), _elapsed_days(year + 1)
+    if ny2 - ny1 == 356:
+        return 2
+    if ny1 - ny0 == 382:
+        return 1
+    return 0
+
+
+@lru_cache(maxsize=4096)
+def new_year(year: int) -> int:
+    """Fixed day number of 1 Tishrei of `year`."""
+    return HEBREW_EPOCH + _elapsed_days(year) + _year_length_correction(year)
+
+
+def days_in_year(year: int) -> int:
+    return new_year(year + 1) - new_year(year)
+
+
+def days_in_month(year: int, month: int) -> int:
+    if month in (IYYAR, TAMUZ, ELUL, TEVET, ADAR_II):
+        return 29
+    if month == ADAR and not is_leap_year(year):
+        return 29
+    length = days_in_year(year)
+    if month == HESHVAN and length % 10 != 5:  # only "complete" years have a long Cheshvan
+        return 29
+    if month == KISLEV and length % 10 == 3:  # "deficient" years have a short Kislev
+        return 29
+    return 30
+
+
+def month_name(year: int, month: int) -> str:
+    if month == ADAR and is_leap_year(year):
+        return "Adar I"
+    return _MONTH_NAMES[month]
+
+
+def to_fixed(year: int, month: int, day: int) -> int:
+    fixed = new_year(year) + day - 1
+    if month < TISHREI:
+        for m in range(TISHREI, last_month_of_year(year) + 1):
+            fixed += days_in_month(year, m)
+        for m in range(NISAN, month):
+            fixed += days_in_month(year, m)
+    else:
+        for m in range(TISHREI, month):
+            fixed += days_in_month(year, m)
+    return fixed
+
+
+def to_gregorian(year: int, month: int, day: int) -> date:
+    return date.fromordinal(to_fixed(year, month, day))
+
+
+def from_gregorian(d: date) -> Tuple[int, int, int]:
+    """(year, month, day) of the Hebrew date on the daytime of civil date `d`."""
+    fixed = d.toordinal()
+    year = (fixed - HEBREW_EPOCH) * 98496 // 35975351
+    while new_year(year + 1) <= fixed:
+        year += 1
+    month = TISHREI if fixed < to_fixed(year, NISAN, 1) else NISAN
+    while fixed > to_fixed(year, month, days_in_month(year, month)):
+        month += 1
+    return year, month, fixed - to_fixed(year, month, 1) + 1
+
+
+def format_hebrew_date(year: int, month: int, day: int) -> str:
+    return f"{day} {month_name(year, month)} {year}"
+
+
+def _hebrew_year_events(year: int, israel: bool) -> List[Tuple[date, str, str, bool]]:
+    """(date, name, category, yom_tov) for every holiday in Hebrew `year`."""
+    events: List[Tuple[date, str, str, bool]] = []
+
+    def add(month: int, day: int, name: str, category: str, yom_tov: bool = False):
+        events.append((to_gregorian(year, month, day), name, category, yom_tov))
+
+    def add_fast(month: int, day: int, name: str):
+        # fasts falling on Shabbat are pushed to Sunday
+        d = to_gregorian(year, month, day)
+        if d.weekday() == _SAT:
+            d += timedelta(days=1)
+        events.append((d, name, "fast", False))
+
+    # Tishrei
+    add(TISHREI, 1, f"Rosh Hashana {year}", "major", True)
+    add(TISHREI, 2, "Rosh Hashana II", "major", True)
+    add_fast(TISHREI, 3, "Tzom Gedaliah")
+    add(TISHREI, 9, "Erev Yom Kippur", "major")
+    add(TISHREI, 10, "Yom Kippur", "major", True)
+    add(TISHREI, 14, "Erev Sukkot", "major")
+    sukkot_yt_days = 1 if israel else 2
+    for i in range(7):
+        if i < sukkot_yt_days:
+            add(TISHREI, 15 + i, f"Sukkot {_ROMAN[i]}", "major", True)
+        elif i < 6:
+            add(TISHREI, 15 + i, f"Sukkot {_ROMAN[i]} (CH''M)", "major")
+        else:
+            add(TISHREI, 21, "Sukkot VII (Hoshana Raba)", "major")
+    if israel:
+        add(TISHREI, 22, "Shmini Atzeret / Simchat Torah", "major", True)
+    else:
+        add(TISHREI, 22, "Shmini Atzeret", "major", True)
+        add(TISHREI, 23, "Simchat Torah", "major", True)
+
+    # Chanukah: 8 days from 25 Kislev, crossing into Tevet
+    start = to_gregorian(year, KISLEV, 25)
+    for i in range(8):
+        events.append((start + timedelta(days=i), f"Chanukah: Day {i + 1}", "major", False))
+    add_fast(TEVET, 10, "Asara B'Tevet")
+    add(SHVAT, 15, "Tu BiShvat", "minor")
+
+    # Adar: Purim is in Adar II in leap years
+    pm = last_month_of_year(year)
+    if is_leap_year(year):
+        add(ADAR, 14, "Purim Katan", "minor")
+    esther = to_gregorian(year, pm, 13)
+    if esther.weekday() == _SAT:
+        esther -= timedelta(days=2)  # moved back to Thursday
+    events.append((esther, "Ta'anit Esther", "fast", False))
+    add(pm, 14, "Purim", "major")
+    add(pm, 15, "Shushan Purim", "minor")
+
+    # Nisan
+    add(NISAN, 14, "Erev Pesach", "major")
+    pesach_days = 7 if israel else 8
+    for i in range(pesach_days):
+        yom_tov = i == 0 or i == 6 or (not israel and i in (1, 7))
+        label = f"Pesach {_ROMAN[i]}" if yom_tov else f"Pesach {_ROMAN[i]} (CH''M)"
+        add(NISAN, 15 + i, label, "major", yom_tov)
+
+    # Modern Israeli days, with the Knesset's postponement rules
+    shoah = to_gregorian(year, NISAN, 27)
+    if shoah.weekday() == _FRI:
+        shoah -= timedelta(days=1)
+    elif shoah.weekday() == _SUN:
+        shoah += timedelta(days=1)
+    events.append((shoah, "Yom HaShoah", "modern", False))
+    atzmaut = to_gregorian(year, IYYAR, 5)
+    if atzmaut.weekday() == _FRI:
+        atzmaut -= timedelta(days=1)
+    elif atzmaut.weekday() == _SAT:
+        atzmaut -= timedelta(days=2)
+    elif atzmaut.weekday() == _MON:
+        atzmaut += timedelta(days=1)
+    events.append((atzmaut - timedelta(days=1), "Yom HaZikaron", "modern", False))
+    events.append((atzmaut, "Yom HaAtzma'ut", "modern", False))
+    add(IYYAR, 18, "Lag BaOmer", "minor")
+    add(IYYAR, 28, "Yom Yerushalayim", "modern")
+
+    # Sivan
+    add(SIVAN, 5, "Erev Shavuot", "major")
+    add(SIVAN, 6, "Shavuot" if israel else "Shavuot I", "major", True)
+    if not israel:
+        add(SIVAN, 7, "Shavuot II", "major", True)
+
+    # Summer fasts
+    add_fast(TAMUZ, 17, "Tzom Tammuz")
+    add_fast(AV, 9, "Tish'a B'Av")
+    add(AV, 15, "Tu B'Av", "minor")
+    add(ELUL, 29, "Erev Rosh Hashana", "major")
+
+    # Rosh Chodesh: day 30 of a full month plus day 1 of the next (none for Tishrei)
+    for m in _months_in_order(year):
+        if m == TISHREI:
+            continue
+        name = f"Rosh Chodesh {month_name(year, m)}"
+        first = to_gregorian(year, m, 1)
+        prev_last = first - timedelta(days=1)
+        if from_gregorian(prev_last)[2] == 30:
+            events.append((prev_last, name, "roshchodesh", False))
+        events.append((first, name, "roshchodesh", False))
+
+    return events
+
+
+def _months_in_order(year: int) -> List[int]:
+    return list(range(TISHREI, last_month_of_year(year) + 1)) + list(range(NISAN, TISHREI))
+
+
+@lru_cache(maxsize=512)
+def holidays_for_year(year: int, israel: bool = False) -> Tuple[Dict[str, object], ...]:
+    """All holidays falling in Gregorian `year`, sorted by date. Memoized per (year, israel)."""
+    events = []
+    # Gregorian year Y spans the end of Hebrew year Y+3760 and the start of Y+3761
+    for hy in (year + 3760, year + 3761):
+        events.extend(e for e in _hebrew_year_events(hy, israel) if e[0].year == year)
+    events.sort(key=lambda e: (e[0], e[1]))
+    return tuple(
+        {
+            "name": name,
+            "date": d.isoformat(),
+            "hebrew_date": format_hebrew_date(*from_gregorian(d)),
+            "category": category,
+            "yom_tov": yom_tov,
+        }
+        for d, name, category, yom_tov in events
+    )
+
+
+@lru_cache(maxsize=512)
+def yom_tov_days(year: int, israel: bool = False) -> Tuple[date, ...]:
+    """Civil dates in Gregorian `year` whose daytime is a work-restricted festival day."""
+    return tuple(date.fromisoformat(h["date"]) for h in holidays_for_year(year, israel) if h["yom_tov"])
+
+
+def holidays_between(start_year: int, end_year: int, israel: bool = False) -> List[Dict[str, object]]:
+    """Holidays for every Gregorian year in [start_year, end_year]."""
+    out: List[Dict[str, object]] = []
+    for y in range(start_year, end_year + 1):
+        out.extend(holidays_for_year(y, israel))
+    return out
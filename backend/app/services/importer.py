@@ -0,0 +1,203 @@
+"""Batch transaction import: validation, categorisation and de-duplication.
+
+Accounts, categories and rules are loaded once per import. Each batch of rows
+is checked against existing fingerprints with one grouped IN query and
+inserted with one executemany. `import_stream` drives the same batches from a
+lazily parsed statement file, committing one fixed-size chunk at a time.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from ..models.finance import Account, Category, CategoryRule, CategoryType, Transaction
+from ..utils.fingerprint import fingerprint
+from .statement_parser import StatementRow, parse_amount, parse_date
+
+LOOKUP_CHUNK = 10000  # fingerprints per IN (...) lookup
+IMPORT_CHUNK = 1000  # statement rows validated, checked and committed together
+MAX_REPORTED = 100  # duplicates / errors listed individually in a file import summary
+
+
+@dataclass
+class ImportContext:
+    user_id: int
+    account_ids: set
+    category_types: Dict[int, CategoryType]
+    rules: List[CategoryRule] = field(default_factory=list)
+    category_names: Dict[str, int] = field(default_factory=dict)
+    # only rows that existed before the import started count as duplicates
+    watermark: int = 0
+    # existing rows already matched by earlier rows of this import, per fingerprint
+    consumed: Counter = field(default_factory=Counter)
+
+
+def load_context(db: Session, user_id: int) -> ImportContext:
+    categories = db.query(Category.id, Category.type, Category.name).filter(Category.user_id == user_id).all()
+    return ImportContext(
+        user_id=user_id,
+        account_ids={a for (a,) in db.query(Account.id).filter(Account.user_id == user_id).all()},
+        category_types={cid: ctype for cid, ctype, _name in categories},
+        category_names={(name or "").lower(): cid for cid, _ctype, name in categories},
+        rules=db.query(CategoryRule).filter(CategoryRule.user_id == user_id).all(),
+        watermark=db.query(func.max(Transaction.id)).filter(Transaction.user_id == user_id).scalar() or 0,
+    )
+
+
+def _match_rule(ctx: ImportContext, note: str, amount: float) -> Optional[int]:
+    for r in ctx.rules:
+        txt = note if r.case_sensitive else note.lower()
+        pat = r.pattern if r.case_sensitive else (r.pattern or '').lower()
+        if pat and pat in txt:
+            if r.min_amount is not None and amount < r.min_amount:
+                continue
+            if r.max_amount is not None and amount > r.max_amount:
+                continue
+            if r.category_id in ctx.category_types:
+                return r.category_id
+            return None
+    return None
+
+
+def prepare_row(ctx: ImportContext, account_id: int, tx_date: Any, amount: float, note: Optional[str],
+                category_id: Optional[int] = None, keep_sign: bool = False) -> Dict[str, Any]:
+    """Validate one row and return it ready to insert. Raises ValueError with a user-facing message.
+
+    Amounts are taken as magnitudes and signed by category type (expense
+    negative); uncategorised rows stay positive unless a rule assigns one.
+    With `keep_sign` (bank statements, where the sign is meaningful)
+    uncategorised rows keep the sign they came with.
+    """
+    if account_id not in ctx.account_ids:
+        raise ValueError("Account not found")
+    if category_id:
+        if category_id not in ctx.category_types:
+            raise ValueError("Category not found")
+    else:
+        # rule bounds are magnitudes; statement debits arrive negative
+        category_id = _match_rule(ctx, note or "", abs(float(amount)))
+    tx_date = tx_date if isinstance(tx_date, date) else date.fromisoformat(str(tx_date))
+    magnitude = abs(float(amount))
+    if category_id:
+        signed = -magnitude if ctx.category_types[category_id] == CategoryType.EXPENSE else magnitude
+    else:
+        signed = float(amount) if keep_sign else magnitude
+    note = note or ""
+    return {
+        "user_id": ctx.user_id,
+        "account_id": account_id,
+        "category_id": category_id,
+        "date": tx_date,
+        "amount": signed,
+        "note": note,
+        "is_transfer": False,
+        "fingerprint": fingerprint(account_id, tx_date, signed, note),
+    }
+
+
+def existing_counts(db: Session, ctx: ImportContext, fingerprints: Iterable[str]) -> Dict[str, int]:
+    wanted = list(set(fingerprints))
+    counts: Dict[str, int] = {}
+    for i in range(0, len(wanted), LOOKUP_CHUNK):
+        counts.update(
+            db.query(Transaction.fingerprint, func.count(Transaction.id))
+            .filter(
+                Transaction.user_id == ctx.user_id,
+                Transaction.id <= ctx.watermark,
+                Transaction.fingerprint.in_(wanted[i:i + LOOKUP_CHUNK]),
+            )
+            .group_by(Transaction.fingerprint)
+            .all()
+        )
+    return counts
+
+
+def insert_batch(db: Session, ctx: ImportContext, rows: List[Tuple[int, Dict[str, Any]]],
+                 duplicates: str = "skip") -> Tuple[int, List[Dict[str, Any]]]:
+    """Insert `(index, row)` pairs; returns (inserted count, duplicate reports).
+
+    A row is a duplicate while transactions that existed before the import
+    still have unmatched copies of its fingerprint, so a file containing two
+    identical coffees still imports both, and re-importing it imports neither.
+    With duplicates="flag" they are inserted anyway and only reported.
+    """
+    if not rows:
+        return 0, []
+    existing = existing_counts(db, ctx, (r["fingerprint"] for _i, r in rows))
+    fresh: List[Dict[str, Any]] = []
+    dupes: List[Dict[str, Any]] = []
+    for idx, row in rows:
+        fp = row["fingerprint"]
+        if existing.get(fp, 0) > ctx.consumed[fp]:
+            ctx.consumed[fp] += 1
+            dupes.append({"index": idx, "date": row["date"].isoformat(), "amount": row["amount"], "note": row["note"]})
+            if duplicates != "flag":
+                continue
+        fresh.append(row)
+    if fresh:
+        db.execute(insert(Transaction), fresh)
+    return len(fresh), dupes
+
+
+def import_stream(db: Session, ctx: ImportContext, account_id: int, records: Iterable[StatementRow],
+                  date_format: Optional[str] = None, duplicates: str = "skip", chunk_size: int = IMPORT_CHUNK,
+                  on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Validate, de-duplicate and insert parsed statement rows, committing every `chunk_size` rows.
+
+    Memory stays bounded by one chunk plus the first MAX_REPORTED duplicates
+    and errors, whatever the file size. Each committed chunk is reported to
+    `on_progress`; since rows are fingerprinted, re-running a file that failed
+    halfway only imports what is still missing. A parse error that stops the
+    file raises ValueError saying how many rows were already committed.
+    """
+    summary: Dict[str, Any] = {
+        "rows": 0, "imported": 0, "duplicate_count": 0, "error_count": 0, "chunks": 0,
+        "duplicates": [], "errors": [],
+    }
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+
+    def flush() -> None:
+        imported, dupes = insert_batch(db, ctx, chunk, duplicates=duplicates)
+        db.commit()
+        summary["imported"] += imported
+        summary["duplicate_count"] += len(dupes)
+        room = MAX_REPORTED - len(summary["duplicates"])
+        if room > 0:
+            summary["duplicates"].extend(dupes[:room])
+        summary["chunks"] += 1
+        chunk.clear()
+        if on_progress is not None:
+            on_progress({k: summary[k] for k in ("rows", "imported", "duplicate_count", "error_count", "chunks")})
+
+    rows = iter(records)
+    while True:
+        try:
+            rec = next(rows)
+        except StopIteration:
+            break
+        except ValueError as e:  # the file itself is unreadable from here on
+            done = summary["imported"]
+            if done:
+                raise ValueError(f"{e} ({done} {'row' if done == 1 else 'rows'} before it already imported)") from None
+            raise
+        summary["rows"] += 1
+        try:
+            category_id = None
+            if rec.category:
+                category_id = ctx.category_names.get(rec.category.lower())
+            row = prepare_row(ctx, account_id, parse_date(rec.date, date_format), parse_amount(rec.amount),
+                              rec.note, category_id, keep_sign=True)
+        except ValueError as e:
+            summary["error_count"] += 1
+            if len(summary["errors"]) < MAX_REPORTED:
+                summary["errors"].append({"index": rec.line, "detail": f"Line {rec.line}: {e}"})
+            continue
+        chunk.append((rec.line, row))
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk or not summary["chunks"]:
+        flush()
+    return summary
@@ -1,5 +1,5 @@
 from typing import Dict, Any
-from datetime import date
+from .hebrew_calendar import holidays_for_year, holidays_between
 
 
 def maaser_from_income(amount: float) -> float:
@@ -7,18 +7,14 @@ def maaser_from_income(amount: float) -> float:
     return round(amount * 0.10, 2)
 
 
-def get_holidays(year: int) -> Dict[str, Any]:
-    # Minimal stub data; integrate Hebcal later
-    # Return a few key holidays with Gregorian placeholders
+def get_holidays(year: int, israel: bool = False) -> Dict[str, Any]:
+    return {"year": year, "israel": israel, "holidays": list(holidays_for_year(year, israel))}
+
+
+def get_holidays_range(start_year: int, end_year: int, israel: bool = False) -> Dict[str, Any]:
     return {
-        "year": year,
-        "holidays": [
-            {"name": "Rosh Hashanah", "approx": f"{year}-10-03"},
-            {"name": "Yom Kippur", "approx": f"{year}-10-12"},
-            {"name": "Sukkot", "approx": f"{year}-10-17"},
-            {"name": "Chanukah", "approx": f"{year}-12-15"},
-            {"name": "Purim", "approx": f"{year}-03-17"},
-            {"name": "Pesach", "approx": f"{year}-04-13"},
-            {"name": "Shavuot", "approx": f"{year}-06-02"},
-        ]
+        "start_year": start_year,
+        "end_year": end_year,
+        "israel": israel,
+        "holidays": holidays_between(start_year, end_year, israel),
     }
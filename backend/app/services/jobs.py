@@ -0,0 +1,258 @@
+"""Background jobs: a `jobs` table as the queue and an in-process thread pool.
+
+Handlers are registered by name with a pydantic model for their parameters.
+`enqueue` stores the job and hands its id to the pool; a worker claims it
+with a conditional UPDATE (so two processes sharing the database never run
+the same job), runs the handler in its own session and stores the JSON result.
+Jobs still queued at shutdown are picked up again by `start()` on the next
+boot; jobs that were running when the process died are marked failed.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.db import SessionLocal, engine
+from ..models.jobs import Job
+from ..models.user import User
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+PROGRESS_INTERVAL = 0.5  # seconds between progress writes
+
+
+@dataclass
+class Handler:
+    fn: Callable[..., Any]  # fn(db, user, params, progress) -> JSON-serialisable result
+    params: Type[BaseModel]
+    internal: bool = False  # only enqueued by the app's own endpoints, never by `POST /api/jobs/`
+
+
+@dataclass
+class FileResult:
+    """Returned by handlers whose output is a file (PDFs, archives) rather than JSON."""
+    path: str
+    filename: str
+    media_type: str = "application/octet-stream"
+
+
+_handlers: Dict[str, Handler] = {}
+_executor: Optional[ThreadPoolExecutor] = None
+_futures: Dict[str, Future] = {}
+_lock = threading.Lock()
+
+
+def handler(kind: str, params: Type[BaseModel], internal: bool = False):
+    """Register `fn(db, user, params, progress)` as the runner for jobs of `kind`."""
+    def wrap(fn):
+        _handlers[kind] = Handler(fn, params, internal)
+        return fn
+    return wrap
+
+
+def kinds() -> List[str]:
+    """The kinds clients may enqueue directly."""
+    return sorted(k for k, h in _handlers.items() if not h.internal)
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, settings.JOB_WORKERS), thread_name_prefix="job")
+        return _executor
+
+
+def _submit(job_id: str) -> None:
+    fut = _pool().submit(_run, job_id)
+    with _lock:
+        _futures[job_id] = fut
+    fut.add_done_callback(lambda _f: _futures.pop(job_id, None))
+
+
+def _spool_dir() -> str:
+    folder = os.path.realpath(settings.JOB_SPOOL_DIR or tempfile.gettempdir())
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def spool_path(suffix: str = "") -> str:
+    """A fresh file path for data (e.g. an upload) a job reads later; the job deletes it."""
+    return os.path.join(_spool_dir(), f"job-{uuid.uuid4().hex}{suffix}")
+
+
+def spooled(name: str) -> str:
+    """The path of a spool file from its name (or path); raises ValueError for anything outside the spool directory.
+
+    Job parameters carry spool file names, never paths, so a job can only
+    read or delete files this module created.
+    """
+    folder = _spool_dir()
+    path = os.path.realpath(os.path.join(folder, name))
+    if os.path.dirname(path) != folder or not os.path.basename(path).startswith("job-"):
+        raise ValueError("Invalid spool file")
+    return path
+
+
+def enqueue(db: Session, user_id: int, kind: str, params: Dict[str, Any], internal: bool = False) -> Job:
+    """Validate `params` against the handler's model, store the job and start it. Raises ValueError.
+
+    Internal kinds are refused unless `internal` is set by the calling endpoint.
+    """
+    h = _handlers.get(kind)
+    if h is None or (h.internal and not internal):
+        raise ValueError(f"Unknown job kind {kind!r}")
+    data = h.params(**params).model_dump(mode="json")
+    _purge(db)
+    job = Job(id=uuid.uuid4().hex, user_id=user_id, kind=kind, status=QUEUED, params=json.dumps(data),
+              created_at=datetime.utcnow())
+    db.add(job)
+    db.commit()
+    _submit(job.id)
+    return job
+
+
+def _purge(db: Session) -> None:
+    cutoff = datetime.utcnow() - timedelta(hours=settings.JOB_RETENTION_HOURS)
+    expired = db.query(Job.id, Job.result).filter(Job.status.in_(FINISHED), Job.finished_at < cutoff).all()
+    for _id, result in expired:
+        _cleanup(json.loads(result or "null"), key="file")
+    if expired:
+        db.query(Job).filter(Job.id.in_([i for i, _r in expired])).delete(synchronize_session=False)
+
+
+def cancel(db: Session, job: Job) -> bool:
+    """Cancel a job that has not started yet."""
+    done = db.execute(
+        update(Job).where(Job.id == job.id, Job.status == QUEUED)
+        .values(status=CANCELLED, finished_at=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    if done:
+        _cleanup(json.loads(job.params or "{}"))
+    return bool(done)
+
+
+def _cleanup(data: Any, key: str = "spool") -> None:
+    name = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(name, str) or not name:
+        return
+    try:
+        path = spooled(name)
+    except ValueError:
+        return
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _set(job_id: str, **values) -> int:
+    with engine.begin() as conn:
+        return conn.execute(update(Job).where(Job.id == job_id).values(**values)).rowcount
+
+
+def _run(job_id: str) -> None:
+    with engine.begin() as conn:
+        claimed = conn.execute(
+            update(Job).where(Job.id == job_id, Job.status == QUEUED)
+            .values(status=RUNNING, started_at=datetime.utcnow())
+        ).rowcount
+    if not claimed:
+        return  # cancelled, or taken by another process
+    db = SessionLocal()
+    params: Dict[str, Any] = {}
+    try:
+        job = db.get(Job, job_id)
+        params = json.loads(job.params or "{}")
+        h = _handlers.get(job.kind)
+        if h is None:
+            raise ValueError(f"Unknown job kind {job.kind!r}")
+        user = db.get(User, job.user_id)
+        last = [0.0]
+
+        def progress(fraction: Optional[float] = None, **detail) -> None:
+            now = time.monotonic()
+            if now - last[0] < PROGRESS_INTERVAL:
+                return
+            last[0] = now
+            try:
+                _set(job_id, progress=fraction, progress_detail=json.dumps(detail) if detail else None)
+            except OperationalError:
+                pass  # SQLite busy with the handler's own write; the next report catches up
+
+        result = h.fn(db, user, h.params(**params), progress)
+        db.commit()
+        if isinstance(result, FileResult):
+            result = {"file": result.path, "filename": result.filename, "media_type": result.media_type}
+        _set(job_id, status=SUCCEEDED, progress=1.0, result=json.dumps(result, default=str),
+             finished_at=datetime.utcnow())
+    except Exception as e:  # the job records the failure; the worker thread carries on
+        db.rollback()
+        _set(job_id, status=FAILED, error=str(e) or e.__class__.__name__, finished_at=datetime.utcnow())
+    finally:
+        db.close()
+        _cleanup(params)
+
+
+def start() -> int:
+    """Recover after a restart: fail jobs orphaned mid-run and resubmit queued ones. Returns the number resubmitted.
+
+    Assumes one app process per database, the usual SQLite deployment; a second
+    process booting would otherwise fail the first one's running jobs.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            update(Job).where(Job.status == RUNNING)
+            .values(status=FAILED, error="Interrupted by a server restart", finished_at=datetime.utcnow())
+        )
+    with SessionLocal() as db:
+        queued = [i for (i,) in db.query(Job.id).filter(Job.status == QUEUED).order_by(Job.created_at).all()]
+    for job_id in queued:
+        _submit(job_id)
+    return len(queued)
+
+
+def drain(timeout: Optional[float] = None) -> None:
+    """Block until every submitted job has finished (tests, CLI tools)."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        with _lock:
+            pending = list(_futures.values())
+        if not pending:
+            return
+        for fut in pending:
+            fut.result(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+
+def shutdown() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        # queued jobs stay queued in the table and are resubmitted on the next start()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def to_dict(job: Job) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "progress_detail": json.loads(job.progress_detail) if job.progress_detail else None,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
@@ -0,0 +1,134 @@
+"""Typed columnar export (Parquet or Arrow IPC) of a user's whole ledger.
+
+Each table is read with a server-side `yield_per` cursor and converted one
+result partition at a time into an Arrow record batch, so dates stay dates,
+amounts stay float64 and nullable ids stay nullable, and memory is bounded
+by one batch. pyarrow is optional: `require_pyarrow()` raises RuntimeError
+when it is missing, so callers can refuse before starting a response.
+"""
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Integer, String, select, type_coerce
+from sqlalchemy.orm import Session
+
+from ..models.finance import Account, Category, Investment, InvestmentTransaction, Transaction
+from ..utils.stream import ByteSink
+
+BATCH_ROWS = 50_000  # rows per record batch / result partition
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+COPY_CHUNK = 1 << 20
+
+
+def _enum_value(v: Any) -> Any:
+    return getattr(v, "value", v)
+
+
+def _raw(column, as_type):
+    # skip SQLAlchemy's per-value Python processors (str -> date, int -> bool); Arrow casts whole columns in C
+    return type_coerce(column, as_type).label(column.key)
+
+
+def _tables(user_id: int) -> List[Tuple[str, Any, List[Tuple[str, str, Optional[Callable[[Any], Any]]]]]]:
+    """(name, select, [(column, arrow type name, converter)]) for every exported table."""
+    return [
+        ("transactions",
+         select(Transaction.id, _raw(Transaction.date, String), Transaction.account_id, Transaction.category_id,
+                Transaction.amount, Transaction.note, _raw(Transaction.is_transfer, Integer),
+                Transaction.counterparty_account_id)
+         .where(Transaction.user_id == user_id).order_by(Transaction.id),
+         [("id", "int64", None), ("date", "date32", None), ("account_id", "int64", None),
+          ("category_id", "int64", None), ("amount", "float64", None), ("note", "string", None),
+          ("is_transfer", "bool_", None), ("counterparty_account_id", "int64", None)]),
+        ("accounts",
+         select(Account.id, Account.name, Account.type, Account.opening_balance, Account.is_liability,
+                Account.apr_annual, Account.min_payment, Account.due_day)
+         .where(Account.user_id == user_id).order_by(Account.id),
+         [("id", "int64", None), ("name", "string", None), ("type", "string", _enum_value),
+          ("opening_balance", "float64", None), ("is_liability", "bool_", None), ("apr_annual", "float64", None),
+          ("min_payment", "float64", None), ("due_day", "int32", None)]),
+        ("categories",
+         select(Category.id, Category.name, Category.type, Category.is_builtin, Category.icon)
+         .where(Category.user_id == user_id).order_by(Category.id),
+         [("id", "int64", None), ("name", "string", None), ("type", "string", _enum_value),
+          ("is_builtin", "bool_", None), ("icon", "string", None)]),
+        ("investment_transactions",
+         select(InvestmentTransaction.id, _raw(InvestmentTransaction.date, String), InvestmentTransaction.investment_id,
+                Investment.symbol, InvestmentTransaction.account_id, InvestmentTransaction.type,
+                InvestmentTransaction.quantity, InvestmentTransaction.unit_price, InvestmentTransaction.total_cost)
+         .join(Investment, InvestmentTransaction.investment_id == Investment.id)
+         .where(InvestmentTransaction.user_id == user_id).order_by(InvestmentTransaction.id),
+         [("id", "int64", None), ("date", "date32", None), ("investment_id", "int64", None),
+          ("symbol", "string", None), ("account_id", "int64", None), ("type", "string", None),
+          ("quantity", "float64", None), ("unit_price", "float64", None), ("total_cost", "float64", None)]),
+    ]
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Install pyarrow to export Parquet/Arrow files") from None
+    return pyarrow
+
+
+def write_table(db: Session, stmt, columns, fmt: str, path: str) -> int:
+    """Stream one select into a Parquet / Arrow IPC file at `path`; returns the row count."""
+    pa = require_pyarrow()
+    schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name, _conv in columns])
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(path, schema, compression="zstd")
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+        write = writer.write_batch
+    rows = 0
+    try:
+        # Core execution on the session's connection: no ORM row processing
+        result = db.connection().execute(stmt.execution_options(yield_per=BATCH_ROWS))
+        for part in result.partitions():
+            arrays = []
+            for field, (_name, _t, conv), values in zip(schema, columns, zip(*part)):
+                arr = pa.array(values if conv is None else [conv(v) for v in values])
+                arrays.append(arr if arr.type == field.type else arr.cast(field.type))
+            write(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            rows += len(part)
+    finally:
+        writer.close()
+    return rows
+
+
+def ledger_zip(db: Session, user_id: int, fmt: str = "parquet") -> Iterator[bytes]:
+    """Yield a zip with one columnar file per table (stored, the files are already compressed).
+
+    pyarrow's writers expect a real file (they ask for its position), so each
+    table goes to a scratch file first and is then copied into the stream.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r}")
+    require_pyarrow()
+    sink = ByteSink()
+    zf = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED)
+    scratch = tempfile.mkdtemp(prefix="ledger-")
+    try:
+        for name, stmt, columns in _tables(user_id):
+            path = os.path.join(scratch, name + FORMATS[fmt])
+            write_table(db, stmt, columns, fmt, path)
+            with open(path, "rb") as src, zf.open(name + FORMATS[fmt], "w", force_zip64=True) as dst:
+                while True:
+                    chunk = src.read(COPY_CHUNK)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    yield sink.drain()
+            os.remove(path)
+        zf.close()
+        yield sink.drain()
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
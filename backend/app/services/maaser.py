@@ -0,0 +1,136 @@
+"""Maaser / Tzedakah ledger: obligation, paid and running balance per month.
+
+Reads come from `maaser_months`, which the triggers in `core/maaser.py` keep
+current on every transaction write, so a report over any range is one grouped
+query over a handful of rows per month and never touches `transactions`. The
+obligation is income x the user's current `maaser_pct`, so changing the
+percentage needs no backfill. `rebuild` recomputes a user's rows from scratch
+and is called when a category or account rename changes what counts as
+Tzedakah or the Maaser account.
+"""
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, case, func, insert, literal
+from sqlalchemy.orm import Session
+
+from ..core.maaser import MAASER_ACCOUNT, TZEDAKAH_CATEGORY
+from ..models.finance import Account, Category, CategoryType, MaaserMonth, Transaction
+from ..utils.sql import month_key
+from .budget_variance import month_index, month_label
+
+MAX_MONTHS = 600
+DEFAULT_PCT = 0.10
+
+
+def maintained(db: Session) -> bool:
+    """True when triggers keep `maaser_months` current (SQLite)."""
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def _from_transactions(db: Session, user_id: int):
+    """Select of (user_id, month, income, paid, maaser_net) grouped from transactions; the triggers' logic in SQL."""
+    not_transfer = func.coalesce(Transaction.is_transfer, False) == False  # noqa: E712
+    month = month_key(db, Transaction.date)
+    income = case(
+        (and_(not_transfer, (Category.type == CategoryType.INCOME) | (Category.id.is_(None) & (Transaction.amount > 0))),
+         Transaction.amount),
+        (and_(~not_transfer, Account.name == MAASER_ACCOUNT, Transaction.amount > 0), Transaction.amount),
+        else_=0.0,
+    )
+    paid = case(
+        (and_(Transaction.amount < 0,
+              (Category.name == TZEDAKAH_CATEGORY) | (and_(Account.name == MAASER_ACCOUNT, not_transfer))),
+         -Transaction.amount),
+        else_=0.0,
+    )
+    maaser_net = case((Account.name == MAASER_ACCOUNT, Transaction.amount), else_=0.0)
+    return (
+        db.query(literal(user_id), month, func.sum(income), func.sum(paid), func.sum(maaser_net))
+        .select_from(Transaction)
+        .outerjoin(Category, Transaction.category_id == Category.id)
+        .outerjoin(Account, Transaction.account_id == Account.id)
+        .filter(Transaction.user_id == user_id)
+        .group_by(month)
+    )
+
+
+def rebuild(db: Session, user_id: int) -> None:
+    """Recompute the user's ledger rows from their transactions (two statements; caller commits)."""
+    if not maintained(db):
+        return
+    db.query(MaaserMonth).filter(MaaserMonth.user_id == user_id).delete(synchronize_session=False)
+    db.execute(
+        insert(MaaserMonth).from_select(
+            ["user_id", "month", "income", "paid", "maaser_net"], _from_transactions(db, user_id).subquery().select()
+        )
+    )
+
+
+def monthly_rows(db: Session, user_id: int, start_month: str, end_month: str):
+    """[(month, income, paid, maaser_net)] for the range plus an opening row keyed '' summing everything earlier."""
+    if maintained(db):
+        month = MaaserMonth.month
+        source = db.query(MaaserMonth).filter(MaaserMonth.user_id == user_id)
+        columns = (MaaserMonth.income, MaaserMonth.paid, MaaserMonth.maaser_net)
+    else:
+        sub = _from_transactions(db, user_id).subquery()
+        _uid, month, *columns = sub.c
+        source = db.query(sub)
+    bucket = case((month < start_month, literal("")), else_=month)
+    return (
+        source.with_entities(bucket, *(func.sum(c) for c in columns))
+        .filter(month <= end_month)
+        .group_by(bucket)
+        .all()
+    )
+
+
+def maaser_ledger(db: Session, user_id: int, maaser_pct: Optional[float], start_month: str,
+                  end_month: str) -> Dict[str, Any]:
+    """Per-month income, obligation, paid and running balance over an inclusive YYYY-MM range.
+
+    The balance carries over from all earlier months (`opening_balance`);
+    positive means Maaser still owed, negative means given ahead. This is the
+    one definition of the Maaser figures; the annual bundle reads it too.
+    """
+    pct = DEFAULT_PCT if maaser_pct is None else float(maaser_pct)
+    found = {m: (float(i or 0.0), float(p or 0.0), float(n or 0.0))
+             for m, i, p, n in monthly_rows(db, user_id, start_month, end_month)}
+    o_income, o_paid, _net = found.pop("", (0.0, 0.0, 0.0))
+    opening = o_income * pct - o_paid
+    balance = opening
+    months = []
+    totals = {"income": 0.0, "obligation": 0.0, "paid": 0.0}
+    for idx in range(month_index(start_month), month_index(end_month) + 1):
+        label = month_label(idx)
+        income, paid, net = found.get(label, (0.0, 0.0, 0.0))
+        obligation = income * pct
+        balance += obligation - paid
+        totals["income"] += income
+        totals["obligation"] += obligation
+        totals["paid"] += paid
+        months.append({
+            "month": label,
+            "income": round(income, 2),
+            "obligation": round(obligation, 2),
+            "paid": round(paid, 2),
+            "maaser_account": round(net, 2),
+            "balance": round(balance, 2),
+        })
+    return {
+        "from": start_month,
+        "to": end_month,
+        "maaser_pct": pct,
+        "opening_balance": round(opening, 2),
+        "months": months,
+        "totals": {k: round(v, 2) for k, v in totals.items()},
+        "closing_balance": round(balance, 2),
+    }
+
+
+def maaser_account_net(db: Session, user_id: int, month: str) -> float:
+    """Net flow on the Maaser account in one month, for the monthly summary."""
+    for m, _income, _paid, net in monthly_rows(db, user_id, month, month):
+        if m == month:
+            return float(net or 0.0)
+    return 0.0
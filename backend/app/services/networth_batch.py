@@ -0,0 +1,110 @@
+"""Account balances and net worth for many users at once (admin / nightly jobs).
+
+Users are taken in id order, `chunk` at a time. For each chunk, one grouped
+statement over accounts left-joined to transactions gives every account's
+balance, and one windowed statement over investment transactions gives every
+holding's quantity and latest price. Three statements per chunk, whatever
+the number of users or accounts. Figures follow `/api/reports/networth`:
+an account with no transactions is worth its opening balance, and investments
+count as assets at their last traded price. A [start_id, end_id) range
+lets several workers split the users between them (see `ranges`).
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from ..models.finance import Account, Investment, InvestmentTransaction, Transaction
+from ..models.user import User
+
+DEFAULT_CHUNK = 500
+MAX_CHUNK = 5000
+
+
+def ranges(db: Session, workers: int) -> List[Tuple[int, int]]:
+    """Split the user ids into `workers` contiguous [start_id, end_id) ranges of about the same size."""
+    bucket = func.ntile(workers).over(order_by=User.id).label("bucket")
+    numbered = select(User.id, bucket).subquery()
+    rows = db.execute(
+        select(func.min(numbered.c.id), func.max(numbered.c.id))
+        .group_by(numbered.c.bucket)
+        .order_by(numbered.c.bucket)
+    ).all()
+    return [(lo, hi + 1) for lo, hi in rows]
+
+
+def _balances(db: Session, lo: int, hi: int):
+    return db.execute(
+        select(Account.user_id, Account.id, Account.name, Account.type, Account.is_liability, Account.opening_balance,
+               func.count(Transaction.id), func.sum(Transaction.amount))
+        .outerjoin(Transaction, (Transaction.account_id == Account.id) & (Transaction.user_id == Account.user_id))
+        .where(Account.user_id >= lo, Account.user_id <= hi)
+        .group_by(Account.id)
+        .order_by(Account.user_id, Account.id)
+    ).all()
+
+
+def _holdings(db: Session, lo: int, hi: int):
+    it = InvestmentTransaction
+    signed = case((it.type == "buy", it.quantity), (it.type == "sell", -it.quantity), else_=0.0)
+    ranked = (
+        select(
+            it.user_id,
+            it.investment_id,
+            it.unit_price,
+            func.sum(signed).over(partition_by=it.investment_id).label("quantity"),
+            # newest priced trade first (networth keeps the last non-null price)
+            func.row_number().over(
+                partition_by=it.investment_id,
+                order_by=(it.unit_price.is_(None), it.date.desc(), it.id.desc()),
+            ).label("rn"),
+        )
+        .join(Investment, Investment.id == it.investment_id)
+        .where(it.user_id >= lo, it.user_id <= hi, Investment.user_id == it.user_id)
+        .subquery()
+    )
+    return db.execute(
+        select(ranked.c.user_id, ranked.c.quantity, ranked.c.unit_price).where(ranked.c.rn == 1)
+    ).all()
+
+
+def snapshots(db: Session, start_id: int = 0, end_id: Optional[int] = None,
+              chunk: int = DEFAULT_CHUNK) -> Iterator[Dict[str, Any]]:
+    """Yield one snapshot per user with start_id <= id < end_id, in id order."""
+    chunk = max(1, min(chunk, MAX_CHUNK))
+    last = start_id - 1
+    while True:
+        q = select(User.id).where(User.id > last)
+        if end_id is not None:
+            q = q.where(User.id < end_id)
+        ids = db.execute(q.order_by(User.id).limit(chunk)).scalars().all()
+        if not ids:
+            return
+        lo, hi = ids[0], ids[-1]
+        accounts: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for user_id, account_id, name, type_, is_liability, opening, count, total in _balances(db, lo, hi):
+            balance = float(total or 0.0) if count else float(opening or 0.0)
+            accounts[user_id].append({
+                "id": account_id,
+                "name": name,
+                "type": getattr(type_, "value", type_),
+                "is_liability": bool(is_liability),
+                "balance": round(balance, 2),
+            })
+        invested: Dict[int, float] = defaultdict(float)
+        for user_id, quantity, price in _holdings(db, lo, hi):
+            invested[user_id] += float(quantity or 0.0) * float(price or 0.0)
+        for user_id in ids:
+            rows = accounts.get(user_id, [])
+            liabilities = sum(a["balance"] for a in rows if a["is_liability"])
+            assets = sum(a["balance"] for a in rows if not a["is_liability"]) + invested.get(user_id, 0.0)
+            yield {
+                "user_id": user_id,
+                "assets": round(assets, 2),
+                "liabilities": round(liabilities, 2),
+                "net_worth": round(assets - liabilities, 2),
+                "investments": round(invested.get(user_id, 0.0), 2),
+                "accounts": rows,
+            }
+        last = hi
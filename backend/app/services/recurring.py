@@ -0,0 +1,260 @@
+"""Recurring transaction detection.
+
+Transactions are grouped by account, normalized note, direction and a
+log-scale amount band. Each group keeps running stats and its most recent
+dates/amounts in `recurring_series`, so a scan only reads transactions with ids
+above the user's `recurring_scanned_id` watermark and re-evaluates the groups
+they touched. Edits and deletions of already-scanned transactions are picked
+up by a full rescan (`scan(..., full=True)`).
+
+Only `scan` writes. Read paths use `current_series`, which folds transactions
+added since the last scan into copies of the stored groups in memory, so a
+GET never takes the database's write lock.
+
+Run for every user as a batch job with `python -m backend.app.services.recurring`.
+"""
+import math
+import re
+import statistics
+from bisect import insort
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.finance import RecurringSeries, Transaction
+from ..models.user import User
+
+# (name, nominal interval in days, allowed deviation in days, minimum occurrences)
+CADENCES = (
+    ("weekly", 7.0, 1.0, 3),
+    ("biweekly", 14.0, 2.0, 3),
+    ("monthly", 30.44, 4.0, 3),
+    ("annual", 365.25, 15.0, 2),
+)
+REGULARITY = 0.75  # share of intervals that must fit the cadence
+RECENT = 12  # dates/amounts kept per group
+BAND_BASE = 1.25  # amounts within ~25% share a band (neighbouring bands are merged)
+
+_NOISE = re.compile(r"[\d\W_]+", re.UNICODE)
+_MAASER_SUFFIX = " (after maaser)"  # appended to income by the Maaser split
+
+GroupKey = Tuple[int, str, int, int]
+
+
+def normalize_note(note: Optional[str]) -> str:
+    """Lowercase, drop digits (dates, reference numbers) and punctuation: 'NETFLIX.COM 03/14 #8812' -> 'netflix com'."""
+    text = (note or "").lower().replace(_MAASER_SUFFIX, " ")
+    return " ".join(_NOISE.sub(" ", text).split())[:80]
+
+
+def amount_band(amount: float) -> int:
+    return int(math.floor(math.log(abs(amount)) / math.log(BAND_BASE)))
+
+
+def detect(dates: List[date]) -> Tuple[Optional[str], Optional[float]]:
+    """(cadence, mean interval in days) if the dates are periodic, else (None, None)."""
+    if len(dates) < 2:
+        return None, None
+    intervals = [(b - a).days for a, b in zip(dates, dates[1:]) if b != a]
+    if not intervals:
+        return None, None
+    median = statistics.median(intervals)
+    for name, days, tolerance, minimum in CADENCES:
+        if abs(median - days) > tolerance or len(dates) < minimum:
+            continue
+        fitting = [i for i in intervals if abs(i - days) <= tolerance]
+        if len(fitting) / len(intervals) >= REGULARITY:
+            return name, sum(fitting) / len(fitting)
+    return None, None
+
+
+def next_occurrence(last: date, cadence: str) -> date:
+    if cadence == "weekly":
+        return last + timedelta(days=7)
+    if cadence == "biweekly":
+        return last + timedelta(days=14)
+    if cadence == "monthly":
+        y, m = (last.year + 1, 1) if last.month == 12 else (last.year, last.month + 1)
+        return date(y, m, min(last.day, monthrange(y, m)[1]))
+    y = last.year + 1
+    return date(y, last.month, min(last.day, monthrange(y, last.month)[1]))
+
+
+def is_active(series: RecurringSeries, today: Optional[date] = None) -> bool:
+    """False once more than half an interval has passed since the expected next date."""
+    if series.next_date is None:
+        return False
+    grace = max(3.0, (series.interval_days or 0.0) / 2)
+    return (today or date.today()) <= series.next_date + timedelta(days=grace)
+
+
+def _parse(series: RecurringSeries) -> Tuple[List[date], List[float]]:
+    dates = [date.fromisoformat(d) for d in (series.recent_dates or "").split(",") if d]
+    amounts = [float(a) for a in (series.recent_amounts or "").split(",") if a]
+    return dates, amounts
+
+
+def _evaluate(series: RecurringSeries, dates: List[date], amounts: List[float]) -> None:
+    series.recent_dates = ",".join(d.isoformat() for d in dates)
+    series.recent_amounts = ",".join(f"{a:.2f}" for a in amounts)
+    cadence, interval = detect(dates)
+    series.cadence = cadence
+    series.interval_days = round(interval, 2) if interval else None
+    if cadence:
+        series.next_date = next_occurrence(series.last_date, cadence)
+        series.next_amount = round(statistics.median(amounts), 2)
+    else:
+        series.next_date = None
+        series.next_amount = None
+
+
+def _copy(series: RecurringSeries) -> RecurringSeries:
+    """A transient copy the session will never flush."""
+    return RecurringSeries(**{c.key: getattr(series, c.key) for c in RecurringSeries.__mapper__.column_attrs})
+
+
+def _fold(db: Session, user: User, full: bool, persist: bool) -> Tuple[List[RecurringSeries], int, int]:
+    """Feed transactions above the watermark into the user's groups and re-detect the touched ones.
+
+    Returns (groups, transactions scanned, last id scanned). With `persist`
+    new groups are added to the session and stored ones updated in place;
+    otherwise everything happens on transient copies.
+    """
+    user_id = user.id
+    watermark = 0 if full else (user.recurring_scanned_id or 0)
+    if full:
+        if persist:
+            db.query(RecurringSeries).filter(RecurringSeries.user_id == user_id).delete(synchronize_session=False)
+        stored: List[RecurringSeries] = []
+    else:
+        stored = db.query(RecurringSeries).filter(RecurringSeries.user_id == user_id).all()
+        if not persist:
+            stored = [_copy(s) for s in stored]
+    groups: Dict[GroupKey, RecurringSeries] = {(s.account_id, s.key, s.direction, s.amount_band): s for s in stored}
+
+    rows = (
+        db.query(Transaction.id, Transaction.account_id, Transaction.category_id, Transaction.date, Transaction.amount, Transaction.note)
+        .filter(Transaction.user_id == user_id, Transaction.id > watermark, Transaction.is_transfer == False)
+        .order_by(Transaction.id)
+        .yield_per(5000)
+    )
+    touched: Dict[int, Tuple[RecurringSeries, List[date], List[float]]] = {}
+    scanned = 0
+    last_id = watermark
+    for tx_id, account_id, category_id, tx_date, amount, note in rows:
+        scanned += 1
+        last_id = tx_id
+        key = normalize_note(note)
+        if not key or not amount or abs(amount) < 0.01:
+            continue
+        direction = 1 if amount > 0 else -1
+        band = amount_band(amount)
+        series = None
+        for b in (band, band - 1, band + 1):
+            series = groups.get((account_id, key, direction, b))
+            if series is not None:
+                break
+        if series is None:
+            series = RecurringSeries(
+                user_id=user_id, account_id=account_id, key=key, direction=direction, amount_band=band,
+                occurrences=0, first_date=tx_date, last_date=tx_date,
+            )
+            if persist:
+                db.add(series)
+            groups[(account_id, key, direction, band)] = series
+        entry = touched.get(id(series))
+        if entry is None:
+            entry = touched[id(series)] = (series, *_parse(series))
+        _, dates, amounts = entry
+        series.occurrences = (series.occurrences or 0) + 1
+        series.first_date = min(series.first_date, tx_date)
+        if tx_date >= series.last_date:
+            series.last_date = tx_date
+            series.note = note
+            if category_id:
+                series.category_id = category_id
+        pos = len([d for d in dates if d <= tx_date])
+        dates.insert(pos, tx_date)
+        amounts.insert(pos, float(amount))
+        del dates[:-RECENT], amounts[:-RECENT]
+
+    for series, dates, amounts in touched.values():
+        _evaluate(series, dates, amounts)
+    return list(groups.values()), scanned, last_id
+
+
+def _unscanned(db: Session, user: User) -> bool:
+    watermark = user.recurring_scanned_id or 0
+    return db.query(Transaction.id).filter(Transaction.user_id == user.id, Transaction.id > watermark).first() is not None
+
+
+def scan(db: Session, user_id: int, full: bool = False) -> int:
+    """Fold new transactions into the stored groups and move the watermark.
+
+    Returns the number of transactions scanned. Commits.
+    """
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        return 0
+    if not full and not _unscanned(db, user):
+        return 0
+    _groups, scanned, last_id = _fold(db, user, full, persist=True)
+    user.recurring_scanned_id = last_id
+    db.commit()
+    return scanned
+
+
+def current_series(db: Session, user_id: int) -> List[RecurringSeries]:
+    """The user's groups with a cadence, including transactions not scanned yet; writes nothing.
+
+    Groups first seen since the last scan are transient and have no id.
+    """
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        return []
+    if _unscanned(db, user):
+        groups, _scanned, _last = _fold(db, user, full=False, persist=False)
+    else:
+        groups = db.query(RecurringSeries).filter(RecurringSeries.user_id == user_id, RecurringSeries.cadence.isnot(None)).all()
+    return [g for g in groups if g.cadence]
+
+
+def list_series(db: Session, user_id: int, include_inactive: bool = False) -> List[dict]:
+    today = date.today()
+    out = []
+    for s in sorted(current_series(db, user_id), key=lambda s: (s.next_date, s.id is None, s.id or 0)):
+        active = is_active(s, today)
+        if not active and not include_inactive:
+            continue
+        out.append({
+            "id": s.id,
+            "account_id": s.account_id,
+            "category_id": s.category_id,
+            "note": s.note,
+            "cadence": s.cadence,
+            "interval_days": s.interval_days,
+            "occurrences": s.occurrences,
+            "first_date": s.first_date,
+            "last_date": s.last_date,
+            "next_date": s.next_date,
+            "next_amount": s.next_amount,
+            "active": active,
+        })
+    return out
+
+
+def scan_all_users(db: Session, full: bool = False) -> int:
+    total = 0
+    for (user_id,) in db.query(User.id).order_by(User.id).all():
+        total += scan(db, user_id, full=full)
+    return total
+
+
+if __name__ == "__main__":
+    import sys
+    from ..core.db import SessionLocal
+
+    with SessionLocal() as session:
+        print(f"scanned {scan_all_users(session, full='--full' in sys.argv)} transactions")
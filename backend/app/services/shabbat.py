@@ -1,25 +1,76 @@
-from datetime import datetime, timedelta
-import math
-
-# Simple astronomical approximation for sunset; for MVP use a rough heuristic.
-# In production, integrate with a proper zmanim or Hebcal API.
-
-def approximate_sunset(lat: float, lon: float, dt: datetime) -> datetime:
-    # Very rough: assume sunset at 18:30 local; this is placeholder logic
-    local = dt
-    return local.replace(hour=18, minute=30, second=0, microsecond=0)
-
-
-def is_shabbat_now(user) -> bool:
-    now = datetime.now()
-    # Friday sunset to Saturday nightfall (sunset + ~40m)
-    sunset_fri = approximate_sunset(user.lat or 31.778, user.lon or 35.235, now)
-    start = sunset_fri.replace(hour=18, minute=30)  # approximate
-    end = start + timedelta(hours=25)  # ends around 19:30 Sat
-    # If today is Friday after 16:00 treat as near-sunset start; if Saturday until ~20:00
-    weekday = now.weekday()  # Mon=0 ... Sun=6
-    if weekday == 4 and now >= start:
-        return True
-    if weekday == 5 and now <= end:
-        return True
-    return False
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from ..core.config import settings
+from . import zmanim
+from .hebrew_calendar import yom_tov_days
+
+ISRAEL_ZONES = {"Asia/Jerusalem", "Asia/Tel_Aviv"}
+
+# (starts, ends) as sorted UTC epoch seconds; starts[i] pairs with ends[i]
+WindowTable = Tuple[Tuple[float, ...], Tuple[float, ...]]
+
+
+def _restricted_days(year: int, israel: bool) -> List[date]:
+    # pad into the neighbouring years so windows crossing Jan 1 are covered
+    first = date(year - 1, 12, 24)
+    last = date(year + 1, 1, 7)
+    days = set()
+    d = first + timedelta(days=(5 - first.weekday()) % 7)  # first Saturday
+    while d <= last:
+        days.add(d)
+        d += timedelta(days=7)
+    for y in (year - 1, year, year + 1):
+        days.update(x for x in yom_tov_days(y, israel) if first <= x <= last)
+    return sorted(days)
+
+
+def _merge(windows: Iterable[Tuple[float, float]]) -> WindowTable:
+    starts: List[float] = []
+    ends: List[float] = []
+    for s, e in sorted(windows):
+        if ends and s <= ends[-1]:
+            ends[-1] = max(ends[-1], e)
+        else:
+            starts.append(s)
+            ends.append(e)
+    return tuple(starts), tuple(ends)
+
+
+@lru_cache(maxsize=1024)
+def window_table(year: int, lat: float, lon: float, tz: str, israel: bool) -> WindowTable:
+    """All Shabbat / Yom Tov windows touching `year` for a location, merged and sorted.
+
+    Each restricted day runs from candle lighting on the previous evening to
+    nightfall; back-to-back days (Shabbat next to Yom Tov, two-day festivals)
+    collapse into one window.
+    """
+    zone = zmanim.get_zone(tz)
+    windows = []
+    for d in _restricted_days(year, israel):
+        start = zmanim.candle_lighting(d - timedelta(days=1), lat, lon, zone)
+        end = zmanim.day_end(d, lat, lon, zone)
+        windows.append((start.timestamp(), end.timestamp()))
+    return _merge(windows)
+
+
+def _location(user) -> Tuple[float, float, str]:
+    lat = user.lat if user.lat is not None else settings.DEFAULT_LAT
+    lon = user.lon if user.lon is not None else settings.DEFAULT_LON
+    # ~1km grid so neighbours share a table; sunset moves well under a minute
+    return round(float(lat), 2), round(float(lon), 2), (user.tz or settings.DEFAULT_TZ)
+
+
+def is_shabbat_now(user, now: Optional[datetime] = None) -> bool:
+    """Whether `now` (default: current time) falls inside a Shabbat or Yom Tov window for the user's location."""
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    lat, lon, tz = _location(user)
+    year = now.astimezone(zmanim.get_zone(tz)).year
+    starts, ends = window_table(year, lat, lon, tz, tz in ISRAEL_ZONES)
+    ts = now.timestamp()
+    i = bisect_right(starts, ts) - 1
+    return i >= 0 and ts < ends[i]
@@ -0,0 +1,161 @@
+"""Incremental parsers for bank statement exports (CSV and OFX/QFX).
+
+Both readers consume a binary file object a line or block at a time and yield
+`StatementRow`s without converting anything, so a multi-year export is never
+held in memory and a malformed row only fails when the importer validates it.
+"""
+import codecs
+import csv
+import html
+import io
+import re
+from datetime import date, datetime
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional
+
+READ_SIZE = 64 * 1024
+
+# header aliases, lower-cased; the first one present wins
+DATE_COLUMNS = ("date", "posted date", "posting date", "transaction date", "trans. date")
+AMOUNT_COLUMNS = ("amount", "amt", "transaction amount")
+DEBIT_COLUMNS = ("debit", "withdrawal", "withdrawals", "money out")
+CREDIT_COLUMNS = ("credit", "deposit", "deposits", "money in")
+NOTE_COLUMNS = ("description", "payee", "name", "memo", "note", "details")
+CATEGORY_COLUMNS = ("category",)
+
+# tried in order when no explicit date format is given
+DATE_FORMATS = ("%Y-%m-%d", "%Y%m%d", "%m/%d/%Y", "%Y/%m/%d")
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+_OFX_FIELDS = {"DTPOSTED", "TRNAMT", "NAME", "MEMO", "FITID", "PAYEE"}
+
+
+class StatementRow(NamedTuple):
+    line: int  # 1-based line (CSV) or transaction number (OFX), for error messages
+    date: str
+    amount: str
+    note: str
+    category: Optional[str] = None
+
+
+def detect_format(filename: Optional[str], head: bytes) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ofx", ".qfx")):
+        return "ofx"
+    if name.endswith(".csv"):
+        return "csv"
+    sniff = head.lstrip().upper()
+    return "ofx" if sniff.startswith((b"OFXHEADER", b"<?XML", b"<OFX")) else "csv"
+
+
+def parse_date(value: str, fmt: Optional[str] = None) -> date:
+    value = value.strip()
+    if fmt:
+        return datetime.strptime(value, fmt).date()
+    for candidate in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, candidate).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date {value!r}")
+
+
+def parse_amount(value: str) -> float:
+    v = value.strip().replace(",", "").replace("$", "")
+    if v.startswith("(") and v.endswith(")"):  # accounting negatives
+        v = "-" + v[1:-1]
+    if not v:
+        raise ValueError("Missing amount")
+    try:
+        return float(v)
+    except ValueError:
+        raise ValueError(f"Invalid amount {value.strip()!r}") from None
+
+
+def _column(index: Dict[str, int], names) -> Optional[int]:
+    for n in names:
+        if n in index:
+            return index[n]
+    return None
+
+
+def iter_csv(raw: BinaryIO, encoding: str = "utf-8-sig") -> Iterator[StatementRow]:
+    """Rows of a headed CSV export. Debit/credit column pairs are folded into one signed amount."""
+    text = io.TextIOWrapper(raw, encoding=encoding, errors="replace", newline="")
+    reader = csv.reader(text)
+    try:
+        header = next(reader, None)
+        if header is None:
+            return
+        index = {h.strip().lower(): i for i, h in enumerate(header)}
+        date_col = _column(index, DATE_COLUMNS)
+        amount_col = _column(index, AMOUNT_COLUMNS)
+        debit_col = _column(index, DEBIT_COLUMNS)
+        credit_col = _column(index, CREDIT_COLUMNS)
+        note_col = _column(index, NOTE_COLUMNS)
+        category_col = _column(index, CATEGORY_COLUMNS)
+        if date_col is None or (amount_col is None and debit_col is None and credit_col is None):
+            raise ValueError("CSV header needs a date column and an amount (or debit/credit) column")
+
+        def cell(values: List[str], col: Optional[int]) -> str:
+            return values[col] if col is not None and col < len(values) else ""
+
+        for values in reader:
+            if not any(v.strip() for v in values):
+                continue
+            if amount_col is not None:
+                amount = cell(values, amount_col)
+            else:
+                debit, credit = cell(values, debit_col).strip(), cell(values, credit_col).strip()
+                amount = f"-{debit.lstrip('-')}" if debit else credit
+            category = cell(values, category_col).strip() or None
+            yield StatementRow(reader.line_num, cell(values, date_col), amount, cell(values, note_col).strip(), category)
+    except csv.Error as e:  # not a ValueError: oversized fields, stray NULs and the like
+        raise ValueError(f"Malformed CSV at line {reader.line_num}: {e}") from None
+    finally:
+        text.detach()  # leave the upload open for the caller
+
+
+def iter_ofx(raw: BinaryIO) -> Iterator[StatementRow]:
+    """STMTTRN records of an OFX 1.x (SGML) or 2.x (XML) / QFX file.
+
+    SGML leaf elements have no closing tags and may share a line, so the file
+    is tokenised as `<TAG>text` pairs over fixed-size reads rather than lines.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    current: Optional[Dict[str, str]] = None
+    count = 0
+    while True:
+        chunk = raw.read(READ_SIZE)
+        buf += decoder.decode(chunk, final=not chunk)
+        if chunk:
+            # hold back an unfinished tag, or text that may continue into the next read
+            cut = buf.rfind("<")
+        else:
+            cut = len(buf)
+        for m in _OFX_TAG.finditer(buf, 0, cut):
+            closing, tag, text = m.group(1), m.group(2).upper(), m.group(3).strip()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    count += 1
+                    note = current.get("NAME") or current.get("PAYEE") or ""
+                    memo = current.get("MEMO", "")
+                    if memo and memo != note:
+                        note = f"{note} {memo}".strip()
+                    yield StatementRow(count, current.get("DTPOSTED", "")[:8], current.get("TRNAMT", ""), note)
+                    current = None
+                elif not closing:
+                    current = {}
+            elif current is not None and not closing and tag in _OFX_FIELDS:
+                current[tag] = html.unescape(text)
+        buf = buf[cut:]
+        if not chunk:
+            return
+
+
+def iter_rows(raw: BinaryIO, fmt: str) -> Iterator[StatementRow]:
+    if fmt == "ofx":
+        return iter_ofx(raw)
+    if fmt == "csv":
+        return iter_csv(raw)
+    raise ValueError(f"Unsupported format {fmt!r}")
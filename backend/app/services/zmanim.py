@@ -0,0 +1,98 @@
+"""Offline solar times (zmanim) using the NOAA / Almanac for Computers sunrise equation.
+
+Accurate to roughly a minute between the polar circles, which is plenty for
+deciding when Shabbat and Yom Tov begin and end.
+"""
+import math
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ..core.config import settings
+
+# Zenith angles in degrees
+ZENITH_SUNSET = 90.833  # refraction + solar disc radius
+ZENITH_NIGHTFALL = 98.5  # tzeit hakochavim, sun 8.5 degrees below the horizon
+
+CANDLE_LIGHTING_MINUTES = 18
+
+
+def get_zone(tz: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz or settings.DEFAULT_TZ)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(settings.DEFAULT_TZ)
+
+
+def _sun_event_utc_hours(d: date, lat: float, lon: float, zenith: float, rising: bool) -> Optional[float]:
+    """UTC hour of the event on day `d`, or None if the sun never crosses `zenith` that day."""
+    rad = math.radians
+    deg = math.degrees
+    n = d.timetuple().tm_yday
+    lng_hour = lon / 15.0
+    t = n + ((6.0 if rising else 18.0) - lng_hour) / 24.0
+    # Sun's mean anomaly and true longitude
+    m = 0.9856 * t - 3.289
+    l = (m + 1.916 * math.sin(rad(m)) + 0.020 * math.sin(rad(2 * m)) + 282.634) % 360.0
+    # Right ascension, moved into the same quadrant as L
+    ra = deg(math.atan(0.91764 * math.tan(rad(l)))) % 360.0
+    ra += (math.floor(l / 90.0) * 90.0) - (math.floor(ra / 90.0) * 90.0)
+    ra /= 15.0
+    # Declination and local hour angle
+    sin_dec = 0.39782 * math.sin(rad(l))
+    cos_dec = math.cos(math.asin(sin_dec))
+    cos_h = (math.cos(rad(zenith)) - sin_dec * math.sin(rad(lat))) / (cos_dec * math.cos(rad(lat)))
+    if cos_h > 1.0 or cos_h < -1.0:
+        return None
+    h = deg(math.acos(cos_h))
+    if rising:
+        h = 360.0 - h
+    h /= 15.0
+    local_mean = h + ra - 0.06571 * t - 6.622
+    return (local_mean - lng_hour) % 24.0
+
+
+def _sun_event(d: date, lat: float, lon: float, zone: ZoneInfo, zenith: float, rising: bool) -> Optional[datetime]:
+    hours = _sun_event_utc_hours(d, lat, lon, zenith, rising)
+    if hours is None:
+        return None
+    event = datetime.combine(d, time(0), tzinfo=timezone.utc) + timedelta(hours=hours)
+    local = event.astimezone(zone)
+    # the UT hour is only known mod 24; pull the event back onto the requested local day
+    if local.date() > d:
+        local -= timedelta(days=1)
+    elif local.date() < d:
+        local += timedelta(days=1)
+    return local
+
+
+def sunrise(d: date, lat: float, lon: float, zone: ZoneInfo) -> Optional[datetime]:
+    return _sun_event(d, lat, lon, zone, ZENITH_SUNSET, rising=True)
+
+
+def sunset(d: date, lat: float, lon: float, zone: ZoneInfo) -> Optional[datetime]:
+    return _sun_event(d, lat, lon, zone, ZENITH_SUNSET, rising=False)
+
+
+def nightfall(d: date, lat: float, lon: float, zone: ZoneInfo) -> Optional[datetime]:
+    return _sun_event(d, lat, lon, zone, ZENITH_NIGHTFALL, rising=False)
+
+
+def candle_lighting(d: date, lat: float, lon: float, zone: ZoneInfo) -> datetime:
+    """Start of a restricted day that begins the evening of `d`."""
+    ss = sunset(d, lat, lon, zone)
+    if ss is None:
+        # midnight sun / polar night: fall back to a fixed local evening
+        ss = datetime.combine(d, time(18, 0), tzinfo=zone)
+    return ss - timedelta(minutes=CANDLE_LIGHTING_MINUTES)
+
+
+def day_end(d: date, lat: float, lon: float, zone: ZoneInfo) -> datetime:
+    """Nightfall ending a restricted day `d`; falls back to sunset + 72 minutes at high latitudes."""
+    nf = nightfall(d, lat, lon, zone)
+    if nf is not None:
+        return nf
+    ss = sunset(d, lat, lon, zone)
+    if ss is None:
+        ss = datetime.combine(d, time(18, 0), tzinfo=zone)
+    return ss + timedelta(minutes=72)
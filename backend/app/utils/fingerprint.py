@@ -0,0 +1,17 @@
+"""Stable identity of a bank transaction, used to recognise re-imported rows."""
+import hashlib
+import re
+from datetime import date
+
+_SPACE = re.compile(r"\s+")
+_PUNCT = re.compile(r"[^\w\s]", re.UNICODE)
+
+
+def normalize_note(note) -> str:
+    """Case, punctuation and spacing differences between exports of the same row are ignored; digits are kept."""
+    return _SPACE.sub(" ", _PUNCT.sub(" ", (note or "").lower())).strip()
+
+
+def fingerprint(account_id: int, tx_date: date, amount: float, note) -> str:
+    raw = f"{account_id}|{tx_date.isoformat()}|{float(amount):.2f}|{normalize_note(note)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:32]
@@ -0,0 +1,35 @@
+"""Parsing of network settings; dependency-free so `core.config` can validate them at boot."""
+from typing import List, Optional, Tuple
+
+
+def parse_nameservers(value: str) -> Tuple[List[str], Optional[int]]:
+    """'1.1.1.1:5353, [::1]:5353, ::1, ns.example' -> (hosts, port or None).
+
+    IPv6 addresses take a port only in brackets. dnspython uses one port for
+    every nameserver, so differing ports raise ValueError.
+    """
+    hosts: List[str] = []
+    ports = set()
+    for item in (s.strip() for s in value.split(',')):
+        if not item:
+            continue
+        port = None
+        if item.startswith('['):
+            host, sep, rest = item[1:].partition(']')
+            if not sep or (rest and not rest.startswith(':')):
+                raise ValueError(f"Invalid nameserver {item!r}")
+            port = rest[1:] or None
+        elif item.count(':') == 1:
+            host, port = item.split(':')
+        else:
+            host = item  # a name, IPv4 address or bare IPv6 address
+        if not host:
+            raise ValueError(f"Invalid nameserver {item!r}")
+        if port is not None:
+            if not port.isdigit() or not 0 < int(port) < 65536:
+                raise ValueError(f"Invalid nameserver port in {item!r}")
+            ports.add(int(port))
+        hosts.append(host)
+    if len(ports) > 1:
+        raise ValueError("EMAIL_DNS_NAMESERVERS must use a single port for every nameserver")
+    return hosts, ports.pop() if ports else None
@@ -0,0 +1,18 @@
+"""Small dialect shims for report queries that group by calendar periods."""
+import re
+
+from sqlalchemy import func
+
+_MONTH = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+def is_month(value: str) -> bool:
+    """True for a 'YYYY-MM' month label, the format `month_key` produces."""
+    return bool(_MONTH.match(value))
+
+
+def month_key(db, column):
+    """SQL expression rendering a DATE column as 'YYYY-MM' on the session's database."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
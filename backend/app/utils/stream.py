@@ -0,0 +1,25 @@
+"""Helpers for building archives while they are being sent."""
+from typing import List
+
+
+class ByteSink:
+    """Write-only, non-seekable sink collecting bytes until `drain()`.
+
+    Handing one to `zipfile.ZipFile(..., "w")` makes zipfile stream entries
+    with data descriptors, so an archive can be yielded piece by piece.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
@@ -0,0 +1 @@
+# Reproducible in-process API benchmarks; see bench/run.py
@@ -0,0 +1,142 @@
+"""Synthetic data generator writing straight into the app database with bulk inserts."""
+import random
+from dataclasses import dataclass, asdict
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+
+@dataclass
+class DataConfig:
+    users: int = 1
+    accounts: int = 6
+    transactions: int = 5000  # per user
+    rules: int = 20
+    budget_months: int = 12
+    investments: int = 8
+    investment_txns: int = 40  # per investment
+    days: int = 730  # history span
+    seed: int = 1234
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+MERCHANTS = [
+    "Shufersal", "Rami Levy", "Osher Ad", "Egged", "Rav Kav", "Paz", "Delek", "Super-Pharm",
+    "IKEA", "Amazon", "Netflix", "Spotify", "Bezeq", "Partner", "Electric Co", "Arnona",
+    "Cafe Hillel", "Aroma", "Yochananof", "Kupat Cholim", "Tuition", "Rent", "Gym", "Books",
+]
+
+EXTRA_CATEGORIES = ["Groceries", "Utilities", "Dining", "Health", "Education", "Entertainment", "Shopping", "Salary"]
+
+
+def _bulk(db: Session, model, rows: List[dict]) -> None:
+    if rows:
+        db.execute(insert(model), rows)
+
+
+def generate(engine, config: DataConfig) -> List[int]:
+    """Create `config.users` users with their data. Returns the new user ids."""
+    from ..app.models.user import User
+    from ..app.models.finance import (
+        Account, AccountType, Category, CategoryType, Transaction, Budget, BudgetItem,
+        Investment, InvestmentTransaction, CategoryRule,
+    )
+    from ..app.services.bootstrap import seed_default_categories
+
+    rng = random.Random(config.seed)
+    today = date.today()
+    with Session(bind=engine) as db:
+        base = db.query(User).count()
+        users = [
+            User(
+                email=f"bench{base + n}@example.com",
+                username=f"bench{base + n}",
+                hashed_password="x",
+                full_name=f"Bench User {base + n}",
+                shabbat_mode=False,
+            )
+            for n in range(config.users)
+        ]
+        db.add_all(users)
+        db.flush()
+        user_ids = [u.id for u in users]
+        seed_default_categories(db, user_ids)
+
+        for u in users:
+            _bulk(db, Category, [
+                {"user_id": u.id, "name": name, "type": CategoryType.INCOME if name == "Salary" else CategoryType.EXPENSE, "is_builtin": False, "icon": ""}
+                for name in EXTRA_CATEGORIES
+            ])
+            cats = db.query(Category.id, Category.type).filter(Category.user_id == u.id).all()
+            income_cats = [c.id for c in cats if c.type == CategoryType.INCOME]
+            expense_cats = [c.id for c in cats if c.type == CategoryType.EXPENSE]
+
+            types = [AccountType.CASH, AccountType.SAVINGS, AccountType.CREDIT_CARD, AccountType.LOAN, AccountType.INVESTMENT]
+            _bulk(db, Account, [
+                {
+                    "user_id": u.id,
+                    "name": f"Account {i}",
+                    "type": types[i % len(types)],
+                    "opening_balance": round(rng.uniform(0, 20000), 2),
+                    "is_liability": types[i % len(types)] in (AccountType.CREDIT_CARD, AccountType.LOAN),
+                    "apr_annual": 0.18 if types[i % len(types)] in (AccountType.CREDIT_CARD, AccountType.LOAN) else None,
+                    "min_payment": 50.0 if types[i % len(types)] in (AccountType.CREDIT_CARD, AccountType.LOAN) else None,
+                    "due_day": 1 + i % 28,
+                }
+                for i in range(config.accounts)
+            ] + [{"user_id": u.id, "name": "Maaser", "type": AccountType.SAVINGS, "opening_balance": 0.0, "is_liability": False}])
+            account_ids = [a.id for a in db.query(Account.id).filter(Account.user_id == u.id).all()]
+
+            tx_rows = []
+            for _ in range(config.transactions):
+                is_income = rng.random() < 0.08
+                tx_rows.append({
+                    "user_id": u.id,
+                    "account_id": rng.choice(account_ids),
+                    "category_id": rng.choice(income_cats if is_income else expense_cats) if rng.random() < 0.9 else None,
+                    "date": today - timedelta(days=rng.randrange(config.days)),
+                    "amount": round(rng.uniform(1000, 9000), 2) if is_income else -round(rng.expovariate(1 / 120.0), 2),
+                    "note": f"{rng.choice(MERCHANTS)} #{rng.randrange(1000)}",
+                    "is_transfer": False,
+                })
+            _bulk(db, Transaction, tx_rows)
+
+            _bulk(db, CategoryRule, [
+                {"user_id": u.id, "pattern": MERCHANTS[i % len(MERCHANTS)].lower(), "category_id": rng.choice(expense_cats), "case_sensitive": False}
+                for i in range(config.rules)
+            ])
+
+            for m in range(config.budget_months):
+                y, mo = today.year, today.month - m
+                while mo <= 0:
+                    mo += 12
+                    y -= 1
+                b = Budget(user_id=u.id, month=f"{y:04d}-{mo:02d}")
+                db.add(b)
+                db.flush()
+                _bulk(db, BudgetItem, [
+                    {"budget_id": b.id, "category_id": cid, "limit": round(rng.uniform(100, 2000), 2),
+                     "item_type": "flex" if i % 3 == 0 else "fixed", "tolerance_pct": 0.15, "window_months": 3}
+                    for i, cid in enumerate(expense_cats)
+                ])
+
+            for i in range(config.investments):
+                inv = Investment(user_id=u.id, symbol=f"SYM{i}", name=f"Fund {i}")
+                db.add(inv)
+                db.flush()
+                _bulk(db, InvestmentTransaction, [
+                    {
+                        "user_id": u.id, "investment_id": inv.id, "account_id": account_ids[0],
+                        "date": today - timedelta(days=rng.randrange(config.days)),
+                        "type": "buy" if k % 4 else "sell",
+                        "quantity": q, "unit_price": p, "total_cost": round(q * p, 2),
+                    }
+                    for k in range(config.investment_txns)
+                    for q, p in [(float(rng.randint(1, 20)), round(rng.uniform(10, 500), 2))]
+                ])
+        db.commit()
+    return user_ids
@@ -0,0 +1,189 @@
+"""In-process API benchmarks over synthetic data.
+
+Usage (from the repo root):
+    python -m backend.bench.run --transactions 20000 --out bench.json
+    python -m backend.bench.run --compare bench.json   # fail on p95 regressions
+
+The app is driven through Starlette's TestClient (no network), against a
+dedicated SQLite file so the dev database is never touched.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+from .datagen import DataConfig
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _scenarios(client, headers: Dict[str, str]) -> Dict[str, Callable[[int], object]]:
+    today = date.today()
+    accounts = client.get('/api/accounts/', headers=headers).json()
+    cats = client.get('/api/categories/', headers=headers).json()
+    expense = next(c['id'] for c in cats if c['type'] == 'expense')
+    debts = [
+        {"id": a['id'], "name": a['name'], "balance": abs(a['balance']) or 1000.0, "apr_annual": 0.18, "min_payment": 50.0}
+        for a in accounts if a['is_liability']
+    ] or [{"id": 1, "name": "Card", "balance": 5000.0, "apr_annual": 0.2, "min_payment": 100.0}]
+
+    def import_rows(i: int):
+        rows = [
+            {"account_id": accounts[0]['id'], "date": today.isoformat(), "amount": 10.0 + k, "note": f"bench import {i}-{k}",
+             "category_id": expense if k % 2 else None}
+            for k in range(100)
+        ]
+        return client.post('/api/transactions/import', json={"rows": rows}, headers=headers)
+
+    return {
+        "list_accounts": lambda i: client.get('/api/accounts/', headers=headers),
+        "networth": lambda i: client.get('/api/reports/networth', headers=headers),
+        "monthly_summary": lambda i: client.get('/api/reports/monthly', params={"year": today.year, "month": today.month}, headers=headers),
+        "import_transactions": import_rows,
+        "holdings": lambda i: client.get('/api/investments/holdings', headers=headers),
+        "forecast": lambda i: client.get('/api/reports/forecast', params={"days": 365}, headers=headers),
+        "search_notes": lambda i: client.get('/api/transactions/search', params={"q": "shuf"}, headers=headers),
+        "debt_plan": lambda i: client.post('/api/debt/plan', json={"strategy": "avalanche", "monthly_budget": 1500, "debts": debts}, headers=headers),
+    }
+
+
+def run_scenarios(client, headers: Dict[str, str], iterations: int = 30, warmup: int = 3,
+                  only: Optional[List[str]] = None) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    for name, call in _scenarios(client, headers).items():
+        if only and name not in only:
+            continue
+        for i in range(warmup):
+            call(-1 - i)
+        durations: List[float] = []
+        queries: List[int] = []
+        errors = 0
+        for i in range(iterations):
+            started = time.perf_counter()
+            resp = call(i)
+            durations.append((time.perf_counter() - started) * 1000.0)
+            queries.append(int(resp.headers.get('X-DB-Queries', 0)))
+            if resp.status_code >= 400:
+                errors += 1
+        durations.sort()
+        results[name] = {
+            "n": iterations,
+            "p50_ms": round(percentile(durations, 0.50), 3),
+            "p95_ms": round(percentile(durations, 0.95), 3),
+            "mean_ms": round(sum(durations) / len(durations), 3),
+            "queries_per_request": round(sum(queries) / len(queries), 2),
+            "errors": errors,
+        }
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float = 1.25) -> List[str]:
+    """Human-readable regressions where p95 grew by more than `threshold`x or queries per request went up."""
+    problems = []
+    old_boot = (baseline.get("startup") or {}).get("migrated_db")
+    new_boot = (current.get("startup") or {}).get("migrated_db")
+    if old_boot and new_boot and old_boot["startup_ms"] > 0 and new_boot["startup_ms"] / old_boot["startup_ms"] > threshold:
+        problems.append(f"startup: {old_boot['startup_ms']:.1f}ms -> {new_boot['startup_ms']:.1f}ms")
+    for name, cur in current.get("results", {}).items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            continue
+        if old["p95_ms"] > 0 and cur["p95_ms"] / old["p95_ms"] > threshold:
+            problems.append(f"{name}: p95 {old['p95_ms']:.1f}ms -> {cur['p95_ms']:.1f}ms")
+        if cur["queries_per_request"] > old["queries_per_request"]:
+            problems.append(f"{name}: queries/request {old['queries_per_request']} -> {cur['queries_per_request']}")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = DataConfig()
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'malka_bench.db'))
+    p.add_argument('--reuse-db', action='store_true', help='keep existing data instead of regenerating')
+    for field, value in defaults.as_dict().items():
+        p.add_argument(f"--{field.replace('_', '-')}", type=int, default=value)
+    p.add_argument('--iterations', type=int, default=30)
+    p.add_argument('--warmup', type=int, default=3)
+    p.add_argument('--only', nargs='*', help='scenario names to run')
+    p.add_argument('--out', help='write results JSON here')
+    p.add_argument('--compare', help='baseline results JSON; exit 1 on regressions')
+    p.add_argument('--threshold', type=float, default=1.25)
+    p.add_argument('--startup-runs', type=int, default=3, help='cold-start samples (0 to skip)')
+    args = p.parse_args(argv)
+
+    if not args.reuse_db and os.path.exists(args.db):
+        os.remove(args.db)
+    # must be set before the app (and its engine) is imported
+    os.environ['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{args.db}"
+    from fastapi.testclient import TestClient
+    from ..app.main import app
+    from ..app.core.db import engine
+    from ..app.utils.security import create_access_token
+    from .datagen import generate
+
+    config = DataConfig(**{f: getattr(args, f) for f in defaults.as_dict()})
+    with TestClient(app, base_url="http://localhost") as client:
+        gen_started = time.perf_counter()
+        user_ids = generate(engine, config) if not args.reuse_db else [1]
+        gen_seconds = time.perf_counter() - gen_started
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_ids[0])})}"}
+        results = run_scenarios(client, headers, args.iterations, args.warmup, args.only)
+
+    startup = None
+    if args.startup_runs > 0:
+        from .startup import measure_cold_start
+        startup = measure_cold_start(args.startup_runs)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "data": config.as_dict(),
+            "datagen_seconds": round(gen_seconds, 3),
+            "iterations": args.iterations,
+        },
+        "results": results,
+        "startup": startup,
+    }
+    print(f"{'scenario':<22}{'p50 ms':>10}{'p95 ms':>10}{'queries':>10}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<22}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['queries_per_request']:>10.1f}{r['errors']:>8}")
+    if startup:
+        for case, r in startup.items():
+            print(f"cold start ({case}): import {r['import_ms']:.0f}ms, startup {r['startup_ms']:.0f}ms")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            problems = compare(json.load(f), report, args.threshold)
+        for line in problems:
+            print("REGRESSION", line)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Cold-start measurements: each run is a fresh interpreter importing the app and running its startup hooks."""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Optional dependencies that only specific endpoints need (PDF export, 2FA/QR,
+# email DNS checks, address lookup). Importing the app must not load them.
+LAZY_MODULES = ("reportlab", "qrcode", "PIL", "pyotp", "dns.resolver", "dns.asyncresolver", "httpx", "requests", "cryptography.fernet")
+
+# Cumulative `-X importtime` budget for `backend.app.main`, in milliseconds
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "3000"))
+
+_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+from backend.app.main import app
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(app)
+t2 = time.perf_counter()
+with client:
+    t3 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "startup_ms": (t3 - t2) * 1000}))
+"""
+
+
+def _boot_once(db_path: str) -> Dict[str, float]:
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path}")
+    out = subprocess.check_output([sys.executable, "-c", _SNIPPET], cwd=ROOT, env=env, text=True)
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _summarize(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    return {
+        key: round(statistics.median(s[key] for s in samples), 2)
+        for key in ("import_ms", "startup_ms")
+    }
+
+
+def measure_cold_start(runs: int = 3) -> Dict[str, Dict[str, float]]:
+    """Median import and startup time on an empty database (all migrations run)
+    and on an up-to-date one (the steady-state boot on every deploy/reload)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        fresh = []
+        for i in range(runs):
+            fresh.append(_boot_once(os.path.join(tmp, f"fresh{i}.db")))
+        migrated_db = os.path.join(tmp, "fresh0.db")
+        migrated = [_boot_once(migrated_db) for _ in range(runs)]
+    return {"fresh_db": _summarize(fresh), "migrated_db": _summarize(migrated)}
+
+
+def import_profile(module: str = "backend.app.main") -> Dict[str, Tuple[float, float]]:
+    """Run `python -X importtime -c "import <module>"` in a fresh interpreter.
+
+    Returns {module name: (self_ms, cumulative_ms)} for everything it imported.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    profile: Dict[str, Tuple[float, float]] = {}
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # the header line
+        profile[parts[2].strip()] = (int(parts[0]) / 1000, int(parts[1]) / 1000)
+    return profile
+
+
+def import_report(module: str = "backend.app.main", top: int = 15) -> Dict[str, object]:
+    profile = import_profile(module)
+    return {
+        "total_ms": round(profile[module][1], 2),
+        "budget_ms": IMPORT_BUDGET_MS,
+        "lazy_modules_loaded": [m for m in LAZY_MODULES if m in profile],
+        "top_self_ms": [
+            (name, round(self_ms, 2))
+            for name, (self_ms, _) in sorted(profile.items(), key=lambda kv: -kv[1][0])[:top]
+        ],
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps({"imports": import_report(), **measure_cold_start()}, indent=2))
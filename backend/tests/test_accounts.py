@@ -0,0 +1,107 @@
+import sys, os
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.models.finance import Account, AccountType, Transaction
+from backend.app.models.user import User
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides = {}
+
+
+@pytest.fixture()
+def data():
+    with Session(bind=engine) as sess:
+        u = User(email='ledger@example.com', hashed_password='x', shabbat_mode=False)
+        sess.add(u)
+        sess.flush()
+        a = Account(user_id=u.id, name='Checking', type=AccountType.CASH)
+        b = Account(user_id=u.id, name='Card', type=AccountType.CREDIT_CARD)
+        sess.add_all([a, b])
+        sess.flush()
+        # 25 rows over 10 days, several per day, inserted out of order so ids do not follow dates
+        start = date(2026, 3, 1)
+        sess.add_all([
+            Transaction(user_id=u.id, account_id=a.id, date=start + timedelta(days=(k * 7) % 10), amount=float(k + 1), note=f'n{k}')
+            for k in range(25)
+        ])
+        sess.add(Transaction(user_id=u.id, account_id=b.id, date=start, amount=-999.0, note='other account'))
+        sess.commit()
+        sess.refresh(u)
+        sess.expunge(u)
+        ids = {'user': u, 'checking': a.id, 'card': b.id}
+    from backend.app.services.deps import get_current_user
+    app.dependency_overrides[get_current_user] = lambda: ids['user']
+    return ids
+
+
+def _walk(client, account_id, order, limit):
+    items, cursor = [], None
+    while True:
+        params = {'limit': limit, 'order': order}
+        if cursor:
+            params['cursor'] = cursor
+        resp = client.get(f'/api/accounts/{account_id}/ledger', params=params)
+        assert resp.status_code == 200, resp.text
+        assert resp.headers['X-DB-Queries'] == '3'
+        page = resp.json()
+        items += page['items']
+        cursor = page['next_cursor']
+        if not cursor:
+            return items, page
+
+
+def test_ledger_running_balance_across_pages(data):
+    client = TestClient(app, base_url="http://localhost")
+    asc, page = _walk(client, data['checking'], 'asc', 7)
+    assert len(asc) == 25 and page['balance'] == sum(range(1, 26))
+    keys = [(r['date'], r['id']) for r in asc]
+    assert keys == sorted(keys)
+    running = 0.0
+    for r in asc:
+        running += r['amount']
+        assert r['balance'] == running
+    desc, _page = _walk(client, data['checking'], 'desc', 4)
+    assert desc == list(reversed(asc))
+    assert client.get(f"/api/accounts/{data['checking']}/ledger", params={'cursor': 'nope'}).status_code == 400
+    assert client.get('/api/accounts/999/ledger').status_code == 404
+
+
+def test_reconcile_marks_a_range_in_one_statement(data):
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.post(f"/api/accounts/{data['checking']}/reconcile",
+                       json={'end': '2026-03-05', 'statement_balance': 200.0})
+    assert resp.status_code == 200, resp.text
+    out = resp.json()
+    with Session(bind=engine) as sess:
+        expected = [t for t in sess.query(Transaction).filter_by(account_id=data['checking']) if t.date <= date(2026, 3, 5)]
+        assert sess.query(Transaction).filter_by(account_id=data['card'], cleared=True).count() == 0
+    assert out['updated'] == len(expected)
+    assert out['cleared_balance'] == sum(t.amount for t in expected)
+    assert out['difference'] == round(200.0 - out['cleared_balance'], 2)
+    assert resp.headers['X-DB-Queries'] == '3'
+    # the same range again changes nothing; un-clearing a day takes only that day's rows
+    again = client.post(f"/api/accounts/{data['checking']}/reconcile", json={'end': '2026-03-05'}).json()
+    assert again['updated'] == 0
+    undo = client.post(f"/api/accounts/{data['checking']}/reconcile",
+                       json={'start': '2026-03-05', 'end': '2026-03-05', 'cleared': False}).json()
+    assert undo['updated'] == sum(1 for t in expected if t.date == date(2026, 3, 5))
+    ledger = client.get(f"/api/accounts/{data['checking']}/ledger", params={'limit': 500}).json()
+    assert ledger['cleared_balance'] == undo['cleared_balance']
+    assert all(r['cleared'] == (r['date'] < '2026-03-05') for r in ledger['items'])
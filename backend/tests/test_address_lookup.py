@@ -0,0 +1,105 @@
+import sys, os
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.config import settings
+from backend.app.services import geocode
+
+ROW = {
+    'display_name': '1 Jaffa Road, Jerusalem, Israel',
+    'address': {'house_number': '1', 'road': 'Jaffa Road', 'city': 'Jerusalem', 'postcode': '9414101', 'country': 'Israel'},
+}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        time.sleep(0.05)  # keep the request in flight long enough for callers to pile up
+        body = json.dumps([ROW]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    old_url = settings.ADDRESS_LOOKUP_URL
+    settings.ADDRESS_LOOKUP_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    _StubHandler.hits = 0
+    geocode.clear_cache()
+    yield _StubHandler
+    settings.ADDRESS_LOOKUP_URL = old_url
+    geocode.clear_cache()
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrent_identical_queries_are_coalesced(stub_server):
+    async def run():
+        try:
+            return await asyncio.gather(*[geocode.search('1 Jaffa Road', limit=5) for _ in range(8)])
+        finally:
+            await geocode.close_client()
+
+    results = asyncio.run(run())
+    assert stub_server.hits == 1
+    assert all(r == results[0] for r in results)
+    assert results[0][0]['city'] == 'Jerusalem'
+
+
+def test_endpoints_share_cache(stub_server):
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.get('/api/utils/address_lookup', params={'q': '1 Jaffa Road'})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data['found'] is True
+    assert data['address_line1'] == '1 Jaffa Road'
+    assert 'label' not in data
+    # whitespace/case variations of the same query hit the cache
+    resp = client.get('/api/utils/address_lookup', params={'q': '1  jaffa road '})
+    assert resp.json()['found'] is True
+    assert stub_server.hits == 1
+    resp = client.get('/api/utils/address_suggest', params={'q': '1 Jaffa Road', 'limit': 3})
+    assert resp.json()['items'][0]['label'] == ROW['display_name']
+    assert stub_server.hits == 2
+
+
+def test_upstream_failure_is_not_cached(stub_server):
+    settings.ADDRESS_LOOKUP_URL = 'http://127.0.0.1:9'
+    client = TestClient(app, base_url="http://localhost")
+    assert client.get('/api/utils/address_suggest', params={'q': 'nowhere'}).json() == {'items': []}
+    assert len(geocode._cache) == 0
+
+
+def test_replaced_client_is_closed(monkeypatch):
+    async def run():
+        monkeypatch.setattr(settings, 'ADDRESS_LOOKUP_URL', 'http://127.0.0.1:1')
+        first = geocode._get_client()
+        monkeypatch.setattr(settings, 'ADDRESS_LOOKUP_URL', 'http://127.0.0.1:2')
+        second = geocode._get_client()
+        await asyncio.gather(*geocode._closing)
+        await geocode.close_client()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is not second and first.is_closed and second.is_closed
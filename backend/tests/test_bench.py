@@ -0,0 +1,45 @@
+import sys, os
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.utils.security import create_access_token
+from backend.bench.datagen import DataConfig, generate
+from backend.bench.run import run_scenarios, compare
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    app.dependency_overrides = {}
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_benchmark_smoke():
+    config = DataConfig(users=2, accounts=4, transactions=200, rules=3, budget_months=2, investments=2, investment_txns=5)
+    user_ids = generate(engine, config)
+    assert len(user_ids) == 2
+    client = TestClient(app, base_url="http://localhost")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_ids[0])})}"}
+    results = run_scenarios(client, headers, iterations=2, warmup=0)
+    assert set(results) == {"list_accounts", "networth", "monthly_summary", "import_transactions", "holdings", "forecast", "search_notes", "debt_plan"}
+    for name, r in results.items():
+        assert r["errors"] == 0, name
+        assert r["p95_ms"] >= r["p50_ms"] >= 0
+        assert r["queries_per_request"] >= 1
+
+
+def test_compare_flags_regressions():
+    base = {"results": {"networth": {"p95_ms": 10.0, "queries_per_request": 5}}}
+    cur = {"results": {"networth": {"p95_ms": 20.0, "queries_per_request": 50}}}
+    assert len(compare(base, cur)) == 2
+    assert compare(base, base) == []
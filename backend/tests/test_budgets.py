@@ -0,0 +1,106 @@
+import sys, os
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.models.finance import Category, CategoryType
+from backend.app.models.user import User
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides = {}
+
+
+@pytest.fixture()
+def setup():
+    with Session(bind=engine) as sess:
+        u = User(email='budget@example.com', hashed_password='x', shabbat_mode=False)
+        other = User(email='other@example.com', hashed_password='x')
+        sess.add_all([u, other])
+        sess.flush()
+        cats = [Category(user_id=u.id, name=n, type=CategoryType.EXPENSE) for n in ('Food', 'Rent', 'Fun')]
+        foreign = Category(user_id=other.id, name='Theirs', type=CategoryType.EXPENSE)
+        sess.add_all(cats + [foreign])
+        sess.commit()
+        sess.refresh(u)
+        sess.expunge(u)
+        ids = [c.id for c in cats]
+        foreign_id = foreign.id
+    from backend.app.services.deps import get_current_user
+    app.dependency_overrides = {get_current_user: lambda: u}
+    return ids, foreign_id
+
+
+def test_create_checks_categories_in_one_query(setup):
+    cat_ids, foreign_id = setup
+    client = TestClient(app, base_url="http://localhost")
+    items = [{'category_id': c, 'limit': 100.0} for c in cat_ids]
+    resp = client.post('/api/budgets/', json={'month': '2026-01', 'items': items})
+    assert resp.status_code == 200, resp.text
+    assert len(resp.json()['items']) == 3
+    # category check, month check, budget insert, id lookup, item insert, reload budget + items
+    assert int(resp.headers['X-DB-Queries']) == 7
+    assert client.post('/api/budgets/', json={'month': '2026-01', 'items': []}).status_code == 409
+    resp = client.post('/api/budgets/', json={'month': '2026-02', 'items': items + [{'category_id': foreign_id, 'limit': 5}]})
+    assert resp.status_code == 404
+
+
+def test_bulk_create_a_year(setup):
+    cat_ids, _ = setup
+    client = TestClient(app, base_url="http://localhost")
+    payload = [
+        {'month': f'2026-{m:02d}', 'items': [{'category_id': c, 'limit': 50.0 * m} for c in cat_ids]}
+        for m in range(1, 13)
+    ]
+    resp = client.post('/api/budgets/bulk', json=payload)
+    assert resp.status_code == 200, resp.text
+    assert [b['month'] for b in resp.json()] == [f'2026-{m:02d}' for m in range(1, 13)]
+    assert int(resp.headers['X-DB-Queries']) == 7
+
+
+def test_copy_forward_skips_existing_months(setup):
+    cat_ids, _ = setup
+    client = TestClient(app, base_url="http://localhost")
+    src = client.post('/api/budgets/', json={'month': '2026-11', 'items': [
+        {'category_id': cat_ids[0], 'limit': 300.0, 'item_type': 'flex', 'tolerance_pct': 0.2, 'window_months': 6},
+        {'category_id': cat_ids[1], 'limit': 1500.0},
+    ]}).json()
+    client.post('/api/budgets/', json={'month': '2027-01', 'items': []})
+    resp = client.post(f"/api/budgets/{src['id']}/copy", params={'months': 4})
+    assert resp.status_code == 200, resp.text
+    copies = resp.json()
+    assert [b['month'] for b in copies] == ['2026-12', '2027-02', '2027-03']
+    assert copies[0]['items'][0]['item_type'] == 'flex'
+    assert copies[0]['items'][0]['window_months'] == 6
+    assert {i['limit'] for i in copies[-1]['items']} == {300.0, 1500.0}
+    assert client.post('/api/budgets/99999/copy').status_code == 404
+
+
+def test_listing_filters_by_month_in_two_queries(setup):
+    cat_ids, _ = setup
+    client = TestClient(app, base_url="http://localhost")
+    payload = [
+        {'month': f'{y}-{m:02d}', 'items': [{'category_id': c, 'limit': 10.0} for c in cat_ids]}
+        for y in (2024, 2025, 2026) for m in range(1, 13)
+    ]
+    assert client.post('/api/budgets/bulk', json=payload).status_code == 200
+    resp = client.get('/api/budgets/')
+    assert len(resp.json()) == 36
+    assert all(len(b['items']) == 3 for b in resp.json())
+    assert resp.headers['X-DB-Queries'] == '2'
+    resp = client.get('/api/budgets/', params={'from': '2025-03', 'to': '2025-05'})
+    assert [b['month'] for b in resp.json()] == ['2025-03', '2025-04', '2025-05']
+    assert client.get('/api/budgets/', params={'from': '2025'}).status_code == 400
@@ -0,0 +1,77 @@
+import sys, os
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.config import settings
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import DEFAULT_CATEGORIES, migrate_sqlite, seed_default_categories
+from backend.app.models.finance import Category
+from backend.app.models.user import User
+from backend.app.utils.security import create_access_token
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture(autouse=True)
+def create_db(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    monkeypatch.setattr(settings, 'EMAIL_DNS_CHECK', False)
+    app.dependency_overrides = {}
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def _auth(user_id):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+def test_registration_seeds_defaults_and_listing_is_one_query():
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.post('/api/auth/register', json={
+        'email': 'new@example.com', 'username': 'newbie', 'password': 'secret123', 'full_name': 'New User',
+        'dob': '1990-01-01', 'phone': '555-0100', 'base_currency': 'USD', 'address_line1': '1 Main St',
+        'city': 'Springfield', 'state': 'IL', 'postal_code': '62701', 'country': 'US',
+    })
+    assert resp.status_code == 200, resp.text
+    user_id = resp.json()['id']
+    resp = client.get('/api/categories/', headers=_auth(user_id))
+    assert resp.status_code == 200
+    assert {c['name'] for c in resp.json()} == {name for name, *_ in DEFAULT_CATEGORIES}
+    # one query to load the user, one to list categories
+    assert resp.headers['X-DB-Queries'] == '2'
+
+
+def test_legacy_user_seeded_once_and_deletions_stick():
+    with Session(bind=engine) as sess:
+        u = User(email='old@example.com', hashed_password='x')
+        sess.add(u)
+        sess.commit()
+        user_id = u.id
+    client = TestClient(app, base_url="http://localhost")
+    cats = client.get('/api/categories/', headers=_auth(user_id)).json()
+    assert len(cats) == len(DEFAULT_CATEGORIES)
+    food = next(c for c in cats if c['name'] == 'Food')
+    assert client.delete(f"/api/categories/{food['id']}", headers=_auth(user_id)).status_code == 200
+    names = {c['name'] for c in client.get('/api/categories/', headers=_auth(user_id)).json()}
+    assert 'Food' not in names
+
+
+def test_bulk_seed_is_batched():
+    with Session(bind=engine) as sess:
+        users = [User(email=f'u{i}@example.com', hashed_password='x') for i in range(5)]
+        sess.add_all(users)
+        sess.flush()
+        ids = [u.id for u in users]
+        sess.add(Category(user_id=ids[0], name='Income', type=DEFAULT_CATEGORIES[0][1], is_builtin=True))
+        sess.flush()
+        created = seed_default_categories(sess, ids)
+        sess.commit()
+        assert created == 5 * len(DEFAULT_CATEGORIES) - 1
+        assert sess.query(User).filter(User.categories_seeded == True).count() == 5
+        assert seed_default_categories(sess, ids) == 0
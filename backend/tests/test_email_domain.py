@@ -0,0 +1,108 @@
+import sys, os
+import socket
+import asyncio
+import threading
+import pytest
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+from backend.app.core.config import settings
+from backend.app.services import email_domain
+
+ZONE = {
+    ('mail.test.', 'MX'): '10 mx.mail.test.',
+    ('web.test.', 'A'): '192.0.2.1',
+}
+
+
+class StubDNS:
+    """Minimal UDP DNS server answering from ZONE; everything else is NXDOMAIN."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.port = self.sock.getsockname()[1]
+        self.queries = []
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                wire, addr = self.sock.recvfrom(4096)
+            except OSError:
+                return
+            query = dns.message.from_wire(wire)
+            q = query.question[0]
+            name, rdtype = q.name.to_text(), dns.rdatatype.to_text(q.rdtype)
+            self.queries.append((name, rdtype))
+            resp = dns.message.make_response(query)
+            if (name, rdtype) in ZONE:
+                resp.answer.append(dns.rrset.from_text(name, 60, 'IN', rdtype, ZONE[(name, rdtype)]))
+            elif not any(n == name for n, _ in ZONE):
+                resp.set_rcode(dns.rcode.NXDOMAIN)
+            self.sock.sendto(resp.to_wire(), addr)
+
+    def close(self):
+        self.sock.close()
+
+
+@pytest.fixture()
+def stub_dns():
+    server = StubDNS()
+    old = settings.EMAIL_DNS_NAMESERVERS
+    settings.EMAIL_DNS_NAMESERVERS = f"127.0.0.1:{server.port}"
+    email_domain.clear_cache()
+    yield server
+    settings.EMAIL_DNS_NAMESERVERS = old
+    email_domain.clear_cache()
+    server.close()
+
+
+def test_mx_and_address_fallback(stub_dns):
+    assert asyncio.run(email_domain.domain_accepts_mail('mail.test')) is True
+    assert asyncio.run(email_domain.domain_accepts_mail('web.test')) is True
+    assert ('web.test.', 'A') in stub_dns.queries
+
+
+def test_results_are_cached(stub_dns):
+    async def run():
+        return await asyncio.gather(*[email_domain.domain_accepts_mail('MAIL.test') for _ in range(5)])
+
+    assert all(asyncio.run(run()))
+    assert asyncio.run(email_domain.domain_accepts_mail('mail.test')) is True
+    assert asyncio.run(email_domain.domain_accepts_mail('nope.test')) is False
+    assert asyncio.run(email_domain.domain_accepts_mail('nope.test')) is False
+    assert stub_dns.queries == [('mail.test.', 'MX'), ('nope.test.', 'MX')]
+
+
+def test_timeout_is_not_cached(stub_dns, monkeypatch):
+    monkeypatch.setattr(settings, 'EMAIL_DNS_NAMESERVERS', '127.0.0.1:9')
+    monkeypatch.setattr(settings, 'EMAIL_DNS_TIMEOUT', 0.2)
+    assert asyncio.run(email_domain.domain_accepts_mail('mail.test')) is False
+    assert len(email_domain._cache) == 0
+
+
+def test_nameserver_parsing():
+    parse = email_domain.parse_nameservers
+    assert parse('') == ([], None)
+    assert parse('::1, 2001:db8::53') == (['::1', '2001:db8::53'], None)
+    assert parse('[::1]:5353, 127.0.0.1:5353') == (['::1', '127.0.0.1'], 5353)
+    assert parse('[2001:db8::53], ns.example') == (['2001:db8::53', 'ns.example'], None)
+    for bad in ('127.0.0.1:53, 10.0.0.1:5353', '[::1', '[::1]5353', 'ns.example:http', ':53'):
+        with pytest.raises(ValueError):
+            parse(bad)
+
+
+def test_bad_nameserver_setting_fails_at_boot():
+    from pydantic import ValidationError
+    from backend.app.core.config import Settings
+    with pytest.raises(ValidationError, match='single port'):
+        Settings(EMAIL_DNS_NAMESERVERS='127.0.0.1:53, 10.0.0.1:5353')
+    assert Settings(EMAIL_DNS_NAMESERVERS='[::1]:5353').EMAIL_DNS_NAMESERVERS == '[::1]:5353'
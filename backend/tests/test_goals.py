@@ -0,0 +1,144 @@
+import sys, os
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.services import goals as goal_service
+from backend.app.models.finance import Account, AccountType, Category, CategoryType, GoalLink, Transaction
+from backend.app.models.user import User
+from sqlalchemy.orm import Session
+from datetime import date
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    goal_service.clear_cache()
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides = {}
+
+
+def _months_ago(k):
+    t = date.today()
+    i = t.year * 12 + t.month - 1 - k
+    return date(i // 12, i % 12 + 1, 1)
+
+
+@pytest.fixture()
+def data():
+    with Session(bind=engine) as sess:
+        u = User(email='goals@example.com', hashed_password='x', shabbat_mode=False)
+        sess.add(u)
+        sess.flush()
+        savings = Account(user_id=u.id, name='Wedding fund', type=AccountType.SAVINGS)
+        checking = Account(user_id=u.id, name='Checking', type=AccountType.CASH)
+        tz = Category(user_id=u.id, name='Tzedakah', type=CategoryType.EXPENSE)
+        sess.add_all([savings, checking, tz])
+        sess.flush()
+        rows = []
+        # 200/month into savings for the last 6 months, one 100 withdrawal; 50/month given
+        for k in range(1, 7):
+            rows.append(Transaction(user_id=u.id, account_id=savings.id, date=_months_ago(k), amount=200.0, note='save'))
+            rows.append(Transaction(user_id=u.id, account_id=checking.id, category_id=tz.id, date=_months_ago(k), amount=-50.0, note='give'))
+        rows.append(Transaction(user_id=u.id, account_id=savings.id, date=_months_ago(5), amount=-100.0, note='withdraw'))
+        # tagged Tzedakah but inside the linked account: counted once, as an account flow
+        rows.append(Transaction(user_id=u.id, account_id=savings.id, category_id=tz.id, date=_months_ago(1), amount=-10.0, note='both'))
+        sess.add_all(rows)
+        sess.commit()
+        sess.refresh(u)
+        sess.expunge(u)
+        ids = {'user': u, 'savings': savings.id, 'checking': checking.id, 'tz': tz.id}
+    from backend.app.services.deps import get_current_user
+    app.dependency_overrides[get_current_user] = lambda: ids['user']
+    return ids
+
+
+def test_linked_goals_progress_projection_and_cache(data):
+    client = TestClient(app, base_url="http://localhost")
+    wedding = client.post('/api/goals/', json={'name': 'Wedding', 'type': 'wedding', 'target_amount': 5000,
+                                               'due_date': _months_ago(-120).isoformat()[:7], 'account_ids': [data['savings']]})
+    assert wedding.status_code == 200, wedding.text
+    w = wedding.json()
+    assert w['auto'] and w['current_amount'] == 1090.0 and w['account_ids'] == [data['savings']]
+    assert w['monthly_rate'] == round((200 * 3 - 10) / 3, 2)
+    assert w['projected_date'] > date.today().isoformat() and w['on_track'] is True
+    give = client.post('/api/goals/', json={'name': 'Give', 'type': 'tzedakah', 'target_amount': 250,
+                                            'category_ids': [data['tz']], 'account_ids': [data['savings']],
+                                            'start_date': _months_ago(3).isoformat()}).json()
+    # three months of giving from checking plus the savings account's flows since then
+    assert give['current_amount'] == 3 * 50 + 3 * 200 - 10 and give['on_track'] is True and give['projected_date'] is None
+    manual = client.post('/api/goals/', json={'name': 'Pesach', 'type': 'pesach', 'target_amount': 800, 'current_amount': 120}).json()
+    assert manual['auto'] is False and manual['current_amount'] == 120 and manual['monthly_rate'] is None
+
+    first = client.get('/api/goals/')
+    assert first.headers['X-DB-Queries'] == '3'
+    again = client.get('/api/goals/')
+    assert again.headers['X-DB-Queries'] == '2'  # data version unchanged: sums from the cache
+    assert again.json() == first.json()
+
+    # any transaction write bumps the data version
+    with Session(bind=engine) as sess:
+        sess.add(Transaction(user_id=data['user'].id, account_id=data['savings'], date=date.today(), amount=500.0, note='gift'))
+        sess.commit()
+    after = client.get('/api/goals/')
+    assert after.headers['X-DB-Queries'] == '3'
+    assert after.json()[0]['current_amount'] == 1590.0
+
+
+def test_update_and_delete_goal(data):
+    client = TestClient(app, base_url="http://localhost")
+    g = client.post('/api/goals/', json={'name': 'Trip', 'type': 'custom', 'target_amount': 1000, 'current_amount': 40}).json()
+    resp = client.patch(f"/api/goals/{g['id']}", json={'target_amount': 2000, 'category_ids': [data['tz']]})
+    assert resp.status_code == 200, resp.text
+    out = resp.json()
+    assert out['target_amount'] == 2000 and out['auto'] and out['category_ids'] == [data['tz']]
+    assert out['current_amount'] == 6 * 50 + 10
+    # replacing one kind of link keeps the other
+    out = client.patch(f"/api/goals/{g['id']}", json={'account_ids': [data['checking']]}).json()
+    assert out['category_ids'] == [data['tz']] and out['account_ids'] == [data['checking']]
+    out = client.patch(f"/api/goals/{g['id']}", json={'account_ids': [], 'category_ids': []}).json()
+    assert out['auto'] is False and out['current_amount'] == 40
+    assert client.patch(f"/api/goals/{g['id']}", json={'account_ids': [9999]}).status_code == 404
+    assert client.patch(f"/api/goals/{g['id']}", json={'type': 'nope'}).status_code == 400
+    assert client.delete(f"/api/goals/{g['id']}").json() == {'ok': True}
+    assert client.get('/api/goals/').json() == []
+    assert client.delete(f"/api/goals/{g['id']}").status_code == 404
+
+
+def test_deleting_a_linked_account_or_category_drops_its_links(data):
+    client = TestClient(app, base_url="http://localhost")
+    spare = client.post('/api/categories/', json={'name': 'Simcha', 'type': 'expense'}).json()
+    g = client.post('/api/goals/', json={'name': 'Simcha', 'type': 'custom', 'target_amount': 1000, 'current_amount': 40,
+                                         'account_ids': [data['savings']], 'category_ids': [spare['id']]}).json()
+    assert client.delete(f"/api/accounts/{data['savings']}").json() == {'ok': True}
+    out = client.get('/api/goals/').json()[0]
+    assert out['account_ids'] == [] and out['category_ids'] == [spare['id']]
+    assert client.delete(f"/api/categories/{spare['id']}").status_code == 200
+    out = client.get('/api/goals/').json()[0]
+    assert out['auto'] is False and out['current_amount'] == 40
+    # a link left dangling by older data is dropped on the next edit, not reported as missing
+    with Session(bind=engine) as sess:
+        sess.add(GoalLink(goal_id=g['id'], account_id=9999))
+        sess.commit()
+    resp = client.patch(f"/api/goals/{g['id']}", json={'category_ids': [data['tz']]})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()['account_ids'] == [] and resp.json()['category_ids'] == [data['tz']]
+
+
+def test_far_off_projection_is_left_open(data):
+    client = TestClient(app, base_url="http://localhost")
+    client.post('/api/goals/', json={'name': 'Endowment', 'type': 'custom', 'target_amount': 5e8,
+                                     'due_date': '2040-01', 'account_ids': [data['savings']]})
+    resp = client.get('/api/goals/')
+    assert resp.status_code == 200, resp.text
+    out = resp.json()[0]
+    assert out['monthly_rate'] > 0 and out['projected_date'] is None and out['on_track'] is False
@@ -0,0 +1,60 @@
+import sys, os
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from datetime import date
+from backend.app.services import hebrew_calendar as hc
+from backend.app.services.jewish import get_holidays, get_holidays_range
+
+
+def _dates(year, israel=False):
+    return {h['name']: h['date'] for h in get_holidays(year, israel)['holidays']}
+
+
+def test_gregorian_round_trip():
+    for ordinal in range(date(1900, 1, 1).toordinal(), date(2100, 1, 1).toordinal(), 3):
+        d = date.fromordinal(ordinal)
+        assert hc.to_gregorian(*hc.from_gregorian(d)) == d
+
+
+def test_known_conversions():
+    assert hc.from_gregorian(date(2024, 10, 3)) == (5785, hc.TISHREI, 1)
+    assert hc.from_gregorian(date(2023, 9, 16)) == (5784, hc.TISHREI, 1)
+    assert hc.to_gregorian(5784, hc.ADAR_II, 14) == date(2024, 3, 24)
+    assert hc.is_leap_year(5784) and not hc.is_leap_year(5785)
+
+
+def test_holidays_2024_diaspora():
+    d = _dates(2024)
+    assert d['Purim'] == '2024-03-24'
+    assert d['Pesach I'] == '2024-04-23'
+    assert d['Pesach VIII'] == '2024-04-30'
+    assert d['Shavuot II'] == '2024-06-13'
+    assert d["Tish'a B'Av"] == '2024-08-13'
+    assert d['Rosh Hashana 5785'] == '2024-10-03'
+    assert d['Yom Kippur'] == '2024-10-12'
+    assert d['Chanukah: Day 1'] == '2024-12-26'
+    # 3 Tishrei 5785 was Shabbat, so the fast moved to Sunday
+    assert d['Tzom Gedaliah'] == '2024-10-06'
+
+
+def test_israel_schedule_differs():
+    d = _dates(2024, israel=True)
+    assert 'Pesach VIII' not in d
+    assert d['Shavuot'] == '2024-06-12'
+    assert d["Yom HaAtzma'ut"] == '2024-05-14'
+
+
+def test_rosh_chodesh_and_yom_tov_days():
+    names = [h['name'] for h in get_holidays(2025)['holidays'] if h['category'] == 'roshchodesh']
+    assert len(names) >= 18  # 12-13 months, roughly half with two days
+    assert date(2025, 4, 13) in hc.yom_tov_days(2025, False)  # Pesach I 5785
+    assert date(2025, 4, 14) not in hc.yom_tov_days(2025, True)
+
+
+def test_range_query_is_memoized():
+    first = get_holidays_range(2020, 2029)
+    assert len(first['holidays']) > 10 * 60
+    assert hc.holidays_for_year(2025, False) is hc.holidays_for_year(2025, False)
+    assert get_holidays_range(2020, 2029) == first
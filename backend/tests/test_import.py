@@ -0,0 +1,156 @@
+import sys, os
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.models.finance import Account, AccountType, Category, CategoryRule, CategoryType, Transaction
+from backend.app.models.user import User
+from sqlalchemy.orm import Session
+from datetime import date
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides = {}
+
+
+@pytest.fixture()
+def setup():
+    with Session(bind=engine) as sess:
+        u = User(email='import@example.com', hashed_password='x', shabbat_mode=False)
+        sess.add(u)
+        sess.flush()
+        a = Account(user_id=u.id, name='Checking', type=AccountType.CASH)
+        food = Category(user_id=u.id, name='Food', type=CategoryType.EXPENSE)
+        sess.add_all([a, food])
+        sess.commit()
+        sess.refresh(u)
+        sess.expunge(u)
+        ids = {'account': a.id, 'food': food.id}
+    from backend.app.services.deps import get_current_user
+    app.dependency_overrides = {get_current_user: lambda: u}
+    return ids
+
+
+def _rows(ids, n):
+    return [
+        {'account_id': ids['account'], 'date': f'2026-03-{1 + k % 28:02d}', 'amount': 10.0 + k, 'note': f'Shop {k}', 'category_id': ids['food']}
+        for k in range(n)
+    ]
+
+
+def test_reimport_is_idempotent(setup):
+    client = TestClient(app, base_url="http://localhost")
+    rows = _rows(setup, 500)
+    first = client.post('/api/transactions/import', json={'rows': rows})
+    assert first.json()['imported'] == 500 and first.json()['duplicates'] == []
+    # context load (4), one fingerprint lookup, one insert
+    assert int(first.headers['X-DB-Queries']) == 6
+    # an overlapping export: the old 500 rows plus 20 new ones, with cosmetic note changes
+    overlap = [dict(r, note=r['note'].upper() + '.') for r in rows] + _rows(setup, 520)[500:]
+    second = client.post('/api/transactions/import', json={'rows': overlap}).json()
+    assert second['imported'] == 20
+    assert len(second['duplicates']) == 500 and second['duplicates'][0]['index'] == 0
+    with Session(bind=engine) as sess:
+        assert sess.query(Transaction).count() == 520
+
+
+def test_identical_rows_in_one_file_and_flag_mode(setup):
+    client = TestClient(app, base_url="http://localhost")
+    coffee = {'account_id': setup['account'], 'date': '2026-03-05', 'amount': 4.5, 'note': 'Aroma', 'category_id': setup['food']}
+    assert client.post('/api/transactions/import', json={'rows': [coffee, coffee]}).json()['imported'] == 2
+    again = client.post('/api/transactions/import', json={'rows': [coffee, coffee, coffee]}).json()
+    assert again['imported'] == 1 and [d['index'] for d in again['duplicates']] == [0, 1]
+    flagged = client.post('/api/transactions/import', params={'duplicates': 'flag'}, json={'rows': [coffee]}).json()
+    assert flagged['imported'] == 1 and len(flagged['duplicates']) == 1
+
+
+def test_matches_transactions_entered_by_hand(setup):
+    client = TestClient(app, base_url="http://localhost")
+    created = client.post('/api/transactions/', json={
+        'account_id': setup['account'], 'category_id': setup['food'], 'date': '2026-03-07', 'amount': 42.0, 'note': 'Rami Levy',
+    })
+    assert created.status_code == 200
+    resp = client.post('/api/transactions/import', json={'rows': [
+        {'account_id': setup['account'], 'date': '2026-03-07', 'amount': 42.0, 'note': 'RAMI LEVY', 'category_id': setup['food']},
+        {'account_id': 99999, 'date': '2026-03-07', 'amount': 1.0, 'note': 'x'},
+    ]}).json()
+    assert resp['imported'] == 0 and len(resp['duplicates']) == 1
+    assert resp['errors'] == [{'index': 1, 'detail': 'Row 1: Account not found'}]
+
+
+def test_csv_file_import_in_chunks(setup):
+    client = TestClient(app, base_url="http://localhost")
+    lines = ['Date,Description,Debit,Credit,Category']
+    for k in range(25):
+        lines.append(f'03/{1 + k % 28:02d}/2026,"Shop, {k}",{10 + k}.00,,')
+    lines += ['03/30/2026,Salary,,5000.00,', '03/31/2026,Grocer,12.50,,Food', 'not a date,Broken,1.00,,']
+    body = ('\n'.join(lines) + '\n').encode()
+    files = {'file': ('export.csv', body, 'text/csv')}
+    resp = client.post('/api/transactions/import/file', files=files, data={'account_id': setup['account'], 'chunk_size': 10})
+    assert resp.status_code == 200
+    out = resp.json()
+    assert out['rows'] == 28 and out['imported'] == 27 and out['chunks'] == 3
+    assert out['error_count'] == 1 and out['errors'][0]['index'] == 29
+    with Session(bind=engine) as sess:
+        amounts = dict(sess.query(Transaction.note, Transaction.amount).all())
+        assert amounts['Shop, 0'] == -10.0 and amounts['Salary'] == 5000.0 and amounts['Grocer'] == -12.5
+    again = client.post('/api/transactions/import/file', files=files, data={'account_id': setup['account'], 'chunk_size': 7}).json()
+    assert again['imported'] == 0 and again['duplicate_count'] == 27
+
+
+def test_file_import_rules_match_debit_magnitudes(setup):
+    with Session(bind=engine) as sess:
+        uid = sess.query(User.id).scalar()
+        sess.add(CategoryRule(user_id=uid, pattern='coffee', category_id=setup['food'], min_amount=2, max_amount=10))
+        sess.commit()
+    client = TestClient(app, base_url="http://localhost")
+    body = b'Date,Description,Amount\n2026-03-01,Coffee shop,-4.50\n2026-03-02,Coffee beans,-40.00\n2026-03-03,Coffee,-1.00\n'
+    resp = client.post('/api/transactions/import/file', files={'file': ('x.csv', body)}, data={'account_id': setup['account']})
+    assert resp.status_code == 200 and resp.json()['imported'] == 3
+    with Session(bind=engine) as sess:
+        cats = dict(sess.query(Transaction.note, Transaction.category_id).all())
+    assert cats == {'Coffee shop': setup['food'], 'Coffee beans': None, 'Coffee': None}
+
+
+def test_ofx_file_import(setup):
+    client = TestClient(app, base_url="http://localhost")
+    # SGML style: leaf elements without closing tags, several per line
+    txns = ''.join(
+        f'<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>202604{1 + k:02d}120000[-5:EST]<TRNAMT>-{3 + k}.25'
+        f'<FITID>{k}<NAME>Caf&amp;e {k}<MEMO>card</STMTTRN>\n'
+        for k in range(5)
+    )
+    body = ('OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n'
+            + txns + '</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n').encode()
+    resp = client.post('/api/transactions/import/file', files={'file': ('bank.qfx', body)}, data={'account_id': setup['account']})
+    out = resp.json()
+    assert out['imported'] == 5 and out['error_count'] == 0
+    with Session(bind=engine) as sess:
+        first = sess.query(Transaction).order_by(Transaction.date).first()
+        assert first.note == 'Caf&e 0 card' and first.amount == -3.25 and first.date == date(2026, 4, 1)
+
+
+def test_file_import_rejects_unusable_input(setup):
+    client = TestClient(app, base_url="http://localhost")
+    bad = client.post('/api/transactions/import/file', files={'file': ('x.csv', b'when,what\n1,2\n')}, data={'account_id': setup['account']})
+    assert bad.status_code == 400
+    huge = b'date,amount,note\n2026-04-01,-1.00,ok\n2026-04-02,-2.00,"' + b'x' * 200000 + b'"\n'
+    malformed = client.post('/api/transactions/import/file', files={'file': ('x.csv', huge)}, data={'account_id': setup['account']})
+    assert malformed.status_code == 400 and 'line 3' in malformed.json()['detail']
+    partial = client.post('/api/transactions/import/file', files={'file': ('x.csv', huge)},
+                          data={'account_id': setup['account'], 'chunk_size': 1})
+    assert partial.status_code == 400 and '1 row before it already imported' in partial.json()['detail']
+    missing = client.post('/api/transactions/import/file', files={'file': ('x.csv', b'date,amount\n')}, data={'account_id': 99999})
+    assert missing.status_code == 404
@@ -0,0 +1,137 @@
+import sys, os, json
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.services import jobs
+from backend.app.models.finance import Account, AccountType, Category, CategoryType, Transaction
+from backend.app.models.jobs import Job
+from backend.app.models.user import User
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    yield
+    jobs.drain(timeout=30)
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides = {}
+
+
+def _login(email):
+    with Session(bind=engine) as sess:
+        u = User(email=email, hashed_password='x', shabbat_mode=False)
+        sess.add(u)
+        sess.flush()
+        a = Account(user_id=u.id, name='Checking', type=AccountType.CASH)
+        food = Category(user_id=u.id, name='Food', type=CategoryType.EXPENSE)
+        sess.add_all([a, food])
+        sess.commit()
+        sess.refresh(u)
+        sess.expunge(u)
+        ids = {'account': a.id, 'food': food.id}
+    from backend.app.services.deps import get_current_user
+    app.dependency_overrides = {get_current_user: lambda: u}
+    return ids
+
+
+def test_async_import_file_reports_progress_and_result():
+    ids = _login('jobs@example.com')
+    client = TestClient(app, base_url="http://localhost")
+    body = ('Date,Description,Amount\n' + ''.join(f'2026-02-{1 + k % 28:02d},Shop {k},-{k + 1}.00\n' for k in range(50))).encode()
+    resp = client.post('/api/transactions/import/file', params={'async': 'true'},
+                       files={'file': ('feb.csv', body)}, data={'account_id': ids['account'], 'chunk_size': 20})
+    assert resp.status_code == 200
+    job_id = resp.json()['job_id']
+    jobs.drain(timeout=30)
+    status = client.get(f'/api/jobs/{job_id}').json()
+    assert status['status'] == 'succeeded' and status['progress'] == 1.0
+    result = client.get(f'/api/jobs/{job_id}/result').json()
+    assert result['imported'] == 50 and result['chunks'] == 3
+    with Session(bind=engine) as sess:
+        assert sess.query(Transaction).count() == 50
+        spool = sess.get(Job, job_id).params
+    assert not os.path.exists(jobs.spooled(json.loads(spool)['spool']))
+
+
+def test_import_file_never_touches_paths_outside_the_spool(tmp_path):
+    ids = _login('spool@example.com')
+    client = TestClient(app, base_url="http://localhost")
+    victim = tmp_path / 'job-victim.csv'
+    victim.write_text('Date,Description,Amount\n2026-02-01,Secret,-1.00\n')
+    assert 'import_file' not in client.get('/api/jobs/kinds').json()
+    for spool in (str(victim), '../' + victim.name):
+        r = client.post('/api/jobs/', json={'kind': 'import_file', 'params': {'spool': spool, 'account_id': ids['account']}})
+        assert r.status_code == 400
+    # even a job stored with a foreign path neither reads nor deletes it
+    with Session(bind=engine) as sess:
+        uid = sess.query(User.id).scalar()
+        sess.add(Job(id='c' * 32, user_id=uid, kind='import_file', status='queued',
+                     params=json.dumps({'spool': str(victim), 'account_id': ids['account']})))
+        sess.commit()
+    assert jobs.start() == 1
+    jobs.drain(timeout=30)
+    status = client.get('/api/jobs/' + 'c' * 32).json()
+    assert status['status'] == 'failed' and 'spool' in status['error']
+    assert victim.exists()
+    with Session(bind=engine) as sess:
+        assert sess.query(Transaction).count() == 0
+
+
+def test_generic_enqueue_validation_and_ownership():
+    _login('owner@example.com')
+    client = TestClient(app, base_url="http://localhost")
+    assert 'networth' in client.get('/api/jobs/kinds').json()
+    assert client.post('/api/jobs/', json={'kind': 'nope'}).status_code == 400
+    assert client.post('/api/jobs/', json={'kind': 'export_csv', 'params': {'year': 2026, 'month': 13}}).status_code == 422
+    created = client.post('/api/jobs/', json={'kind': 'export_csv', 'params': {'year': 2026, 'month': 2}})
+    assert created.status_code == 202
+    job_id = created.json()['job_id']
+    jobs.drain(timeout=30)
+    assert client.get(f'/api/jobs/{job_id}/result').json()['filename'] == 'report_2026_02.csv'
+    assert [j['id'] for j in client.get('/api/jobs/').json()] == [job_id]
+    _login('other@example.com')
+    assert client.get(f'/api/jobs/{job_id}').status_code == 404
+
+
+def test_failed_and_restarted_jobs():
+    ids = _login('fail@example.com')
+    client = TestClient(app, base_url="http://localhost")
+    r = client.post('/api/transactions/import/file', params={'async': 'true'},
+                    files={'file': ('x.csv', b'when,what\n1,2\n')}, data={'account_id': ids['account']})
+    job_id = r.json()['job_id']
+    jobs.drain(timeout=30)
+    assert client.get(f'/api/jobs/{job_id}').json()['status'] == 'failed'
+    res = client.get(f'/api/jobs/{job_id}/result')
+    assert res.status_code == 409 and 'date column' in res.json()['detail']
+    # a job left running by a dead process fails; one still queued runs on the next start
+    with Session(bind=engine) as sess:
+        uid = sess.query(User.id).scalar()
+        sess.add_all([
+            Job(id='a' * 32, user_id=uid, kind='networth', status='running', params='{}'),
+            Job(id='b' * 32, user_id=uid, kind='networth', status='queued', params='{"months": 3}'),
+        ])
+        sess.commit()
+    assert jobs.start() == 1
+    jobs.drain(timeout=30)
+    assert client.get('/api/jobs/' + 'a' * 32).json()['status'] == 'failed'
+    assert len(client.get('/api/jobs/' + 'b' * 32 + '/result').json()['history']) == 3
+
+
+def test_file_results_are_served_as_files():
+    _login('pdf@example.com')
+    client = TestClient(app, base_url="http://localhost")
+    job_id = client.get('/api/reports/export/pdf', params={'year': 2026, 'month': 1, 'async': 'true'}).json()['job_id']
+    jobs.drain(timeout=30)
+    resp = client.get(f'/api/jobs/{job_id}/result')
+    assert resp.status_code == 200 and resp.headers['content-type'] == 'application/pdf'
+    assert resp.content.startswith(b'%PDF')
@@ -0,0 +1,82 @@
+import sys, os
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core import metrics
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.models.finance import Account, AccountType
+from backend.app.models.user import User
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    metrics.reset()
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides = {}
+
+
+@pytest.fixture()
+def user():
+    with Session(bind=engine) as sess:
+        u = User(email='metrics@example.com', hashed_password='x', full_name='Tester')
+        sess.add(u)
+        sess.commit()
+        sess.refresh(u)
+        sess.add_all([Account(user_id=u.id, name=f'A{i}', type=AccountType.CASH) for i in range(3)])
+        sess.commit()
+        sess.refresh(u)
+        sess.expunge(u)
+    from backend.app.services.deps import get_current_user
+    app.dependency_overrides = {get_current_user: lambda: u}
+    return u
+
+
+def test_queries_are_counted_per_request(user):
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.get('/api/accounts/')
+    assert resp.status_code == 200
+    assert int(resp.headers['X-DB-Queries']) >= 1
+
+
+def test_metrics_endpoint_reports_route_templates(user):
+    client = TestClient(app, base_url="http://localhost")
+    client.get('/api/accounts/')
+    client.get('/api/accounts/')
+    client.get('/api/transactions/12345')
+    text = client.get('/api/admin/metrics').text
+    assert '# TYPE http_request_duration_seconds summary' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/accounts/",status="2xx"} 2' in text
+    assert 'route="/api/transactions/{tx_id}",status="4xx"' in text
+    assert 'http_request_db_queries_bucket{method="GET",route="/api/accounts/",status="2xx",le="+Inf"} 2' in text
+    assert 'quantile="0.99"' in text
+
+
+def test_admin_token_is_enforced(user, monkeypatch):
+    from backend.app.core.config import settings
+    monkeypatch.setattr(settings, 'ADMIN_TOKEN', 's3cret')
+    client = TestClient(app, base_url="http://localhost")
+    assert client.get('/api/admin/metrics').status_code == 401
+    ok = client.get('/api/admin/metrics', headers={'Authorization': 'Bearer s3cret'})
+    assert ok.status_code == 200
+
+
+def test_failed_statements_leave_no_timing_state(user):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text('SELECT * FROM no_such_table'))
+        conn.execute(text('SELECT 1'))
+        assert 'query_start' not in conn.info
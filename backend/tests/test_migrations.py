@@ -0,0 +1,98 @@
+import sys, os
+import pytest
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine, event, inspect, text
+from alembic.script import ScriptDirectory
+from backend.app.core.db import Base
+from backend.app.core.migrations import alembic_config, current_revision, head_revision, run_migrations
+import backend.app.main  # noqa: F401  (registers every model on Base.metadata)
+
+
+@pytest.fixture()
+def tmp_engine(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path / 'm.db'}")
+    yield eng
+    eng.dispose()
+
+
+def test_head_matches_alembic():
+    assert head_revision() == ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def test_fresh_database_matches_models(tmp_engine):
+    assert run_migrations(tmp_engine) is True
+    assert current_revision(tmp_engine) == head_revision()
+    insp = inspect(tmp_engine)
+    for table in Base.metadata.sorted_tables:
+        cols = {c['name'] for c in insp.get_columns(table.name)}
+        assert cols == {c.name for c in table.columns}, table.name
+
+
+def test_up_to_date_boot_reads_one_row(tmp_engine):
+    run_migrations(tmp_engine)
+    statements = []
+    event.listen(tmp_engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    assert run_migrations(tmp_engine) is False
+    assert statements == ["SELECT version_num FROM alembic_version"]
+
+
+def test_legacy_database_gets_missing_columns(tmp_engine):
+    with tmp_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT NOT NULL, hashed_password TEXT NOT NULL, full_name TEXT)"))
+        conn.execute(text("INSERT INTO users (email, hashed_password) VALUES ('old@example.com', 'x')"))
+    run_migrations(tmp_engine)
+    cols = {c['name'] for c in inspect(tmp_engine).get_columns('users')}
+    assert {'username', 'maaser_pct', 'tz'} <= cols
+    with tmp_engine.connect() as conn:
+        assert conn.execute(text("SELECT email FROM users")).scalar() == 'old@example.com'
+
+
+def test_duplicate_budgets_are_merged(tmp_engine):
+    from backend.app.core.migrations import upgrade
+    upgrade(tmp_engine, '0002')
+    with tmp_engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@example.com', 'x')"))
+        conn.execute(text("INSERT INTO categories (id, user_id, name, type) VALUES (1, 1, 'Food', 'EXPENSE'), (2, 1, 'Rent', 'EXPENSE')"))
+        conn.execute(text("INSERT INTO budgets (id, user_id, month) VALUES (1, 1, '2026-01'), (2, 1, '2026-01'), (3, 1, '2026-02')"))
+        conn.execute(text('INSERT INTO budget_items (budget_id, category_id, "limit") VALUES '
+                          '(1, 1, 10), (2, 1, 20), (2, 2, 5), (3, 1, 30)'))
+    run_migrations(tmp_engine)
+    with tmp_engine.connect() as conn:
+        assert conn.execute(text("SELECT id FROM budgets ORDER BY id")).scalars().all() == [1, 3]
+        # the duplicate's Food limit gives way to the kept budget's; its Rent item moves over
+        items = conn.execute(text('SELECT budget_id, category_id, "limit" FROM budget_items ORDER BY budget_id, category_id')).all()
+        assert items == [(1, 1, 10.0), (1, 2, 5.0), (3, 1, 30.0)]
+
+
+def test_fingerprints_backfilled(tmp_engine):
+    from backend.app.core.migrations import upgrade
+    from backend.app.utils.fingerprint import fingerprint
+    from datetime import date
+    upgrade(tmp_engine, '0005')
+    with tmp_engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@example.com', 'x')"))
+        conn.execute(text("INSERT INTO accounts (id, user_id, name, type) VALUES (1, 1, 'Cash', 'CASH')"))
+        conn.execute(text("INSERT INTO transactions (user_id, account_id, date, amount, note) VALUES (1, 1, '2026-01-02', -12.5, 'Café, Hillel')"))
+    run_migrations(tmp_engine)
+    with tmp_engine.connect() as conn:
+        assert conn.execute(text("SELECT fingerprint FROM transactions")).scalar() == fingerprint(1, date(2026, 1, 2), -12.5, 'café hillel')
+
+
+def test_maaser_ledger_backfilled_and_maintained(tmp_engine):
+    from backend.app.core.migrations import upgrade
+    upgrade(tmp_engine, '0007')
+    with tmp_engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@example.com', 'x')"))
+        conn.execute(text("INSERT INTO accounts (id, user_id, name, type) VALUES (1, 1, 'Cash', 'CASH'), (2, 1, 'Maaser', 'SAVINGS')"))
+        conn.execute(text("INSERT INTO categories (id, user_id, name, type) VALUES (1, 1, 'Salary', 'INCOME'), (2, 1, 'Tzedakah', 'EXPENSE')"))
+        conn.execute(text("INSERT INTO transactions (user_id, account_id, category_id, date, amount, is_transfer) VALUES "
+                          "(1, 1, 1, '2026-01-01', 900, 0), (1, 2, NULL, '2026-01-01', 100, 1), (1, 1, 2, '2026-01-03', -40, 0)"))
+    run_migrations(tmp_engine)
+    with tmp_engine.begin() as conn:
+        assert conn.execute(text("SELECT month, income, paid, maaser_net FROM maaser_months")).all() == [('2026-01', 1000.0, 40.0, 100.0)]
+        conn.execute(text("INSERT INTO transactions (user_id, account_id, category_id, date, amount, is_transfer) VALUES (1, 2, NULL, '2026-01-09', -25, 0)"))
+        assert conn.execute(text("SELECT paid, maaser_net FROM maaser_months")).one() == (65.0, 75.0)
@@ -0,0 +1,106 @@
+import sys, os
+import json
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.services.deps import get_current_user
+from backend.app.models.finance import Account, AccountType, Investment, InvestmentTransaction, Transaction
+from backend.app.models.user import User
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from datetime import date
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    app.dependency_overrides = {}
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides = {}
+
+
+@pytest.fixture()
+def users():
+    with Session(bind=engine) as sess:
+        out = []
+        for n in range(7):
+            u = User(email=f'u{n}@example.com', hashed_password='x', shabbat_mode=False)
+            sess.add(u)
+            sess.flush()
+            if n == 3:
+                out.append(u)  # no accounts at all
+                continue
+            cash = Account(user_id=u.id, name='Cash', type=AccountType.CASH, opening_balance=10.0 * n)
+            card = Account(user_id=u.id, name='Card', type=AccountType.CREDIT_CARD, is_liability=True)
+            idle = Account(user_id=u.id, name='Idle', type=AccountType.SAVINGS, opening_balance=5.0)
+            sess.add_all([cash, card, idle])
+            sess.flush()
+            sess.add_all([
+                Transaction(user_id=u.id, account_id=cash.id, date=date(2026, 1, 1), amount=100.0 * (n + 1), note='pay'),
+                Transaction(user_id=u.id, account_id=cash.id, date=date(2026, 1, 2), amount=-7.5, note='coffee'),
+                Transaction(user_id=u.id, account_id=card.id, date=date(2026, 1, 3), amount=40.0 + n, note='owed'),
+            ])
+            if n % 2 == 0:
+                inv = Investment(user_id=u.id, symbol='VTI')
+                sess.add(inv)
+                sess.flush()
+                sess.add_all([
+                    InvestmentTransaction(user_id=u.id, investment_id=inv.id, account_id=cash.id, date=date(2026, 1, 1), type='buy', quantity=10, unit_price=100, total_cost=1000),
+                    InvestmentTransaction(user_id=u.id, investment_id=inv.id, account_id=cash.id, date=date(2026, 2, 1), type='sell', quantity=4, unit_price=120 + n, total_cost=480),
+                ])
+            out.append(u)
+        sess.commit()
+        for u in out:
+            sess.refresh(u)
+            sess.expunge(u)
+    return out
+
+
+def _lines(resp):
+    assert resp.status_code == 200, resp.text
+    assert resp.headers['content-type'].startswith('application/x-ndjson')
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_batch_matches_per_user_networth(users):
+    client = TestClient(app, base_url="http://localhost")
+    statements = []
+    listener = lambda *a: statements.append(a[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        snaps = _lines(client.get('/api/admin/networth', params={'chunk': 3}))
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert [s['user_id'] for s in snaps] == [u.id for u in users]
+    # three users per chunk, three statements per chunk, plus the final empty id lookup
+    assert len(statements) == 3 * 3 + 1
+    for u, snap in zip(users, snaps):
+        app.dependency_overrides[get_current_user] = lambda u=u: u
+        single = client.get('/api/reports/networth', params={'months': 1}).json()
+        assert snap['assets'] == round(single['assets'], 2)
+        assert snap['liabilities'] == round(single['liabilities'], 2)
+        assert snap['net_worth'] == round(single['net_worth'], 2)
+        assert [(a['id'], a['balance']) for a in snap['accounts']] == [(a['id'], a['balance']) for a in single['accounts']]
+    assert snaps[3]['accounts'] == [] and snaps[3]['net_worth'] == 0.0
+    assert snaps[0]['investments'] == 6 * 120.0
+
+
+def test_ranges_split_users_between_workers(users):
+    client = TestClient(app, base_url="http://localhost")
+    ranges = client.get('/api/admin/networth/ranges', params={'workers': 3}).json()
+    assert len(ranges) == 3
+    seen = []
+    for r in ranges:
+        seen += [s['user_id'] for s in _lines(client.get('/api/admin/networth', params=r))]
+    assert seen == [u.id for u in users]
+    assert client.get('/api/admin/networth', params={'start_id': 5, 'end_id': 5}).status_code == 400
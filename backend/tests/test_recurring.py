@@ -0,0 +1,94 @@
+import sys, os
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.services.recurring import detect, normalize_note, next_occurrence, scan
+from backend.app.models.finance import Account, AccountType, RecurringSeries, Transaction
+from backend.app.models.user import User
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides = {}
+
+
+def _months_back(n, day):
+    today = date.today()
+    y, m = today.year, today.month - n
+    while m <= 0:
+        m += 12
+        y -= 1
+    return date(y, m, day)
+
+
+def test_helpers():
+    assert normalize_note('NETFLIX.COM 03/14 #8812') == 'netflix com'
+    assert normalize_note('Salary (after maaser)') == 'salary'
+    d = date(2026, 1, 1)
+    assert detect([d + timedelta(days=7 * i) for i in range(4)])[0] == 'weekly'
+    assert detect([date(2026, m, 1) for m in range(1, 6)])[0] == 'monthly'
+    assert detect([date(2024, 3, 2), date(2025, 3, 1)])[0] == 'annual'
+    assert detect([d, d + timedelta(days=3), d + timedelta(days=40)]) == (None, None)
+    assert next_occurrence(date(2026, 1, 31), 'monthly') == date(2026, 2, 28)
+
+
+def test_detects_series_incrementally():
+    with Session(bind=engine) as sess:
+        u = User(email='rec@example.com', hashed_password='x', shabbat_mode=False)
+        sess.add(u)
+        sess.flush()
+        a = Account(user_id=u.id, name='Card', type=AccountType.CREDIT_CARD)
+        sess.add(a)
+        sess.flush()
+        # five monthly Netflix charges with varying reference numbers, plus noise
+        for n in range(5, 0, -1):
+            sess.add(Transaction(user_id=u.id, account_id=a.id, date=_months_back(n, 14), amount=-15.99, note=f'NETFLIX.COM #{n}00{n}'))
+        sess.add(Transaction(user_id=u.id, account_id=a.id, date=_months_back(3, 2), amount=-420.0, note='IKEA'))
+        sess.add(Transaction(user_id=u.id, account_id=a.id, date=_months_back(2, 20), amount=-15.0, note='Netflix gift card x2'))
+        sess.commit()
+        sess.refresh(u)
+        sess.expunge(u)
+    from backend.app.services.deps import get_current_user
+    app.dependency_overrides = {get_current_user: lambda: u}
+
+    client = TestClient(app, base_url="http://localhost")
+    series = client.get('/api/transactions/recurring').json()
+    assert len(series) == 1
+    s = series[0]
+    assert s['cadence'] == 'monthly' and s['occurrences'] == 5 and s['next_amount'] == -15.99
+    assert s['next_date'] == next_occurrence(_months_back(1, 14), 'monthly').isoformat()
+    # reading folds unscanned rows in memory and stores nothing
+    assert s['id'] is None
+    with Session(bind=engine) as sess:
+        assert sess.query(RecurringSeries).count() == 0
+        assert sess.get(User, u.id).recurring_scanned_id in (None, 0)
+    assert client.post('/api/transactions/recurring/scan').json() == {'scanned': 7, 'series': 1}
+    s = client.get('/api/transactions/recurring').json()[0]
+    assert s['id'] is not None and s['occurrences'] == 5
+
+    with Session(bind=engine) as sess:
+        sess.add(Transaction(user_id=u.id, account_id=s['account_id'], date=_months_back(0, 14), amount=-17.49, note='Netflix.com 9931'))
+        sess.commit()
+        # only the new transaction is read on the next scan
+        assert scan(sess, u.id) == 1
+        assert scan(sess, u.id) == 0
+        row = sess.query(RecurringSeries).filter(RecurringSeries.id == s['id']).one()
+        assert row.occurrences == 6 and row.last_date == _months_back(0, 14)
+
+    resp = client.post('/api/transactions/recurring/scan', params={'full': 'true'})
+    assert resp.json()['scanned'] == 8
+    assert [x['occurrences'] for x in client.get('/api/transactions/recurring').json()] == [6]
@@ -66,3 +66,262 @@ def test_networth_endpoint(db_session):
     # assets should include the transaction sum (50) + opening balance if logic calculates that way
     assert isinstance(data['assets'], float) or isinstance(data['assets'], int)
     assert isinstance(data['history'], list)
+
+
+def test_budget_variance_across_months(db_session):
+    from backend.app.models.finance import Budget, BudgetItem, Category, CategoryType
+    user = db_session.query(User).filter_by(email='test@example.com').first()
+    a = Account(user_id=user.id, name='Cash', type=AccountType.CASH, opening_balance=0.0)
+    food = Category(user_id=user.id, name='Food', type=CategoryType.EXPENSE)
+    rent = Category(user_id=user.id, name='Rent', type=CategoryType.EXPENSE)
+    db_session.add_all([a, food, rent])
+    db_session.flush()
+    # three months of food history at 100/month, then 200 in April and 90 in May
+    for month, amount in ((1, 100), (2, 100), (3, 100), (4, 200), (5, 90)):
+        db_session.add(Transaction(user_id=user.id, account_id=a.id, category_id=food.id, date=date(2026, month, 10), amount=-amount, note='groceries'))
+    db_session.add(Transaction(user_id=user.id, account_id=a.id, category_id=rent.id, date=date(2026, 4, 1), amount=-1000, note='rent'))
+    for month in ('2026-04', '2026-05'):
+        b = Budget(user_id=user.id, month=month)
+        db_session.add(b)
+        db_session.flush()
+        db_session.add(BudgetItem(budget_id=b.id, category_id=food.id, limit=150.0, item_type='flex', tolerance_pct=0.2, window_months=3))
+        db_session.add(BudgetItem(budget_id=b.id, category_id=rent.id, limit=1000.0, item_type='fixed'))
+    db_session.commit()
+    db_session.refresh(user)
+
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.get('/api/reports/budget_variance', params={'from': '2026-04', 'to': '2026-05'})
+    assert resp.status_code == 200, resp.text
+    assert resp.headers['X-DB-Queries'] == '2'
+    data = resp.json()
+    assert data['months'] == ['2026-04', '2026-05']
+    cats = {c['category']: c for c in data['categories']}
+    f = cats['Food']
+    assert [m['actual'] for m in f['months']] == [200.0, 90.0]
+    assert [m['cumulative_overspend'] for m in f['months']] == [50.0, 50.0]
+    assert f['months'][0]['flex_status'] == 'exceeded'   # 200 vs 100 avg +20%
+    assert f['months'][1]['flex_status'] == 'ok'         # 90 vs (100+100+200)/3
+    assert f['variance'] == 300.0 - 290.0
+    r = cats['Rent']
+    assert r['actual'] == 1000.0 and r['overspend'] == 0.0 and r['flex_status'] is None
+    assert data['totals']['budgeted'] == 2300.0
+
+    assert client.get('/api/reports/budget_variance', params={'from': '2026-05', 'to': '2026-04'}).status_code == 400
+    assert client.get('/api/reports/budget_variance', params={'from': '2026-13', 'to': '2026-04'}).status_code == 400
+
+
+def test_forecast_projects_recurring_and_debt_minimums(db_session):
+    from backend.app.services.forecast import forecast
+    user = db_session.query(User).filter_by(email='test@example.com').first()
+    cash = Account(user_id=user.id, name='Checking', type=AccountType.CASH, opening_balance=0.0)
+    card = Account(user_id=user.id, name='Card', type=AccountType.CREDIT_CARD, is_liability=True, min_payment=100.0, due_day=5)
+    db_session.add_all([cash, card])
+    db_session.flush()
+    today = date(2026, 6, 10)
+    db_session.add(Transaction(user_id=user.id, account_id=cash.id, date=date(2026, 1, 1), amount=2000.0, note='Opening balance'))
+    db_session.add(Transaction(user_id=user.id, account_id=card.id, date=date(2026, 6, 1), amount=-250.0, note='Card spend'))
+    # monthly rent on the 1st for the last four months
+    for m in (3, 4, 5, 6):
+        db_session.add(Transaction(user_id=user.id, account_id=cash.id, date=date(2026, m, 1), amount=-900.0, note=f'Rent {m}/2026'))
+    db_session.commit()
+
+    data = forecast(db_session, user.id, days=120, today=today)
+    accounts = {a['name']: a for a in data['accounts']}
+    c, k = accounts['Checking'], accounts['Card']
+    assert c['starting_balance'] == 2000.0 - 3600.0
+    assert len(c['balances']) == 120
+    # rent on Jul 1, Aug 1, Sep 1, Oct 1; card minimums on Jul 5, Aug 5 and a 50 remainder on Sep 5
+    rent = [e for e in data['events'] if e['source'] == 'recurring']
+    assert [e['date'] for e in rent] == [date(2026, 7, 1), date(2026, 8, 1), date(2026, 9, 1), date(2026, 10, 1)]
+    minimums = [e for e in data['events'] if e['source'] == 'debt_minimum' and e['account_id'] == card.id]
+    assert [(e['date'], e['amount']) for e in minimums] == [(date(2026, 7, 5), 100.0), (date(2026, 8, 5), 100.0), (date(2026, 9, 5), 50.0)]
+    assert k['ending_balance'] == 0.0
+    assert c['ending_balance'] == -1600.0 - 4 * 900.0 - 250.0
+    assert c['overdraft'] is True and data['overdrafts'][0]['date'] == today
+    assert data['total'][-1] == c['ending_balance'] + k['ending_balance']
+
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.get('/api/reports/forecast', params={'days': 365})
+    assert resp.status_code == 200
+    assert len(resp.json()['total']) == 365
+    assert client.get('/api/reports/forecast', params={'days': 5000}).status_code == 422
+    assert client.get('/api/reports/forecast', params={'pay_from': 99999}).status_code == 404
+
+
+def test_month_pdf_paginates_and_streams(db_session):
+    import re
+    from backend.app.models.finance import Category, CategoryType
+    user = db_session.query(User).filter_by(email='test@example.com').first()
+    a = Account(user_id=user.id, name='Checking', type=AccountType.CASH)
+    food = Category(user_id=user.id, name='Food', type=CategoryType.EXPENSE)
+    salary = Category(user_id=user.id, name='Salary', type=CategoryType.INCOME)
+    db_session.add_all([a, food, salary])
+    db_session.flush()
+    db_session.add_all([
+        Transaction(user_id=user.id, account_id=a.id, category_id=food.id, date=date(2026, 3, 1 + k % 31), amount=-(5.0 + k), note=f'Grocery {k}')
+        for k in range(400)
+    ] + [Transaction(user_id=user.id, account_id=a.id, category_id=salary.id, date=date(2026, 3, 10), amount=9000.0, note='Pay')])
+    db_session.commit()
+    db_session.refresh(user)
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.get('/api/reports/export/pdf', params={'year': 2026, 'month': 3})
+    assert resp.status_code == 200
+    assert resp.headers['content-type'] == 'application/pdf'
+    assert resp.headers['content-disposition'] == 'attachment; filename="report_2026_03.pdf"'
+    assert resp.content.startswith(b'%PDF')
+    # summary page plus ~60 table rows per page
+    assert len(re.findall(rb'/Type /Page\b(?!s)', resp.content)) >= 7
+    # category breakdown, daily totals and one streamed row query, whatever the row count
+    assert int(resp.headers['X-DB-Queries']) == 3
+
+
+def test_annual_bundle(db_session):
+    import io, json, zipfile
+    from backend.app.models.finance import Category, CategoryType, Investment, InvestmentTransaction
+    user = db_session.query(User).filter_by(email='test@example.com').first()
+    a = Account(user_id=user.id, name='Checking', type=AccountType.CASH)
+    m = Account(user_id=user.id, name='Maaser', type=AccountType.SAVINGS)
+    salary = Category(user_id=user.id, name='Salary', type=CategoryType.INCOME)
+    tz = Category(user_id=user.id, name='Tzedakah', type=CategoryType.EXPENSE)
+    food = Category(user_id=user.id, name='Food', type=CategoryType.EXPENSE)
+    inv = Investment(user_id=user.id, symbol='VTI', name='VTI')
+    db_session.add_all([a, m, salary, tz, food, inv])
+    db_session.flush()
+    rows = []
+    for month in (1, 2, 4):
+        rows += [
+            Transaction(user_id=user.id, account_id=a.id, category_id=salary.id, date=date(2025, month, 1), amount=900.0, note='Pay, (after maaser)'),
+            Transaction(user_id=user.id, account_id=m.id, date=date(2025, month, 1), amount=100.0, note='Auto Maaser (10%)', is_transfer=True),
+            Transaction(user_id=user.id, account_id=a.id, category_id=food.id, date=date(2025, month, 3), amount=-200.0, note='Groceries'),
+            Transaction(user_id=user.id, account_id=a.id, category_id=tz.id, date=date(2025, month, 5), amount=-60.0, note='Shul'),
+        ]
+    rows.append(Transaction(user_id=user.id, account_id=a.id, category_id=food.id, date=date(2024, 12, 31), amount=-1.0, note='last year'))
+    # deposited straight into the Maaser account: income once, not again as set aside
+    rows.append(Transaction(user_id=user.id, account_id=m.id, date=date(2025, 4, 10), amount=50.0, note='Gift'))
+    db_session.add_all(rows)
+    db_session.add_all([
+        InvestmentTransaction(user_id=user.id, investment_id=inv.id, account_id=a.id, date=date(2024, 6, 1), type='buy', quantity=10, unit_price=100, total_cost=1000),
+        InvestmentTransaction(user_id=user.id, investment_id=inv.id, account_id=a.id, date=date(2025, 3, 1), type='buy', quantity=10, unit_price=200, total_cost=2000),
+        InvestmentTransaction(user_id=user.id, investment_id=inv.id, account_id=a.id, date=date(2025, 9, 1), type='sell', quantity=5, unit_price=250, total_cost=1250),
+    ])
+    db_session.commit()
+    db_session.refresh(user)
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.get('/api/reports/annual', params={'year': 2025})
+    assert resp.status_code == 200 and resp.headers['content-type'] == 'application/zip'
+    zf = zipfile.ZipFile(io.BytesIO(resp.content))
+    names = set(zf.namelist())
+    assert {f'transactions/2025-{k:02d}.csv' for k in range(1, 13)} <= names
+    assert {'summary.json', 'summary.pdf', 'maaser_tzedakah.csv', 'investments/realized.csv'} <= names
+    jan = zf.read('transactions/2025-01.csv').decode().splitlines()
+    assert jan[0] == 'date,amount,category,note,account,transfer' and len(jan) == 5
+    assert '"Pay, (after maaser)"' in jan[1]
+    assert zf.read('transactions/2025-03.csv').decode().strip() == 'date,amount,category,note,account,transfer'
+    summary = json.loads(zf.read('summary.json'))
+    assert summary['income'] == 2750.0 and summary['expenses'] == 780.0 and summary['transactions'] == 13
+    assert summary['maaser'] == {'maaser_pct': 0.1, 'gross_income': 3050.0, 'maaser_account': 350.0,
+                                 'tzedakah_given': 180.0, 'obligation': 305.0, 'outstanding': 125.0,
+                                 'closing_balance': 125.0}
+    ledger = client.get('/api/reports/maaser', params={'from': '2025-01', 'to': '2025-12'}).json()
+    assert ledger['totals'] == {'income': 3050.0, 'obligation': 305.0, 'paid': 180.0}
+    maaser_csv = zf.read('maaser_tzedakah.csv').decode().splitlines()
+    assert maaser_csv[0] == 'month,gross_income,maaser_account,tzedakah_given,obligation,balance'
+    assert maaser_csv[4] == '2025-04,1050.0,150.0,60.0,105.0,125.0'
+    # average cost 150 per unit over both buys -> 5 sold at 250 gains 500
+    assert summary['investments'] == {'buys': 2000.0, 'sells': 1250.0, 'realized_gain': 500.0}
+
+
+def test_ledger_export_keeps_types(db_session):
+    import io, zipfile
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    import pyarrow.ipc
+    user = db_session.query(User).filter_by(email='test@example.com').first()
+    a = Account(user_id=user.id, name='Cash', type=AccountType.CASH, opening_balance=10.0)
+    db_session.add(a)
+    db_session.flush()
+    db_session.add_all([
+        Transaction(user_id=user.id, account_id=a.id, date=date(2026, 1, 1 + k % 28), amount=-1.5 * k, note=f'n{k}')
+        for k in range(120)
+    ])
+    db_session.commit()
+    db_session.refresh(user)
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.get('/api/reports/export/ledger')
+    assert resp.status_code == 200
+    zf = zipfile.ZipFile(io.BytesIO(resp.content))
+    assert sorted(zf.namelist()) == ['accounts.parquet', 'categories.parquet', 'investment_transactions.parquet', 'transactions.parquet']
+    tx = pq.read_table(io.BytesIO(zf.read('transactions.parquet')))
+    assert tx.num_rows == 120
+    assert tx.schema.field('date').type == pa.date32() and tx.schema.field('amount').type == pa.float64()
+    assert tx.column('category_id').null_count == 120
+    assert pq.read_table(io.BytesIO(zf.read('accounts.parquet'))).column('type').to_pylist() == [AccountType.CASH.value]
+    arrow = zipfile.ZipFile(io.BytesIO(client.get('/api/reports/export/ledger', params={'format': 'arrow'}).content))
+    assert pa.ipc.open_file(io.BytesIO(arrow.read('transactions.arrow'))).read_all().num_rows == 120
+
+
+def test_maaser_ledger_follows_writes(db_session):
+    from sqlalchemy import insert
+    from backend.app.models.finance import Category, CategoryType, MaaserMonth
+    from backend.app.services import maaser
+    user = db_session.query(User).filter_by(email='test@example.com').first()
+    a = Account(user_id=user.id, name='Checking', type=AccountType.CASH)
+    m = Account(user_id=user.id, name='Maaser', type=AccountType.SAVINGS)
+    salary = Category(user_id=user.id, name='Salary', type=CategoryType.INCOME)
+    tz = Category(user_id=user.id, name='Tzedakah', type=CategoryType.EXPENSE)
+    food = Category(user_id=user.id, name='Food', type=CategoryType.EXPENSE)
+    db_session.add_all([a, m, salary, tz, food])
+    db_session.flush()
+    db_session.add_all([
+        Transaction(user_id=user.id, account_id=a.id, category_id=salary.id, date=date(2025, 12, 1), amount=500.0, note='pay'),
+        Transaction(user_id=user.id, account_id=a.id, category_id=salary.id, date=date(2026, 1, 1), amount=900.0, note='pay'),
+        Transaction(user_id=user.id, account_id=m.id, date=date(2026, 1, 1), amount=100.0, note='set aside', is_transfer=True),
+        Transaction(user_id=user.id, account_id=a.id, category_id=tz.id, date=date(2026, 1, 5), amount=-30.0, note='shul'),
+        Transaction(user_id=user.id, account_id=m.id, date=date(2026, 1, 9), amount=-20.0, note='yeshiva'),
+        Transaction(user_id=user.id, account_id=a.id, category_id=food.id, date=date(2026, 1, 9), amount=-80.0, note='groceries'),
+    ])
+    db_session.commit()
+    # a Core bulk insert (the importer's path) is picked up by the triggers too
+    db_session.execute(insert(Transaction), [
+        {'user_id': user.id, 'account_id': a.id, 'category_id': salary.id, 'date': date(2026, 3, 1), 'amount': 1000.0, 'note': 'bonus'},
+    ])
+    db_session.commit()
+    db_session.refresh(user)
+
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.get('/api/reports/maaser', params={'from': '2026-01', 'to': '2026-03'})
+    assert resp.status_code == 200, resp.text
+    assert resp.headers['X-DB-Queries'] == '1'
+    data = resp.json()
+    assert data['opening_balance'] == 50.0
+    assert [(r['month'], r['income'], r['obligation'], r['paid'], r['balance']) for r in data['months']] == [
+        ('2026-01', 1000.0, 100.0, 50.0, 100.0),
+        ('2026-02', 0.0, 0.0, 0.0, 100.0),
+        ('2026-03', 1000.0, 100.0, 0.0, 200.0),
+    ]
+    assert data['months'][0]['maaser_account'] == 80.0
+    assert data['totals'] == {'income': 2000.0, 'obligation': 200.0, 'paid': 50.0} and data['closing_balance'] == 200.0
+
+    # edits, moves between months and deletes adjust the ledger rows in place
+    shul = db_session.query(Transaction).filter_by(note='shul').one()
+    shul.amount = -130.0
+    bonus = db_session.query(Transaction).filter_by(note='bonus').one()
+    bonus.date = date(2026, 2, 1)
+    db_session.delete(db_session.query(Transaction).filter_by(note='yeshiva').one())
+    db_session.commit()
+    data = client.get('/api/reports/maaser', params={'from': '2026-01', 'to': '2026-03'}).json()
+    assert [(r['income'], r['paid'], r['balance']) for r in data['months']] == [(1000.0, 130.0, 20.0), (1000.0, 0.0, 120.0), (0.0, 0.0, 120.0)]
+
+    # renaming a category changes what counts as Tzedakah, so the ledger is rebuilt
+    assert client.patch(f'/api/categories/{food.id}', json={'name': 'Tzedakah'}).status_code == 200
+    data = client.get('/api/reports/maaser', params={'from': '2026-01', 'to': '2026-01'}).json()
+    assert data['months'][0]['paid'] == 210.0
+
+    ledger = sorted((r.month, r.income, r.paid, r.maaser_net) for r in db_session.query(MaaserMonth).filter_by(user_id=user.id) if r.income or r.paid or r.maaser_net)
+    maaser.rebuild(db_session, user.id)
+    db_session.commit()
+    assert sorted((r.month, r.income, r.paid, r.maaser_net) for r in db_session.query(MaaserMonth).filter_by(user_id=user.id)) == ledger
+
+    summary = client.get('/api/reports/monthly', params={'year': 2026, 'month': 1}).json()
+    assert summary['maaser'] == 100.0
+    assert client.get('/api/reports/maaser', params={'from': '2026-03', 'to': '2026-01'}).status_code == 400
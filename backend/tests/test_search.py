@@ -0,0 +1,82 @@
+import sys, os
+import pytest
+from fastapi.testclient import TestClient
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.main import app
+from backend.app.core.db import Base, engine
+from backend.app.services.bootstrap import migrate_sqlite
+from backend.app.models.finance import Account, AccountType, Transaction
+from backend.app.models.user import User
+from sqlalchemy.orm import Session
+from datetime import date
+
+
+@pytest.fixture(autouse=True)
+def create_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrate_sqlite(engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+    app.dependency_overrides = {}
+
+
+@pytest.fixture()
+def data():
+    with Session(bind=engine) as sess:
+        u = User(email='search@example.com', hashed_password='x', shabbat_mode=False)
+        other = User(email='other@example.com', hashed_password='x')
+        sess.add_all([u, other])
+        sess.flush()
+        a1 = Account(user_id=u.id, name='Checking', type=AccountType.CASH)
+        a2 = Account(user_id=u.id, name='Card', type=AccountType.CREDIT_CARD)
+        a3 = Account(user_id=other.id, name='Theirs', type=AccountType.CASH)
+        sess.add_all([a1, a2, a3])
+        sess.flush()
+        sess.add_all([
+            Transaction(user_id=u.id, account_id=a1.id, date=date(2026, 1, 5), amount=-50, note='Shufersal Ramat Gan'),
+            Transaction(user_id=u.id, account_id=a2.id, date=date(2026, 2, 5), amount=-20, note='Shufersal deal, Shufersal online'),
+            Transaction(user_id=u.id, account_id=a1.id, date=date(2026, 3, 5), amount=-9, note='Café Hillel'),
+            Transaction(user_id=other.id, account_id=a3.id, date=date(2026, 1, 5), amount=-5, note='Shufersal'),
+        ])
+        sess.commit()
+        sess.refresh(u)
+        sess.expunge(u)
+        ids = {'user': u, 'checking': a1.id, 'card': a2.id}
+    from backend.app.services.deps import get_current_user
+    app.dependency_overrides = {get_current_user: lambda: ids['user']}
+    return ids
+
+
+def test_prefix_match_ranked_and_scoped_to_user(data):
+    client = TestClient(app, base_url="http://localhost")
+    resp = client.get('/api/transactions/search', params={'q': 'shuf'})
+    assert resp.status_code == 200
+    notes = [t['note'] for t in resp.json()]
+    assert notes == ['Shufersal deal, Shufersal online', 'Shufersal Ramat Gan']
+    recent = client.get('/api/transactions/search', params={'q': 'shuf', 'sort': 'recent'}).json()
+    assert [t['date'] for t in recent] == ['2026-02-05', '2026-01-05']
+    assert [t['note'] for t in client.get('/api/transactions/search', params={'q': 'shuf ram'}).json()] == ['Shufersal Ramat Gan']
+    # diacritics are folded
+    assert [t['note'] for t in client.get('/api/transactions/search', params={'q': 'cafe'}).json()] == ['Café Hillel']
+    # FTS syntax in user input is treated as plain words
+    assert client.get('/api/transactions/search', params={'q': '"shuf* OR ('}).status_code == 200
+
+
+def test_filters_and_index_follows_writes(data):
+    client = TestClient(app, base_url="http://localhost")
+    by_account = client.get('/api/transactions/search', params={'q': 'shufersal', 'account_id': data['checking']}).json()
+    assert [t['note'] for t in by_account] == ['Shufersal Ramat Gan']
+    by_date = client.get('/api/transactions/search', params={'q': 'shufersal', 'start': '2026-02-01', 'end': '2026-02-28'}).json()
+    assert len(by_date) == 1 and by_date[0]['date'] == '2026-02-05'
+
+    tx_id = by_account[0]['id']
+    assert client.patch(f'/api/transactions/{tx_id}', json={'note': 'Rami Levy'}).status_code == 200
+    assert [t['id'] for t in client.get('/api/transactions/search', params={'q': 'rami'}).json()] == [tx_id]
+    assert tx_id not in [t['id'] for t in client.get('/api/transactions/search', params={'q': 'ramat'}).json()]
+    assert client.delete(f'/api/transactions/{tx_id}').status_code == 200
+    assert client.get('/api/transactions/search', params={'q': 'rami'}).json() == []
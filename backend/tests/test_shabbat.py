@@ -0,0 +1,63 @@
+import sys, os
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from datetime import date, datetime
+from types import SimpleNamespace
+from backend.app.services import zmanim
+from backend.app.services.shabbat import is_shabbat_now, window_table
+
+JLM = zmanim.get_zone('Asia/Jerusalem')
+NYC = zmanim.get_zone('America/New_York')
+
+
+def _user(lat=31.778, lon=35.235, tz='Asia/Jerusalem'):
+    return SimpleNamespace(lat=lat, lon=lon, tz=tz)
+
+
+def _minutes(dt):
+    return dt.hour * 60 + dt.minute
+
+
+def test_sunset_matches_published_times():
+    # Jerusalem summer solstice ~19:47 IDT, winter solstice ~16:39 IST; New York summer ~20:31 EDT
+    assert abs(_minutes(zmanim.sunset(date(2024, 6, 21), 31.778, 35.235, JLM)) - (19 * 60 + 47)) <= 3
+    assert abs(_minutes(zmanim.sunset(date(2024, 12, 21), 31.778, 35.235, JLM)) - (16 * 60 + 39)) <= 3
+    assert abs(_minutes(zmanim.sunset(date(2024, 6, 21), 40.71, -74.0, NYC)) - (20 * 60 + 31)) <= 3
+    assert zmanim.nightfall(date(2024, 6, 21), 31.778, 35.235, JLM) > zmanim.sunset(date(2024, 6, 21), 31.778, 35.235, JLM)
+
+
+def test_shabbat_window_follows_local_sunset():
+    u = _user()
+    # Fri 2024-06-21: candle lighting ~19:29, Sat nightfall ~20:30
+    assert not is_shabbat_now(u, datetime(2024, 6, 21, 12, 0, tzinfo=JLM))
+    assert not is_shabbat_now(u, datetime(2024, 6, 21, 19, 15, tzinfo=JLM))
+    assert is_shabbat_now(u, datetime(2024, 6, 21, 19, 45, tzinfo=JLM))
+    assert is_shabbat_now(u, datetime(2024, 6, 22, 20, 15, tzinfo=JLM))
+    assert not is_shabbat_now(u, datetime(2024, 6, 22, 20, 45, tzinfo=JLM))
+    assert not is_shabbat_now(u, datetime(2024, 6, 23, 10, 0, tzinfo=JLM))
+
+
+def test_window_spanning_new_year():
+    # Fri 2021-12-31 evening -> Sat 2022-01-01 night, looked up from both sides of Jan 1
+    u = _user(40.71, -74.0, 'America/New_York')
+    assert is_shabbat_now(u, datetime(2021, 12, 31, 17, 0, tzinfo=NYC))
+    assert is_shabbat_now(u, datetime(2022, 1, 1, 12, 0, tzinfo=NYC))
+    assert not is_shabbat_now(u, datetime(2022, 1, 1, 18, 30, tzinfo=NYC))
+
+
+def test_window_table_is_sorted_and_cached():
+    starts, ends = window_table(2024, 31.78, 35.24, 'Asia/Jerusalem', True)
+    assert list(starts) == sorted(starts)
+    assert all(s < e for s, e in zip(starts, ends))
+    assert all(e < s for e, s in zip(ends, starts[1:]))
+    assert window_table(2024, 31.78, 35.24, 'Asia/Jerusalem', True) is window_table(2024, 31.78, 35.24, 'Asia/Jerusalem', True)
+
+
+def test_yom_tov_is_restricted():
+    u = _user()
+    # Pesach I 5784 fell on Tuesday 2024-04-23
+    assert is_shabbat_now(u, datetime(2024, 4, 22, 20, 0, tzinfo=JLM))
+    assert is_shabbat_now(u, datetime(2024, 4, 23, 12, 0, tzinfo=JLM))
+    assert not is_shabbat_now(u, datetime(2024, 4, 24, 12, 0, tzinfo=JLM))
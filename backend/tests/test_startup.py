@@ -0,0 +1,15 @@
+import sys, os
+# ensure repo root is on sys.path so `backend` package is importable when running pytest
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.bench.startup import IMPORT_BUDGET_MS, LAZY_MODULES, import_profile
+
+
+def test_app_import_stays_lean():
+    profile = import_profile("backend.app.main")
+    loaded = [m for m in LAZY_MODULES if m in profile]
+    assert loaded == [], f"imported at startup: {loaded}"
+    total_ms = profile["backend.app.main"][1]
+    assert total_ms <= IMPORT_BUDGET_MS, f"importing the app took {total_ms:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
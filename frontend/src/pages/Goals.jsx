@@ -41,7 +41,7 @@ export default function Goals() {
       <div className="bg-white p-4 rounded shadow">
         <h2 className="font-semibold mb-2">Your Goals</h2>
         <table className="w-full text-left text-sm">
-          <thead><tr className="text-gray-500"><th>Name</th><th>Type</th><th className="text-right">Target</th><th className="text-right">Current</th><th className="text-right">Progress</th><th>Due</th></tr></thead>
+          <thead><tr className="text-gray-500"><th>Name</th><th>Type</th><th className="text-right">Target</th><th className="text-right">Current</th><th className="text-right">Progress</th><th>Due</th><th>Projected</th></tr></thead>
           <tbody>
             {goals.map(g => {
               const progress = g.target_amount ? Math.min(100, Math.round((g.current_amount / g.target_amount) * 100)) : 0
@@ -50,9 +50,10 @@ export default function Goals() {
                   <td>{g.name}</td>
                   <td className="capitalize">{g.type.replace('_',' ')}</td>
                   <td className="text-right">${g.target_amount.toFixed(2)}</td>
-                  <td className="text-right">${g.current_amount.toFixed(2)}</td>
+                  <td className="text-right" title={g.auto ? 'From linked accounts and categories' : ''}>${g.current_amount.toFixed(2)}</td>
                   <td className="text-right">{progress}%</td>
                   <td>{g.due_date}</td>
+                  <td className={g.on_track === false ? 'text-red-600' : ''}>{g.projected_date || (g.auto ? '—' : '')}</td>
                 </tr>
               )
             })}
@@ -27,11 +27,14 @@ export default function Reports() {
   }
 
   const exportPdf = async () => {
-  const res = await api.get(`/reports/export/pdf?year=${year}&month=${month}`)
+  const res = await api.get(`/reports/export/pdf?year=${year}&month=${month}`, { responseType: 'blob' })
+    const match = /filename="([^"]+)"/.exec(res.headers['content-disposition'] || '')
+    const url = URL.createObjectURL(res.data)
     const a = document.createElement('a')
-    a.href = `data:application/pdf;base64,${res.data.content_b64}`
-    a.download = res.data.filename
+    a.href = url
+    a.download = match ? match[1] : `report_${year}_${month}.pdf`
     a.click()
+    URL.revokeObjectURL(url)
   }
 
   const loadCashflow = async () => {